@@ -0,0 +1,51 @@
+"""Store recipe embeddings as float32 blobs for the in-memory vector store
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17 10:00:00.000000
+
+The pgvector column from 001 (vector(3072), HNSW) never matched the 768-dim
+embedding model and is not read by anything: recipe vectors are searched in
+memory by app/rag/vectorstore.py. Replace it with a portable float32 blob plus
+the name of the embedding model that produced it.
+
+Postgres-specific steps (the HNSW index, the pgvector type on downgrade) only run
+on postgresql; column changes go through batch_alter_table so SQLite can apply them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Replace the pgvector embedding column with a float32 blob + model name."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS recipes_embedding_idx')
+    columns = {c['name'] for c in sa.inspect(bind).get_columns('recipes')}
+    with op.batch_alter_table('recipes') as batch_op:
+        if 'embedding' in columns:
+            batch_op.drop_column('embedding')
+        batch_op.add_column(sa.Column('embedding', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('embedding_model', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Restore the pgvector column on Postgres (embeddings must be regenerated)."""
+    with op.batch_alter_table('recipes') as batch_op:
+        batch_op.drop_column('embedding_model')
+        batch_op.drop_column('embedding')
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    from pgvector.sqlalchemy import Vector
+
+    op.add_column('recipes', sa.Column('embedding', Vector(3072), nullable=True))
+    op.execute(
+        'CREATE INDEX recipes_embedding_idx ON recipes USING hnsw (embedding vector_cosine_ops)'
+    )
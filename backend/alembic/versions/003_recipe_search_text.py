@@ -0,0 +1,47 @@
+"""Add a folded search column for diacritic-insensitive recipe search
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17 12:00:00.000000
+
+recipes.search_text holds the space-padded folded tokens of title + tags
+(app/utils/text.py:search_text), so GET /recipes?search=pho+bo matches "Phở Bò".
+The ORM keeps it in sync on insert/update; existing rows are backfilled here.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.text import search_text
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add recipes.search_text and backfill it."""
+    op.add_column('recipes', sa.Column('search_text', sa.Text(), nullable=True))
+
+    recipes = sa.table(
+        'recipes',
+        sa.column('id', sa.Integer),
+        sa.column('title', sa.String),
+        sa.column('tags', sa.String),
+        sa.column('search_text', sa.Text),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(recipes.c.id, recipes.c.title, recipes.c.tags)).fetchall()
+    for recipe_id, title, tags in rows:
+        bind.execute(
+            recipes.update()
+            .where(recipes.c.id == recipe_id)
+            .values(search_text=search_text(title, tags))
+        )
+
+
+def downgrade() -> None:
+    """Drop recipes.search_text."""
+    op.drop_column('recipes', 'search_text')
@@ -44,6 +44,10 @@ class Settings(BaseSettings):
     gemini_model: str = "gemini-2.5-flash"
     # Multiple keys for rotation — comma-separated. Falls back to gemini_api_key if empty.
     gemini_api_keys: str = ""
+    # Pooled clients (app/services/genai_pool.py): idle keep-alive connections stay open
+    # this long, up to this many connections per API key
+    gemini_keepalive_seconds: float = 60
+    gemini_max_connections: int = 20
 
     # LLM Provider — "gemini" | "openai" | "anthropic"
     llm_provider: str = "gemini"
@@ -60,6 +64,49 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379/0"
     cache_ttl_recipes: int = 3600    # 1 hour
     cache_ttl_meal_plans: int = 1800  # 30 minutes
+    cache_ttl_query_embeddings: int = 604800  # 7 days
+    query_embedding_cache_size: int = 1024  # in-process LRU entries per worker
+    # Coalesce identical concurrent LLM calls; the Redis lock extends this across workers
+    single_flight_redis_lock: bool = False
+    single_flight_lock_ttl: int = 120  # seconds — longest an LLM call may hold the lock
+    single_flight_wait_seconds: float = 60  # followers give up waiting and call the LLM themselves
+    # Semantic cache tier for suggest_recipes: reuse an answer whose normalized request
+    # embedding is at least this cosine-similar (same filters required)
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_size: int = 2048  # in-process entries per worker
+
+    # RAG — on-disk embedding store dtype: "float32" | "float16" (half the file size)
+    rag_embedding_dtype: str = "float32"
+    # RAG vector index — "exact" (brute-force scan) | "ivf" (approximate, for large corpora)
+    rag_vector_index: str = "exact"
+    rag_ivf_nlist: int = 0  # number of IVF lists; 0 = sqrt(N)
+    rag_ivf_nprobe: int = 8  # lists scanned per query — higher = better recall, slower
+    # First-pass scan on quantized codes — "none" | "int8" (4× smaller, about the same scan
+    # speed in numpy); the best k × rag_rerank_factor candidates are re-scored at full
+    # precision against the mapped float32 store, so workers hold only the codes in RAM
+    rag_quantization: str = "none"
+    rag_rerank_factor: int = 4
+    # Poll mocks/recipes.json every N seconds and hot-reload on change; 0 = off
+    # (POST /community-recipes/admin/reload works either way)
+    rag_corpus_watch_interval: float = 0
+    # Multi-worker deployments: one worker builds under a file lock, all workers mmap the
+    # embedding store and the saved vector-index arrays read-only (app/rag/shared.py)
+    rag_shared_index: bool = False
+    # Similar recipes precomputed per recipe when the vector index is built
+    # (GET /community-recipes/{id}/similar serves at most this many)
+    rag_similar_k: int = 10
+    # Embedding backend — "gemini" (text-embedding-004) | "local" (deterministic hashed
+    # character n-grams, no network; for CI and offline load tests)
+    embedding_backend: str = "gemini"
+    local_embedding_dim: int = 768
+    # Embedding generation — texts per request, concurrent requests, retries per batch
+    embedding_batch_size: int = 100
+    embedding_concurrency: int = 4
+    embedding_max_retries: int = 3
+    # SQL recipe vector store (app/rag/vectorstore.py) — reload embedded recipes from the
+    # database at most this often; the indexer also invalidates it after each commit
+    vectorstore_refresh_seconds: float = 300
 
     # File Storage
     max_upload_size: int = 10_485_760  # 10MB
@@ -1,6 +1,7 @@
 """Database connection and session management."""
 from typing import AsyncGenerator
 
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel, Session, create_engine
@@ -40,6 +41,34 @@ async_session_maker = sessionmaker(
 def create_db_and_tables() -> None:
     """Create all database tables (called at startup)."""
     SQLModel.metadata.create_all(sync_engine)
+    _check_schema()
+
+
+def _check_schema() -> None:
+    """
+    Fail fast if an existing table lacks columns the models expect.
+
+    create_all only creates missing tables — it never adds columns to existing ones,
+    so a database created by an older version (e.g. a chefgpt.db without
+    recipes.embedding_model / recipes.search_text) would otherwise fail later with
+    "no such column" on the first query.
+    """
+    inspector = inspect(sync_engine)
+    missing: list[str] = []
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        missing += [f"{table.name}.{c.name}" for c in table.columns if c.name not in existing]
+    if not missing:
+        return
+    if _is_sqlite:
+        fix = f"delete {sync_engine.url.database} so it is recreated, then re-run the seed scripts"
+    else:
+        fix = "run `alembic upgrade head`"
+    raise RuntimeError(
+        f"Database schema is out of date (missing columns: {', '.join(missing)}) — {fix}"
+    )
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
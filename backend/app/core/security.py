@@ -5,7 +5,10 @@ from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
+from app.core.database import get_session
+from app.models.user import User
 
 
 # Password hashing context
@@ -90,3 +93,17 @@ async def get_current_user_id(
         )
 
     return user_id
+
+
+async def get_current_superuser_id(
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_session),
+) -> str:
+    """Get the current user ID, requiring an active superuser (admin endpoints)."""
+    user = await session.get(User, user_id)
+    if user is None or not user.is_active or not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return user_id
@@ -1,8 +1,9 @@
 """Main FastAPI application."""
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from loguru import logger
 
 from app.core.config import settings
@@ -18,12 +19,15 @@ async def lifespan(app: FastAPI):
     logger.info("Starting ChefGPT API | provider={}", settings.llm_provider)
     create_db_and_tables()
     logger.info("Database tables ready")
-    # Initialize RAG index (loads community recipes + embeddings)
+    # Load community recipes now (keyword search); embeddings build in the background
     from app.services.rag import rag_service
-    await rag_service.initialize()
-    logger.info("RAG index ready | recipes={} ready={}", rag_service.recipe_count, rag_service.ready)
+    rag_service.start_background_init()
+    logger.info("RAG corpus loaded | recipes={} semantic_ready={}", rag_service.recipe_count, rag_service.ready)
     yield
     logger.info("Shutting down ChefGPT API")
+    await rag_service.shutdown()
+    from app.services.genai_pool import genai_pool
+    await genai_pool.aclose()
 
 
 app = FastAPI(
@@ -81,6 +85,21 @@ async def health_check():
     }
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness probe. Ready (200) once the community corpus is loaded and keyword
+    search can be served; semantic search may still be building — see `rag`.
+    """
+    from app.services.rag import rag_service
+    progress = rag_service.build_progress()
+    ready = progress["corpus_loaded"]
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if ready else "starting", "rag": progress},
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host=settings.host, port=settings.port, reload=settings.reload)
@@ -1,8 +1,34 @@
 """Recipe models."""
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Optional, List
+
+import numpy as np
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column, Text
+from sqlalchemy import Column, LargeBinary, Text, event
+from sqlalchemy.types import TypeDecorator
+
+from app.utils.text import search_text
+
+
+class EmbeddingVector(TypeDecorator):
+    """
+    Embedding column: list[float] / ndarray ⇄ packed little-endian float32 bytes.
+    4 bytes per dimension, portable across SQLite and PostgreSQL, and read back
+    with np.frombuffer (no per-element parsing) when the vector store loads.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Optional[bytes]:
+        if value is None:
+            return None
+        return np.asarray(value, dtype="<f4").tobytes()
+
+    def process_result_value(self, value: Optional[bytes], dialect: Any) -> Optional[np.ndarray]:
+        if value is None:
+            return None
+        return np.frombuffer(value, dtype="<f4")
 
 
 class Ingredient(SQLModel, table=True):
@@ -50,6 +76,12 @@ class Recipe(SQLModel, table=True):
     like_count: int = Field(default=0)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = None
+    # RAG embedding (app/rag/vectorstore.py) and the embedding model that produced it
+    embedding: Optional[Any] = Field(default=None, sa_column=Column(EmbeddingVector, nullable=True))
+    embedding_model: Optional[str] = None
+    # Folded, space-padded title + tag tokens (" pho bo soup "), kept in sync on
+    # insert/update; list_recipes matches word prefixes on it with LIKE
+    search_text: Optional[str] = Field(default=None, sa_column=Column(Text, nullable=True))
 
     # Relationships
     author: Optional["User"] = Relationship(back_populates="recipes")
@@ -58,6 +90,12 @@ class Recipe(SQLModel, table=True):
     nutrition: Optional["RecipeNutrition"] = Relationship(back_populates="recipe")
 
 
+@event.listens_for(Recipe, "before_insert")
+@event.listens_for(Recipe, "before_update")
+def _sync_search_text(mapper, connection, recipe: Recipe) -> None:
+    recipe.search_text = search_text(recipe.title, recipe.tags)
+
+
 class RecipeIngredient(SQLModel, table=True):
     """Recipe-Ingredient junction table with quantity."""
 
@@ -0,0 +1 @@
+"""Retrieval building blocks (embedding storage, indexes) used by the RAG services."""
@@ -0,0 +1,118 @@
+"""
+Search-as-you-type suggestions over recipe titles, tags and ingredient names.
+
+Built once per corpus snapshot:
+  - suggestions: distinct titles (one per recipe) and distinct tag / ingredient
+    names (folded duplicates merged), each weighted by the number of recipes it
+    stands for — 1 for a title, the recipes using it for a tag or ingredient — on
+    one scale, so "bò" (in many recipes) outranks the title "Bò Lúc Lắc" and a
+    title outranks a tag or ingredient used once
+  - a sorted array of folded keys, one per word-start suffix of each suggestion
+    ("pho bo" → "pho bo", "bo"), so "bo" completes "Phở Bò" as well as "Bò Lúc Lắc"
+  - the top-n suggestions of every prefix up to _PRECOMPUTED_LEN characters
+
+A short prefix (the expensive, high-fan-out case) is one dict lookup; a longer one
+is two bisects over the key array plus a top-n over the few suggestions in range.
+"""
+from bisect import bisect_left
+from typing import Optional
+
+import numpy as np
+
+from app.utils.text import fold, tokenize
+
+_PRECOMPUTED_LEN = 3  # prefixes up to this length answer from a precomputed list
+_MAX_LIMIT = 20  # precomputed list length; larger limits fall back to the range scan
+_KIND_ORDER = {"recipe": 0, "tag": 1, "ingredient": 2}  # tie-break between kinds
+
+
+class AutocompleteIndex:
+    """Usage-ranked prefix completion for a fixed recipe list."""
+
+    def __init__(self, recipes: list[dict]) -> None:
+        texts: list[str] = []
+        kinds: list[str] = []
+        recipe_ids: list[Optional[int]] = []
+        raw_weights: list[float] = []
+
+        for r in recipes:
+            if r.get("title"):
+                texts.append(r["title"])
+                kinds.append("recipe")
+                recipe_ids.append(r.get("id"))
+                raw_weights.append(1.0)
+
+        # Tags and ingredients: one suggestion per folded name, counted once per recipe
+        terms: dict[str, list] = {}  # folded → [display text, kind, recipe count]
+        for r in recipes:
+            seen: set[str] = set()
+            for kind, names in (("tag", r.get("tags", [])), ("ingredient", r.get("ingredients", []))):
+                for name in names:
+                    key = " ".join(tokenize(name))
+                    if not key or key in seen:
+                        continue
+                    seen.add(key)
+                    entry = terms.setdefault(key, [name, kind, 0])
+                    entry[2] += 1
+        for text, kind, count in terms.values():
+            texts.append(text)
+            kinds.append(kind)
+            recipe_ids.append(None)
+            raw_weights.append(float(count))
+
+        weights = np.array(raw_weights, dtype=np.float32)
+        kind_codes = np.array([_KIND_ORDER[k] for k in kinds], dtype=np.int8)
+
+        self._texts = texts
+        self._kinds = kinds
+        self._recipe_ids = recipe_ids
+        # Global rank: weight desc, then kind, then shorter text — rank 0 is best
+        order = sorted(
+            range(len(texts)),
+            key=lambda i: (-weights[i], kind_codes[i], len(texts[i]), fold(texts[i])),
+        )
+        self._rank = np.empty(len(texts), dtype=np.int32)
+        self._rank[order] = np.arange(len(texts), dtype=np.int32)
+
+        pairs: list[tuple[str, int]] = []
+        for i, text in enumerate(texts):
+            words = tokenize(text)
+            for start in range(len(words)):
+                pairs.append((" ".join(words[start:]), i))
+        pairs.sort()
+        self._keys = [key for key, _ in pairs]
+        self._key_ids = np.array([i for _, i in pairs], dtype=np.int32)
+
+        self._top: dict[str, list[int]] = {}
+        for key, i in pairs:
+            for length in range(1, min(_PRECOMPUTED_LEN, len(key)) + 1):
+                self._top.setdefault(key[:length], []).append(i)
+        for prefix, ids in self._top.items():
+            unique = np.unique(np.array(ids, dtype=np.int32))
+            self._top[prefix] = unique[np.argsort(self._rank[unique])][:_MAX_LIMIT].tolist()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def complete(self, prefix: str, limit: int = 8) -> list[dict]:
+        """Best `limit` suggestions whose words start with `prefix` (diacritic-insensitive)."""
+        query = " ".join(tokenize(prefix))
+        if not query:
+            return []
+        if len(query) <= _PRECOMPUTED_LEN and limit <= _MAX_LIMIT:
+            ids = self._top.get(query, [])[:limit]
+        else:
+            lo = bisect_left(self._keys, query)
+            hi = bisect_left(self._keys, query + "\uffff", lo=lo)
+            if lo == hi:
+                return []
+            candidates = np.unique(self._key_ids[lo:hi])
+            ranks = self._rank[candidates]
+            if candidates.size > limit:
+                keep = np.argpartition(ranks, limit - 1)[:limit]
+                candidates, ranks = candidates[keep], ranks[keep]
+            ids = candidates[np.argsort(ranks)].tolist()
+        return [
+            {"text": self._texts[i], "kind": self._kinds[i], "recipe_id": self._recipe_ids[i]}
+            for i in ids
+        ]
@@ -0,0 +1,136 @@
+"""
+Embedding backends behind EmbeddingService (app/rag/embeddings.py).
+
+  - GeminiEmbeddingBackend: Gemini `embed_content` (text-embedding-004, 768-dim)
+    with round-robin API keys
+  - LocalHashEmbeddingBackend: deterministic, offline — signed feature hashing of
+    character n-grams into a fixed number of dimensions, pure NumPy. For CI and
+    load tests on machines without network access; semantically much weaker.
+
+Every backend reports a distinct `model` name. It is written into the embedding
+store header and the query-embedding cache keys, so vectors from different
+backends are never mixed.
+"""
+import asyncio
+import math
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+
+import httpx
+import numpy as np
+from google.genai import errors as genai_errors
+
+from app.services.genai_pool import genai_pool
+from app.services.key_manager import GeminiKeyManager
+from app.utils.text import tokenize
+
+_LOCAL_OFFLOAD_THRESHOLD = 64  # texts per call above which local hashing runs in a thread
+
+
+class EmbeddingBackend(ABC):
+    """Turns a batch of texts into vectors. Retries and batching live in EmbeddingService."""
+
+    model: str
+    dim: int
+
+    @property
+    def available(self) -> bool:
+        """False if the backend cannot embed at all (e.g. no API key configured)."""
+        return True
+
+    @abstractmethod
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """One embedding per text, in order. Raises on failure."""
+        ...
+
+    def is_transient(self, error: Exception) -> bool:
+        """
+        Whether retrying `error` can succeed: network failures and timeouts.
+        Configuration and programming errors (no key, bad request) fail at once.
+        """
+        return isinstance(error, (httpx.TransportError, asyncio.TimeoutError, ConnectionError))
+
+
+class GeminiEmbeddingBackend(EmbeddingBackend):
+    """Gemini embed_content; each call uses the next key from GeminiKeyManager and its pooled client."""
+
+    def __init__(self, key_manager: GeminiKeyManager, model: str, dim: int, has_keys: bool) -> None:
+        self._key_manager = key_manager
+        self.model = model
+        self.dim = dim
+        self._has_keys = has_keys
+
+    @property
+    def available(self) -> bool:
+        return self._has_keys
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        key = await self._key_manager.get_key()
+        try:
+            result = await genai_pool.get(key).aio.models.embed_content(model=self.model, contents=texts)
+        except Exception as e:
+            err_str = str(e)
+            if "429" in err_str or "RESOURCE_EXHAUSTED" in err_str:
+                await self._key_manager.mark_rate_limited(key)
+            raise
+        return [e.values for e in result.embeddings]
+
+    def is_transient(self, error: Exception) -> bool:
+        if isinstance(error, genai_errors.APIError):
+            # 408 timeout, 429 rate limit (the retry uses the next key), 5xx server errors
+            return error.code in (408, 429) or error.code >= 500
+        return super().is_transient(error)
+
+
+class LocalHashEmbeddingBackend(EmbeddingBackend):
+    """
+    Deterministic bag-of-n-grams embedding:
+      1. fold diacritics and tokenize ("Phở Bò" → ["pho", "bo"])
+      2. features = whole tokens + character n-grams of " token " (word-boundary padded)
+      3. weight each feature 1 + log(tf), hash it with CRC32 to a column and a ±1 sign
+         (a fixed random projection of the sparse n-gram space), then L2-normalize
+    Stateless and corpus-independent: the same text always yields the same vector,
+    in any process, so cached rows and query embeddings stay compatible.
+    """
+
+    def __init__(self, dim: int = 768, ngram_min: int = 3, ngram_max: int = 5) -> None:
+        self.dim = dim
+        self._ngrams = range(ngram_min, ngram_max + 1)
+        self.model = f"local-hash-char{ngram_min}{ngram_max}-{dim}"
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        if len(texts) > _LOCAL_OFFLOAD_THRESHOLD:
+            matrix = await asyncio.to_thread(self.embed_matrix, texts)
+        else:
+            matrix = self.embed_matrix(texts)
+        return matrix.tolist()
+
+    def embed_matrix(self, texts: list[str]) -> np.ndarray:
+        """(len(texts), dim) float32 matrix of unit rows (zero rows for empty texts)."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+            columns = np.empty(len(features), dtype=np.int64)
+            weights = np.empty(len(features), dtype=np.float32)
+            for i, (feature, tf) in enumerate(features.items()):
+                h = zlib.crc32(feature.encode("utf-8"))
+                columns[i] = h % self.dim
+                weights[i] = (1.0 + math.log(tf)) * (1.0 if h & 0x80000000 else -1.0)
+            np.add.at(matrix[row], columns, weights)
+            norm = np.linalg.norm(matrix[row])
+            if norm:
+                matrix[row] /= norm
+        return matrix
+
+    def _features(self, text: str) -> Counter:
+        features: Counter = Counter()
+        for token in tokenize(text):
+            features["w:" + token] += 1
+            padded = f" {token} "
+            for n in self._ngrams:
+                for start in range(len(padded) - n + 1):
+                    features[padded[start : start + n]] += 1
+        return features
@@ -0,0 +1,167 @@
+"""
+Embedding service — batched, concurrent, with per-batch retry, over a pluggable
+backend (app/rag/embedding_backends.py) chosen by `embedding_backend`:
+"gemini" (default) or "local" (deterministic, offline).
+
+Texts are grouped into multi-text requests (up to `embedding_batch_size` each).
+At most `embedding_concurrency` requests are in flight at once — with Gemini each
+uses the next key from GeminiKeyManager — so a cold index build costs
+~N / (batch_size × concurrency) round trips instead of N.
+"""
+import asyncio
+import time
+from typing import Callable, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+from app.rag.embedding_backends import (
+    EmbeddingBackend,
+    GeminiEmbeddingBackend,
+    LocalHashEmbeddingBackend,
+)
+from app.services.cache import cache_service
+from app.services.key_manager import GeminiKeyManager
+
+EMBED_MODEL = "text-embedding-004"
+EMBED_DIM = 768
+
+
+class EmbeddingError(RuntimeError):
+    """Raised when a batch still fails after all retries."""
+
+
+class EmbeddingService:
+    """Generates text embeddings through an EmbeddingBackend with batching and retry."""
+
+    def __init__(
+        self,
+        backend: EmbeddingBackend,
+        batch_size: int = 100,
+        concurrency: int = 4,
+        max_retries: int = 3,
+    ) -> None:
+        self._backend = backend
+        self._batch_size = batch_size
+        self._concurrency = concurrency
+        self._max_retries = max_retries
+
+    @property
+    def model(self) -> str:
+        """Backend model name — identifies the vector space in stores and caches."""
+        return self._backend.model
+
+    @property
+    def dim(self) -> int:
+        return self._backend.dim
+
+    @property
+    def available(self) -> bool:
+        return self._backend.available
+
+    # ── Public API ─────────────────────────────────────────────────────────────
+
+    async def generate_embedding(self, text: str) -> list[float]:
+        """Embed a single text. Raises EmbeddingError on failure."""
+        return (await self._embed_with_retry([text]))[0]
+
+    async def generate_embeddings_batch(
+        self,
+        texts: list[str],
+        allow_partial: bool = False,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> list[Optional[list[float]]]:
+        """
+        Embed many texts using concurrent multi-text requests.
+
+        Args:
+            texts: Texts to embed, in order
+            allow_partial: If True, rows of a batch that failed after all retries
+                are returned as None instead of raising EmbeddingError
+            on_progress: Called with the number of texts in each batch as it finishes
+
+        Returns:
+            One embedding per input text, in the same order
+        """
+        if not texts:
+            return []
+        semaphore = asyncio.Semaphore(self._concurrency)
+        batches = [
+            (start, texts[start : start + self._batch_size])
+            for start in range(0, len(texts), self._batch_size)
+        ]
+
+        async def _run(start: int, chunk: list[str]) -> tuple[int, list[Optional[list[float]]]]:
+            async with semaphore:
+                try:
+                    vectors = await self._embed_with_retry(chunk)
+                except EmbeddingError:
+                    if not allow_partial:
+                        raise
+                    vectors = [None] * len(chunk)
+                if on_progress is not None:
+                    on_progress(len(chunk))
+                return start, vectors
+
+        t0 = time.perf_counter()
+        results: list[Optional[list[float]]] = [None] * len(texts)
+        for start, vectors in await asyncio.gather(*(_run(s, c) for s, c in batches)):
+            results[start : start + len(vectors)] = vectors
+
+        failed = sum(1 for v in results if v is None)
+        logger.info(
+            "embed_batch | texts={} batches={} concurrency={} failed={} latency={}ms",
+            len(texts), len(batches), self._concurrency, failed,
+            round((time.perf_counter() - t0) * 1000, 1),
+        )
+        return results
+
+    # ── Internal helpers ───────────────────────────────────────────────────────
+
+    async def _embed_with_retry(self, texts: list[str]) -> list[list[float]]:
+        """One multi-text request, retried with backoff on transient provider errors."""
+        if not self._backend.available:
+            raise EmbeddingError(f"embedding backend {self.model} is not configured")
+        last_error: Optional[Exception] = None
+        for attempt in range(self._max_retries + 1):
+            try:
+                vectors = await self._backend.embed(texts)
+            except Exception as e:
+                if not self._backend.is_transient(e):
+                    raise EmbeddingError(f"embedding failed: {e}") from e
+                last_error = e
+                if attempt < self._max_retries:
+                    delay = 0.5 * (2 ** attempt)
+                    logger.warning(
+                        "embed_retry | model={} batch_size={} attempt={} delay={}s error={}",
+                        self.model, len(texts), attempt + 1, delay, str(e)[:200],
+                    )
+                    await asyncio.sleep(delay)
+            else:
+                if len(vectors) != len(texts):
+                    raise EmbeddingError(f"expected {len(texts)} embeddings, got {len(vectors)}")
+                return vectors
+        raise EmbeddingError(f"embedding failed after {self._max_retries + 1} attempts: {last_error}")
+
+
+def build_embedding_backend(name: str) -> EmbeddingBackend:
+    """Backend for `embedding_backend`: "gemini" | "local"."""
+    if name == "local":
+        return LocalHashEmbeddingBackend(dim=settings.local_embedding_dim)
+    if name != "gemini":
+        logger.warning("Unknown embedding backend '{}', using gemini", name)
+    return GeminiEmbeddingBackend(
+        key_manager=GeminiKeyManager(api_keys=settings.gemini_keys_list, cache=cache_service),
+        model=EMBED_MODEL,
+        dim=EMBED_DIM,
+        has_keys=bool(settings.gemini_keys_list),
+    )
+
+
+# Singleton — shared by the RAG service and the recipe indexer
+embedding_service = EmbeddingService(
+    backend=build_embedding_backend(settings.embedding_backend),
+    batch_size=settings.embedding_batch_size,
+    concurrency=settings.embedding_concurrency,
+    max_retries=settings.embedding_max_retries,
+)
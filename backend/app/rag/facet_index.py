@@ -0,0 +1,116 @@
+"""
+Precomputed facet masks for pre-filtered search.
+
+Built once per corpus:
+  - categorical facets (cuisine, difficulty, category, tag): folded value → bool mask (N,)
+  - numeric facets (prep/cook/total time, calories, protein, carbs, fat): a float32
+    column plus cumulative "≤ edge" masks at fixed bucket edges, so common limits
+    ("under 30 minutes", "under 500 kcal") are a precomputed mask lookup and any
+    other limit (or a minimum) is one vectorized comparison
+
+`mask(...)` ANDs the requested facets into a single bool array that the vector,
+BM25 and keyword searches apply *before* top-k selection.
+"""
+from typing import Optional
+
+import numpy as np
+
+from app.utils.text import fold
+
+CATEGORICAL = ("cuisine", "difficulty", "category", "tag")
+
+# Numeric facet → (value extractor, bucket edges)
+_NUMERIC = {
+    "prep_time": (lambda r: r.get("prep_time"), (5, 10, 15, 20, 30, 45, 60, 90, 120)),
+    "cook_time": (lambda r: r.get("cook_time"), (5, 10, 15, 20, 30, 45, 60, 90, 120, 180)),
+    "total_time": (
+        lambda r: (r.get("prep_time") or 0) + (r.get("cook_time") or 0),
+        (15, 30, 45, 60, 90, 120, 180, 240),
+    ),
+    "calories": (lambda r: r.get("nutrition", {}).get("calories"), (200, 300, 400, 500, 600, 800)),
+    "protein": (lambda r: r.get("nutrition", {}).get("protein"), (10, 20, 30, 40, 50)),
+    "carbs": (lambda r: r.get("nutrition", {}).get("carbs"), (10, 20, 30, 50, 80)),
+    "fat": (lambda r: r.get("nutrition", {}).get("fat"), (5, 10, 15, 20, 30)),
+}
+
+# Filter keyword → (numeric facet, comparison)
+RANGE_FILTERS = {
+    "max_prep_time": ("prep_time", "max"),
+    "max_cook_time": ("cook_time", "max"),
+    "max_total_time": ("total_time", "max"),
+    "max_calories": ("calories", "max"),
+    "min_calories": ("calories", "min"),
+    "min_protein": ("protein", "min"),
+    "max_carbs": ("carbs", "max"),
+    "max_fat": ("fat", "max"),
+}
+
+
+class FacetIndex:
+    """Bool masks per facet value and bucketed numeric columns for a fixed recipe list."""
+
+    def __init__(self, recipes: list[dict]) -> None:
+        n = len(recipes)
+        self._size = n
+        self._values: dict[str, dict[str, np.ndarray]] = {name: {} for name in CATEGORICAL}
+        for row, r in enumerate(recipes):
+            for name in CATEGORICAL:
+                raw = r.get("tags", []) if name == "tag" else [r.get(name, "")]
+                for value in raw:
+                    key = fold(value or "").strip()
+                    if not key:
+                        continue
+                    mask = self._values[name].get(key)
+                    if mask is None:
+                        mask = self._values[name][key] = np.zeros(n, dtype=bool)
+                    mask[row] = True
+
+        self._columns: dict[str, np.ndarray] = {}
+        self._le_buckets: dict[str, dict[float, np.ndarray]] = {}
+        for name, (extract, edges) in _NUMERIC.items():
+            # Missing values are NaN → never match a range filter
+            column = np.array(
+                [v if (v := extract(r)) is not None else np.nan for r in recipes], dtype=np.float32
+            )
+            self._columns[name] = column
+            self._le_buckets[name] = {float(edge): column <= edge for edge in edges}
+
+    def mask(self, **filters) -> Optional[np.ndarray]:
+        """
+        AND of every given filter as a bool mask over rows, or None if no filter is set.
+        Categorical filters take a value, or a list of values that must all match
+        (diacritic-insensitive); range filters are the keys of RANGE_FILTERS
+        ("max_prep_time", "max_calories", "min_protein", ...).
+        """
+        parts: list[np.ndarray] = []
+        for name, value in filters.items():
+            if value is None or value == "" or value == []:
+                continue
+            if name in CATEGORICAL:
+                for v in (value if isinstance(value, (list, tuple)) else [value]):
+                    part = self._values[name].get(fold(str(v)).strip())
+                    if part is None:
+                        return np.zeros(self._size, dtype=bool)
+                    parts.append(part)
+            elif name in RANGE_FILTERS:
+                parts.append(self._range_mask(*RANGE_FILTERS[name], float(value)))
+            else:
+                raise ValueError(f"Unknown search filter '{name}'")
+
+        if not parts:
+            return None
+        result = parts[0].copy()
+        for part in parts[1:]:
+            result &= part
+        return result
+
+    def has(self, name: str, value: str) -> bool:
+        """Whether `value` is an indexed value of categorical facet `name`."""
+        return fold(value).strip() in self._values[name]
+
+    def _range_mask(self, facet: str, op: str, limit: float) -> np.ndarray:
+        column = self._columns[facet]
+        if op == "min":
+            return column >= limit
+        bucket = self._le_buckets[facet].get(limit)
+        return bucket if bucket is not None else column <= limit
@@ -0,0 +1,278 @@
+"""
+Ingredient → recipe inverted index for pantry-coverage search.
+
+Ingredient names are reduced to canonical keys:
+  1. fold diacritics and case into syllables (app/utils/text.py: "Cà  Chua" → "ca chua")
+  2. fold synonyms and English names onto one key ("tomato" → "ca chua")
+  3. add every known key contained in a longer name, so modifiers still match
+     ("hành lá thái" → {"hanh la thai", "hanh la"})
+  4. add the protein key of a protein head noun, read with its diacritics: the first
+     syllable, or the one after a cut ("cá lóc" → "ca", "thịt bò bắp" → "bo",
+     "ức gà" → "ga"). A protein that only modifies another head adds nothing
+     ("trứng gà" is egg, "bún bò" and "nước dùng gà" are not meat).
+
+Protein keys are never produced by step 3, and a name that folds onto one without
+being that protein keeps its diacritics as its key, so "bơ" (butter) ≠ "bò" (beef)
+and "cà" (eggplant) ≠ "cá" (fish). Unaccented input is matched on its folded name.
+
+Two names match when their key sets intersect. The index stores, per key, the
+(recipe row, ingredient position) pairs it occurs in; ranking a pantry is a few
+array concatenations plus one bincount over rows — no embeddings, no LLM.
+
+Coverage is the share of a recipe's ingredients the pantry covers. Seasonings
+that every kitchen has (salt, sugar, fish sauce, ...) are STAPLES: they never
+count against coverage and are not reported as missing.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from app.utils.text import has_diacritics, syllables, tokenize
+
+# Canonical key (folded Vietnamese) → folded variants, spellings and English names.
+# Deliberately omits names whose folded form is ambiguous ("dua": dứa pineapple /
+# dừa coconut / dưa melon); proteins are in PROTEINS.
+SYNONYMS: dict[str, tuple[str, ...]] = {
+    "ca chua": ("tomato", "tomatoes"),
+    "toi": ("garlic",),
+    "hanh la": ("green onion", "scallion", "spring onion"),
+    "hanh tay": ("onion", "onions"),
+    "hanh tim": ("shallot", "shallots", "hanh kho"),
+    "gung": ("ginger",),
+    "ot": ("chili", "chilli", "chili pepper"),
+    "tieu": ("pepper", "black pepper", "hat tieu"),
+    "muoi": ("salt",),
+    "duong": ("sugar",),
+    "nuoc mam": ("fish sauce",),
+    "nuoc tuong": ("soy sauce", "xi dau"),
+    "dau an": ("cooking oil", "vegetable oil"),
+    "dau hao": ("oyster sauce",),
+    "dau me": ("sesame oil",),
+    "gia do": ("bean sprouts", "gia"),
+    "sa": ("lemongrass",),
+    "dua leo": ("cucumber", "dua chuot"),
+    "thit ba chi": ("pork belly", "ba chi", "ba roi"),
+    "suon heo": ("pork ribs", "spare ribs", "suon"),
+    "ca rot": ("carrot", "carrots"),
+    "ngo ri": ("cilantro", "coriander", "rau mui", "ngo"),
+    "xa lach": ("lettuce",),
+    "bot bap": ("cornstarch", "corn starch", "bot ngo"),
+    "dau phong": ("peanut", "peanuts", "lac"),
+    "nuoc cot dua": ("coconut milk",),
+    "chanh": ("lime", "lemon"),
+    "gao": ("rice", "gao te"),
+    "mat ong": ("honey",),
+    "nam": ("mushroom", "mushrooms"),
+    "dau hu": ("tofu", "dau phu"),
+    "khoai tay": ("potato", "potatoes"),
+    "rau muong": ("water spinach", "morning glory"),
+    "bun": ("rice vermicelli", "vermicelli"),
+    "mien": ("glass noodles", "cellophane noodles"),
+    "banh pho": ("rice noodles", "pho noodles"),
+}
+
+# Protein key → (head nouns as written, folded full-name variants and English names).
+# Keys come only from a head noun or a whole-name variant (see module docstring).
+PROTEINS: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "bo": (("bò",), ("thit bo", "beef")),
+    "ga": (("gà",), ("thit ga", "chicken")),
+    "heo": (("heo", "lợn"), ("thit heo", "thit lon", "pork")),
+    "vit": (("vịt",), ("thit vit", "duck")),
+    "ca": (("cá",), ("fish",)),
+    "tom": (("tôm",), ("shrimp", "prawn", "prawns")),
+    "muc": (("mực",), ("squid",)),
+    "trung": (("trứng",), ("egg", "eggs", "trung ga")),
+}
+
+# Cuts that put the protein in second place ("thịt bò", "ức gà", "sườn heo")
+CUTS = frozenset({"thịt", "ức", "đùi", "cánh", "sườn", "chân"})
+
+STAPLES = frozenset({"muoi", "duong", "tieu", "nuoc mam", "dau an", "nuoc tuong", "bot ngot"})
+
+# Any known name or variant inside a longer name (step 3) — never a protein
+_CONTAINED: dict[str, str] = {
+    **{canonical: canonical for canonical in SYNONYMS},
+    **{variant: canonical for canonical, variants in SYNONYMS.items() for variant in variants},
+}
+# Whole names, proteins included
+_CANONICAL: dict[str, str] = {
+    **_CONTAINED,
+    **{key: key for key in PROTEINS},
+    **{variant: key for key, (_, variants) in PROTEINS.items() for variant in variants},
+}
+_HEADS: dict[str, str] = {head: key for key, (heads, _) in PROTEINS.items() for head in heads}
+_MAX_PHRASE = max(len(name.split()) for name in _CONTAINED)
+
+
+def _protein_head(written: list[str]) -> Optional[str]:
+    """Protein key of the head noun among lower-cased, accented syllables, if any."""
+    head = written[1] if len(written) > 1 and written[0] in CUTS else written[0]
+    return _HEADS.get(head)
+
+
+@lru_cache(maxsize=8192)
+def _analyze(name: str) -> tuple[str, frozenset[str]]:
+    """(canonical full name, canonical keys) of one ingredient name."""
+    words = tokenize(name)
+    if not words:
+        return "", frozenset()
+    written = syllables(name)
+    protein = _protein_head(written)
+    full = " ".join(words)
+    canonical_full = _CANONICAL.get(full, full)
+    if canonical_full in PROTEINS and canonical_full != protein and any(map(has_diacritics, written)):
+        # Folds onto a protein without being it: "bơ" → "bo", "cà" → "ca"
+        canonical_full = " ".join(written)
+    keys = {canonical_full}
+    if protein is not None:
+        keys.add(protein)
+    for size in range(1, min(_MAX_PHRASE, len(words)) + 1):
+        for start in range(len(words) - size + 1):
+            canonical = _CONTAINED.get(" ".join(words[start : start + size]))
+            if canonical is not None:
+                keys.add(canonical)
+    return canonical_full, frozenset(keys)
+
+
+def canonical_name(name: str) -> str:
+    """
+    Synonym-resolved name of one ingredient, folded unless that would make it another
+    ingredient: "Trứng gà" → "trung", "thịt bò" → "bo", "tomato" → "ca chua", "bơ" → "bơ".
+    """
+    return _analyze(name)[0]
+
+
+def written_name(name: str) -> str:
+    """
+    canonical_name with the diacritics that tell ingredients apart: a protein as its
+    head noun ("thịt bò", "beef" → "bò"; "cá" ≠ "cà"), a synonym as its key
+    ("tomato" → "ca chua"), any other name as written ("Cá  Kho" → "cá kho").
+    """
+    canonical = canonical_name(name)
+    if canonical in PROTEINS:
+        return PROTEINS[canonical][0][0]
+    if canonical in SYNONYMS:
+        return canonical
+    return " ".join(syllables(name))
+
+
+def ingredient_keys(name: str) -> frozenset[str]:
+    """Canonical keys of one ingredient name (see module docstring)."""
+    return _analyze(name)[1]
+
+
+def is_staple(name: str) -> bool:
+    """
+    Whether an ingredient is a pantry staple: its canonical name is one, or it is
+    made only of staples ("muối tiêu", "muối hột").
+    """
+    full, keys = _analyze(name)
+    if full in STAPLES:
+        return True
+    parts = keys - {full}
+    return bool(parts) and parts <= STAPLES
+
+
+@dataclass
+class IngredientMatch:
+    """Pantry coverage of one recipe."""
+
+    row: int
+    coverage: float  # covered / required (staples excluded); 1.0 if only staples
+    matched: list[str] = field(default_factory=list)  # recipe ingredient names the pantry covers
+    missing: list[str] = field(default_factory=list)  # required names it does not
+
+
+def match_ingredients(pantry: list[str], ingredients: list[str], row: int = -1) -> IngredientMatch:
+    """Coverage of a single recipe's `ingredients` by `pantry` (no index needed)."""
+    pantry_keys: set[str] = set()
+    for item in pantry:
+        pantry_keys |= ingredient_keys(item)
+    matched, missing = [], []
+    for name in ingredients:
+        if ingredient_keys(name) & pantry_keys:
+            matched.append(name)
+        elif not is_staple(name):
+            missing.append(name)
+    return _result(row, matched, missing)
+
+
+def _result(row: int, matched: list[str], missing: list[str]) -> IngredientMatch:
+    required_matched = sum(1 for name in matched if not is_staple(name))
+    required = required_matched + len(missing)
+    coverage = required_matched / required if required else 1.0
+    return IngredientMatch(row=row, coverage=round(coverage, 4), matched=matched, missing=missing)
+
+
+class IngredientIndex:
+    """Inverted index from canonical ingredient keys to (row, ingredient position) pairs."""
+
+    def __init__(self, recipes: list[dict]) -> None:
+        self._ingredients: list[list[str]] = [list(r.get("ingredients", [])) for r in recipes]
+        self._width = max((len(names) for names in self._ingredients), default=0) + 1
+        self._required = np.zeros(len(recipes), dtype=np.int32)
+        self._required_slots = np.zeros(len(recipes) * self._width, dtype=bool)
+        pairs: dict[str, list[int]] = {}
+        for row, names in enumerate(self._ingredients):
+            for pos, name in enumerate(names):
+                slot = row * self._width + pos
+                if not is_staple(name):
+                    self._required[row] += 1
+                    self._required_slots[slot] = True
+                for key in ingredient_keys(name):
+                    pairs.setdefault(key, []).append(slot)
+        # key → sorted unique slot ids (row * width + position)
+        self._postings = {key: np.unique(np.array(slots, dtype=np.int64)) for key, slots in pairs.items()}
+
+    def __len__(self) -> int:
+        return len(self._ingredients)
+
+    def rank(
+        self,
+        pantry: list[str],
+        k: int = 10,
+        min_coverage: float = 0.0,
+        mask: Optional[np.ndarray] = None,
+    ) -> list[IngredientMatch]:
+        """
+        Recipes (restricted to `mask`) sharing at least one required ingredient with
+        `pantry`, best coverage first, then most matched ingredients. Matched and
+        missing names are filled in only for the k returned rows.
+        """
+        keys: set[str] = set()
+        for item in pantry:
+            keys |= ingredient_keys(item)
+        lists = [self._postings[key] for key in keys if key in self._postings]
+        if not lists:
+            return []
+        slots = np.unique(np.concatenate(lists))
+        required_slots = slots[self._required_slots[slots]]
+        n = len(self._ingredients)
+        covered = np.bincount(required_slots // self._width, minlength=n)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coverage = np.where(self._required > 0, covered / np.maximum(self._required, 1), 1.0)
+        candidates = covered > 0
+        if min_coverage > 0:
+            candidates &= coverage >= min_coverage
+        if mask is not None:
+            candidates &= mask
+        rows = np.flatnonzero(candidates)
+        if rows.size == 0:
+            return []
+        # Sort by coverage desc, then by covered count desc, then row (stable, deterministic)
+        order = np.lexsort((rows, -covered[rows], -coverage[rows]))[:k]
+
+        matched_slots = set(slots.tolist())
+        results = []
+        for row in rows[order]:
+            names = self._ingredients[row]
+            matched = [name for pos, name in enumerate(names) if row * self._width + pos in matched_slots]
+            missing = [
+                name for pos, name in enumerate(names)
+                if row * self._width + pos not in matched_slots and self._required_slots[row * self._width + pos]
+            ]
+            results.append(_result(int(row), matched, missing))
+        return results
@@ -0,0 +1,169 @@
+"""
+Inverted keyword index over the community recipe corpus.
+
+Built once when the corpus is loaded:
+  - token postings: folded syllable or adjacent-syllable n-gram ("ca", "chua",
+    "cachua") → set of row ids (title, description, tags, ingredients)
+  - syllable postings with diacritics kept ("cá" → rows), so a query syllable typed
+    with tones matches as written: "cá" does not find "cà", "bò" does not find "bơ"
+  - sorted vocabulary, so the last query syllable can prefix-match ("ph" → "pho", "phi", ...)
+  - BM25 term statistics: token → (row ids, precomputed idf × tf-saturation weights)
+
+A keyword query is then a handful of set intersections instead of a
+lower-case + substring scan over every recipe, and BM25 ranking is a few
+numpy scatter-adds over the query terms' postings. Facet filters live in
+app/rag/facet_index.py and are applied as a row mask.
+"""
+from bisect import bisect_left
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+from app.utils.text import analyze, has_diacritics, query_terms, syllables, tokenize
+
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+class KeywordIndex:
+    """Token postings for a fixed list of recipe dicts (row id = list index)."""
+
+    def __init__(self, recipes: list[dict]) -> None:
+        self._size = len(recipes)
+        postings: dict[str, set[int]] = {}
+        exact: dict[str, set[int]] = {}
+        term_freqs: dict[str, list[tuple[int, int]]] = {}
+        doc_lens = np.zeros(len(recipes), dtype=np.float32)
+
+        for row, r in enumerate(recipes):
+            tokens = analyze(self.document_text(r))
+            doc_lens[row] = len(tokens)
+            for syllable in set(syllables(self.document_text(r))):
+                exact.setdefault(syllable, set()).add(row)
+            for token, tf in Counter(tokens).items():
+                postings.setdefault(token, set()).add(row)
+                term_freqs.setdefault(token, []).append((row, tf))
+
+        self._postings = postings
+        self._exact = exact
+        self._vocab = sorted(postings)
+        self._bm25 = self._bm25_weights(term_freqs, doc_lens)
+
+    @staticmethod
+    def document_text(recipe: dict) -> str:
+        """Fields matched by keyword search."""
+        return " ".join([
+            recipe.get("title", ""),
+            recipe.get("description", ""),
+            " ".join(recipe.get("tags", [])),
+            " ".join(recipe.get("ingredients", [])),
+        ])
+
+    def search(self, query: str = "", mask: Optional[np.ndarray] = None) -> list[int]:
+        """
+        Row ids allowed by `mask` matching every query syllable, best match first.
+
+          - a syllable typed with diacritics matches only that syllable as written
+            ("cá" ≠ "cà"); if the corpus has no such syllable at all it falls back to
+            its folded form, so a mistyped tone still finds something
+          - a syllable without diacritics matches its folded form exactly ("bo" → bò, bơ)
+          - only the last syllable — the one still being typed — also matches as a
+            prefix of any indexed term, including n-grams, so "cachua" finds "cà chua"
+
+        Rows matching every syllable exactly (as written, or as a whole folded term)
+        rank above rows that needed a folded fallback or a prefix expansion, then rows
+        holding the syllables adjacently ("cà chua" as a phrase); ties keep corpus order. An empty query returns every allowed row; a query with no
+        searchable characters ("!!!") returns none.
+        """
+        if not query.strip():
+            return np.flatnonzero(mask).tolist() if mask is not None else list(range(self._size))
+        terms = list(dict.fromkeys(
+            (syllable, token) for syllable in syllables(query) for token in tokenize(syllable)
+        ))
+        if not terms:
+            return []
+
+        result: Optional[set[int]] = None
+        exact_sets: list[set[int]] = []
+        for pos, (syllable, token) in enumerate(terms):
+            accented = has_diacritics(syllable)
+            if accented and syllable in self._exact:
+                rows = exact = self._exact[syllable]
+            else:
+                is_prefix = not accented and pos == len(terms) - 1
+                rows = self._prefix_rows(token) if is_prefix else self._postings.get(token, set())
+                exact = set() if accented else self._postings.get(token, set())
+            result = set(rows) if result is None else result & rows
+            if not result:
+                return []
+            exact_sets.append(exact)
+
+        phrases = [self._postings[gram] for gram in query_terms(query)[1] if gram in self._postings]
+        rows = sorted(result, key=lambda row: (
+            sum(row not in e for e in exact_sets), -sum(row in p for p in phrases), row
+        ))
+        if mask is not None:
+            return [row for row in rows if mask[row]]
+        return rows
+
+    def bm25(self, query: str, k: int, mask: Optional[np.ndarray] = None) -> list[tuple[int, float]]:
+        """
+        Top-k (row id, BM25 score) for `query` among rows allowed by `mask`, best
+        first. Query syllables without an exact vocabulary match fall back to their
+        prefix expansions; query n-grams count only on an exact match, which ranks
+        documents containing the words as written ("cà chua") above scattered syllables.
+        """
+        if not self._size:
+            return []
+        scores = np.zeros(self._size, dtype=np.float32)
+        tokens, ngrams = query_terms(query)
+        for token in tokens:
+            terms = [token] if token in self._bm25 else self._prefix_terms(token)
+            for term in terms:
+                rows, weights = self._bm25[term]
+                scores[rows] += weights
+        for gram in ngrams:
+            if gram in self._bm25:
+                rows, weights = self._bm25[gram]
+                scores[rows] += weights
+        if mask is not None:
+            scores[~mask] = 0.0
+
+        matched = np.flatnonzero(scores)
+        if not matched.size:
+            return []
+        k = min(k, matched.size)
+        top = matched[np.argpartition(scores[matched], matched.size - k)[matched.size - k:]]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(int(i), float(scores[i])) for i in top]
+
+    @staticmethod
+    def _bm25_weights(
+        term_freqs: dict[str, list[tuple[int, int]]], doc_lens: np.ndarray
+    ) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """Precompute idf × tf·(k1+1) / (tf + k1·(1 − b + b·dl/avgdl)) for every posting."""
+        n_docs = len(doc_lens)
+        avgdl = float(doc_lens.mean()) if n_docs and doc_lens.any() else 1.0
+        norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * doc_lens / avgdl)
+        weights: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for term, entries in term_freqs.items():
+            rows = np.fromiter((row for row, _ in entries), dtype=np.int64, count=len(entries))
+            tf = np.fromiter((tf for _, tf in entries), dtype=np.float32, count=len(entries))
+            idf = np.log(1 + (n_docs - len(entries) + 0.5) / (len(entries) + 0.5))
+            weights[term] = (rows, (idf * tf * (_BM25_K1 + 1) / (tf + norm[rows])).astype(np.float32))
+        return weights
+
+    def _prefix_terms(self, prefix: str) -> list[str]:
+        start = bisect_left(self._vocab, prefix)
+        end = bisect_left(self._vocab, prefix + "\uffff", lo=start)
+        return self._vocab[start:end]
+
+    def _prefix_rows(self, prefix: str) -> set[int]:
+        terms = self._prefix_terms(prefix)
+        if len(terms) == 1:
+            return self._postings[terms[0]]
+        rows: set[int] = set()
+        for term in terms:
+            rows |= self._postings[term]
+        return rows
@@ -0,0 +1,97 @@
+"""
+Precomputed k-nearest-neighbour table ("more like this").
+
+For every row of an embedding matrix, the ids and cosine scores of its k most
+similar other rows, computed once when the vector index is built. A lookup is
+one slice of two (N, k) arrays — no query embedding and no scan per request.
+
+  - exact / small corpora: blocked matrix products (block × N scores at a time)
+    with argpartition per block row
+  - IVF: one index search per row, so building stays sub-quadratic for 100k+ rows
+"""
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+from app.rag.vector_index import VectorIndex
+
+_BLOCK_ROWS = 1024  # rows scored per matrix product (block × N float32 scores in memory)
+
+
+class NeighborTable:
+    """(N, k) neighbour rows and scores; rows with fewer than k neighbours are padded with -1."""
+
+    def __init__(self, rows: np.ndarray, scores: np.ndarray) -> None:
+        self._rows = rows
+        self._scores = scores
+
+    @property
+    def k(self) -> int:
+        return self._rows.shape[1]
+
+    def get(self, row: int, k: Optional[int] = None) -> list[tuple[int, float]]:
+        """Best `k` (neighbour row, score) pairs for `row`, most similar first."""
+        k = self.k if k is None else min(k, self.k)
+        return [
+            (int(r), float(s))
+            for r, s in zip(self._rows[row, :k], self._scores[row, :k])
+            if r >= 0
+        ]
+
+    def save(self, directory: Path) -> None:
+        """Write neighbors_rows.npy / neighbors_scores.npy into `directory` (each via rename)."""
+        for name, array in (("neighbors_rows", self._rows), ("neighbors_scores", self._scores)):
+            tmp = directory / f"{name}.tmp{os.getpid()}.npy"
+            np.save(tmp, np.ascontiguousarray(array))
+            os.replace(tmp, directory / f"{name}.npy")
+
+    @classmethod
+    def load(cls, directory: Path, k: int) -> Optional["NeighborTable"]:
+        """Memory-map a saved table; None if missing or built with a smaller k."""
+        try:
+            rows = np.load(directory / "neighbors_rows.npy", mmap_mode="r")
+            scores = np.load(directory / "neighbors_scores.npy", mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if rows.shape != scores.shape or rows.ndim != 2 or rows.shape[1] < min(k, rows.shape[0] - 1):
+            return None
+        return cls(rows, scores)
+
+
+def build_neighbor_table(
+    matrix: np.ndarray, k: int, index: Optional[VectorIndex] = None
+) -> NeighborTable:
+    """
+    k nearest neighbours of every row of a unit-normalized `matrix`, excluding the
+    row itself. Uses `index` for per-row searches when it is approximate (IVF),
+    otherwise exact blocked scoring.
+    """
+    n = matrix.shape[0]
+    k = max(0, min(k, n - 1))
+    rows = np.full((n, k), -1, dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if k == 0:
+        return NeighborTable(rows, scores)
+
+    if index is not None and index.kind == "ivf":
+        for row in range(n):
+            found, found_scores = index.search(matrix[row], k + 1)
+            keep = found != row
+            found, found_scores = found[keep][:k], found_scores[keep][:k]
+            rows[row, : len(found)] = found
+            scores[row, : len(found)] = found_scores
+    else:
+        for start in range(0, n, _BLOCK_ROWS):
+            stop = min(start + _BLOCK_ROWS, n)
+            block = np.asarray(matrix[start:stop]) @ np.asarray(matrix).T
+            block[np.arange(stop - start), np.arange(start, stop)] = -np.inf  # never your own neighbour
+            best = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(block, best, axis=1)
+            order = np.argsort(-best_scores, axis=1)
+            rows[start:stop] = np.take_along_axis(best, order, axis=1)
+            scores[start:stop] = np.take_along_axis(best_scores, order, axis=1)
+    logger.debug("Neighbour table built: {} rows × k={}", n, k)
+    return NeighborTable(rows, scores)
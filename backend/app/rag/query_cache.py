@@ -0,0 +1,102 @@
+"""
+Two-tier cache for query embeddings.
+
+  1. In-process LRU keyed by the normalized query text (no I/O)
+  2. Redis via CacheService, shared by all workers (one round trip, no embedding call)
+
+Only on a miss in both tiers is the embedding API called; the result is written
+back to both. Search queries are short and heavily repeated ("canh chua cá"),
+so most requests never leave the process.
+"""
+import re
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+from app.core.config import settings
+from app.rag.embeddings import EmbeddingService, embedding_service
+from app.services.cache import CacheService, cache_service
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryEmbeddingCache:
+    """LRU + Redis cache in front of EmbeddingService.generate_embedding."""
+
+    def __init__(
+        self,
+        embedder: EmbeddingService,
+        cache: CacheService,
+        max_size: int = 1024,
+        ttl: int = 604800,
+    ) -> None:
+        self._embedder = embedder
+        self._cache = cache
+        self._max_size = max_size
+        self._ttl = ttl
+        self._lru: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._hits_memory = 0
+        self._hits_redis = 0
+        self._misses = 0
+
+    @property
+    def available(self) -> bool:
+        """False if the embedding backend cannot embed at all (e.g. no API key configured)."""
+        return self._embedder.available
+
+    async def get(self, query: str) -> np.ndarray:
+        """Return the float32 embedding for `query`. Raises EmbeddingError on API failure."""
+        text = self.normalize(query)
+
+        vector = self._lru.get(text)
+        if vector is not None:
+            self._lru.move_to_end(text)
+            self._hits_memory += 1
+            return vector
+
+        redis_key = CacheService.make_key("qemb", model=self._embedder.model, q=text)
+        cached = await self._cache.get(redis_key)
+        if cached:
+            self._hits_redis += 1
+            vector = np.asarray(cached, dtype=np.float32)
+        else:
+            self._misses += 1
+            values = await self._embedder.generate_embedding(text)
+            vector = np.asarray(values, dtype=np.float32)
+            await self._cache.set(redis_key, vector.tolist(), self._ttl)
+
+        self._remember(text, vector)
+        return vector
+
+    def stats(self) -> dict:
+        lookups = self._hits_memory + self._hits_redis + self._misses
+        return {
+            "size": len(self._lru),
+            "max_size": self._max_size,
+            "hits_memory": self._hits_memory,
+            "hits_redis": self._hits_redis,
+            "misses": self._misses,
+            "hit_rate": round((self._hits_memory + self._hits_redis) / lookups, 4) if lookups else 0.0,
+        }
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Cache key text: NFC, lower-cased, whitespace collapsed."""
+        return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", query).lower()).strip()
+
+    def _remember(self, text: str, vector: np.ndarray) -> None:
+        vector.setflags(write=False)
+        self._lru[text] = vector
+        self._lru.move_to_end(text)
+        while len(self._lru) > self._max_size:
+            self._lru.popitem(last=False)
+
+
+# Singleton — used by RecipeRAGService.search (and therefore get_context)
+query_embedding_cache = QueryEmbeddingCache(
+    embedder=embedding_service,
+    cache=cache_service,
+    max_size=settings.query_embedding_cache_size,
+    ttl=settings.cache_ttl_query_embeddings,
+)
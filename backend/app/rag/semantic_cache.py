@@ -0,0 +1,197 @@
+"""
+Semantic response cache for recipe suggestions.
+
+The exact Redis key hashes the sorted raw ingredient list, so "trứng, cà chua" and
+"cà chua, trứng gà" miss each other and both pay for an LLM call. This tier sits
+behind it:
+
+  1. normalize the request — ingredients reduced to canonical names that keep the
+     diacritics telling them apart (app/rag/ingredient_index.py written_name:
+     "Trứng gà" → "trứng", "cá" ≠ "cà", "bò" ≠ "bơ"), de-duplicated and sorted;
+     filters folded and sorted
+  2. embed the normalized ingredient text (through the query-embedding LRU + Redis
+     cache, so repeats cost no API call)
+  3. exact top-1 search (ExactIndex) over the previous answers with the same filters
+  4. return that answer if its cosine similarity is ≥ `semantic_cache_threshold`
+
+Filters are matched exactly, never semantically — "chay" must not be answered from a
+non-vegetarian request; a filter key is dropped with the last entry using it. Entries
+live in a fixed-capacity ring buffer per worker and expire after `cache_ttl_recipes`. Every lookup's best similarity is recorded, so
+`stats()` shows the hit rate and the similarity distribution to tune the threshold.
+"""
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+from app.core.config import settings
+from app.rag.ingredient_index import written_name
+from app.rag.query_cache import QueryEmbeddingCache, query_embedding_cache
+from app.rag.vector_index import ExactIndex
+from app.utils.text import fold
+
+_SIMILARITY_WINDOW = 1000  # recent best-match similarities kept for stats
+_HISTOGRAM_EDGES = (0.0, 0.80, 0.85, 0.90, 0.925, 0.95, 0.975, 1.0)
+
+
+class SemanticResponseCache:
+    """Nearest-neighbour cache of LLM responses keyed by request embeddings."""
+
+    def __init__(
+        self,
+        embedder: QueryEmbeddingCache,
+        threshold: float = 0.95,
+        capacity: int = 2048,
+        ttl: int = 3600,
+    ) -> None:
+        self._embedder = embedder
+        self._threshold = threshold
+        self._capacity = capacity
+        self._ttl = ttl
+        # Allocated on first store, when the embedding dimension is known
+        self._matrix: Optional[np.ndarray] = None
+        self._index: Optional[ExactIndex] = None
+        self._filter_ids = np.full(capacity, -1, dtype=np.int32)
+        self._expires = np.zeros(capacity, dtype=np.float64)
+        self._responses: list[Optional[dict]] = [None] * capacity
+        self._slot_keys: list[Optional[tuple[str, str]]] = [None] * capacity
+        self._slots: dict[tuple[str, str], int] = {}  # (request text, filter key) → slot
+        self._filters: dict[str, list[int]] = {}  # filter key → [filter id, slots using it]
+        self._next_filter_id = 0
+        self._next_slot = 0
+        self._hits = 0
+        self._misses = 0
+        self._similarities: deque[float] = deque(maxlen=_SIMILARITY_WINDOW)
+
+    @property
+    def available(self) -> bool:
+        """False if requests cannot be embedded (e.g. Gemini backend without a key)."""
+        return self._embedder.available
+
+    async def lookup(self, ingredients: list[str], filters: list[str]) -> Optional[dict]:
+        """A previous response for an equivalent request, or None."""
+        text, filter_key = self._normalize(ingredients, filters)
+        entry = self._filters.get(filter_key)
+        if entry is None or self._index is None:
+            self._misses += 1
+            return None
+        filter_id = entry[0]
+        vector = await self._embed(text)
+        if vector is None:
+            self._misses += 1
+            return None
+
+        mask = (self._filter_ids == filter_id) & (self._expires > time.time())
+        rows, scores = self._index.search(vector, 1, mask)
+        if rows.size == 0:
+            self._misses += 1
+            return None
+        similarity = float(scores[0])
+        self._similarities.append(similarity)
+        if similarity < self._threshold:
+            self._misses += 1
+            return None
+        self._hits += 1
+        logger.info(
+            "semantic_cache | HIT similarity={} request={} cached={}",
+            round(similarity, 4), text, self._slot_keys[int(rows[0])][0],
+        )
+        return self._responses[int(rows[0])]
+
+    async def store(self, ingredients: list[str], filters: list[str], response: dict) -> None:
+        """Remember `response` for this request (replacing an identical normalized request)."""
+        text, filter_key = self._normalize(ingredients, filters)
+        vector = await self._embed(text)
+        if vector is None:
+            return
+        if self._matrix is None:
+            self._matrix = np.zeros((self._capacity, vector.shape[0]), dtype=np.float32)
+            self._index = ExactIndex(self._matrix)
+
+        key = (text, filter_key)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._next_slot
+            self._next_slot = (self._next_slot + 1) % self._capacity
+            evicted = self._slot_keys[slot]
+            if evicted is not None:
+                del self._slots[evicted]
+                self._release_filter(evicted[1])
+            self._acquire_filter(filter_key)
+        self._matrix[slot] = vector
+        self._filter_ids[slot] = self._filters[filter_key][0]
+        self._expires[slot] = time.time() + self._ttl
+        self._responses[slot] = response
+        self._slot_keys[slot] = key
+        self._slots[key] = slot
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        similarities = np.array(self._similarities, dtype=np.float32)
+        distribution: dict = {"count": int(similarities.size)}
+        if similarities.size:
+            p50, p90, p99 = np.percentile(similarities, [50, 90, 99])
+            counts, _ = np.histogram(np.clip(similarities, 0.0, 1.0), bins=_HISTOGRAM_EDGES)
+            distribution.update(
+                mean=round(float(similarities.mean()), 4),
+                p50=round(float(p50), 4),
+                p90=round(float(p90), 4),
+                p99=round(float(p99), 4),
+                histogram={
+                    f"{lo:.3f}-{hi:.3f}": int(n)
+                    for lo, hi, n in zip(_HISTOGRAM_EDGES, _HISTOGRAM_EDGES[1:], counts)
+                },
+            )
+        return {
+            "threshold": self._threshold,
+            "entries": len(self._slots),
+            "filter_keys": len(self._filters),
+            "capacity": self._capacity,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            "best_similarity": distribution,
+        }
+
+    @staticmethod
+    def _normalize(ingredients: list[str], filters: list[str]) -> tuple[str, str]:
+        """(ingredient text to embed, exact filter key) of a request."""
+        names = sorted({name for name in map(written_name, ingredients) if name})
+        filter_key = "|".join(sorted({fold(f).strip() for f in filters if f.strip()}))
+        return ", ".join(names), filter_key
+
+    def _acquire_filter(self, filter_key: str) -> None:
+        entry = self._filters.get(filter_key)
+        if entry is None:
+            entry = self._filters[filter_key] = [self._next_filter_id, 0]
+            self._next_filter_id += 1
+        entry[1] += 1
+
+    def _release_filter(self, filter_key: str) -> None:
+        """Drop a filter key with its last slot; ids are never reused, so no stale row matches."""
+        entry = self._filters[filter_key]
+        entry[1] -= 1
+        if not entry[1]:
+            del self._filters[filter_key]
+
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        if not text or not self._embedder.available:
+            return None
+        try:
+            vector = await self._embedder.get(text)
+        except Exception as e:
+            logger.warning("semantic_cache | embedding failed: {}", e)
+            return None
+        norm = np.linalg.norm(vector)
+        return (vector / norm).astype(np.float32) if norm else None
+
+
+# Singleton — used by CachedLLM.suggest_recipes behind the exact Redis key
+semantic_cache = SemanticResponseCache(
+    embedder=query_embedding_cache,
+    threshold=settings.semantic_cache_threshold,
+    capacity=settings.semantic_cache_size,
+    ttl=settings.cache_ttl_recipes,
+)
@@ -0,0 +1,111 @@
+"""
+Cross-process sharing of the RAG index between uvicorn/gunicorn workers.
+
+With `rag_shared_index` on, one worker builds and every worker maps:
+  - an exclusive flock on a lock file serializes index builds, so only the first
+    worker pays for embedding calls, k-means training and quantization; the others
+    block on the lock, then find the freshly written artifacts and just open them
+  - the embedding matrix is the float32 store (app/rag/store.py) opened with mmap
+  - derived vector-index arrays (int8 codes, IVF centroids/lists) and the
+    similar-recipes neighbour table are saved next to the store as .npy files and
+    loaded with mmap_mode="r"
+
+Mapped pages live in the shared page cache, so resident memory for the arrays stays
+flat as workers are added. The parsed recipe dicts and keyword postings are small
+Python objects and remain per-process.
+"""
+import asyncio
+import hashlib
+import os
+import shutil
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import numpy as np
+from loguru import logger
+
+from app.rag.neighbors import NeighborTable, build_neighbor_table
+from app.rag.vector_index import VectorIndex, build_vector_index, load_vector_index
+
+try:
+    import fcntl
+except ImportError:  # Windows — single-process dev servers only
+    fcntl = None
+
+
+@asynccontextmanager
+async def file_lock(path: Path) -> AsyncIterator[None]:
+    """Exclusive inter-process lock on `path`; waits in a thread so the event loop keeps serving."""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        await asyncio.to_thread(fcntl.flock, fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def index_dir(root: Path, content_hash: str, kind: str, nlist: int, quantization: str) -> Path:
+    """Directory for the saved index of one store version + build parameters."""
+    params = f"{content_hash}|{kind}|{nlist}|{quantization}"
+    return root / hashlib.sha256(params.encode()).hexdigest()[:16]
+
+
+def load_or_build_index(
+    root: Path,
+    content_hash: str,
+    matrix: np.ndarray,
+    *,
+    kind: str,
+    nlist: int,
+    nprobe: int,
+    quantization: str,
+    rerank_factor: int,
+) -> VectorIndex:
+    """
+    Map the saved index for this store version if present, otherwise build and save it.
+    Call with the build lock held. Indexes of older store versions are removed.
+    """
+    directory = index_dir(root, content_hash, kind, nlist, quantization)
+    index: Optional[VectorIndex] = load_vector_index(directory, matrix, nprobe, rerank_factor)
+    if index is not None:
+        logger.info("RAG: mapped shared vector index {}", directory.name)
+        return index
+
+    index = build_vector_index(
+        matrix, kind=kind, nlist=nlist, nprobe=nprobe,
+        quantization=quantization, rerank_factor=rerank_factor,
+    )
+    tmp = directory.with_name(f"{directory.name}.tmp{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    index.save(tmp)
+    for stale in root.iterdir():
+        # Workers still mapping an old version keep their pages until they swap
+        if stale.is_dir() and stale != tmp:
+            shutil.rmtree(stale, ignore_errors=True)
+    os.replace(tmp, directory)
+    logger.info("RAG: saved shared vector index {}", directory.name)
+
+    # Re-open from disk so this worker maps the same pages as the others
+    return load_vector_index(directory, matrix, nprobe, rerank_factor) or index
+
+
+def load_or_build_neighbors(directory: Path, matrix: np.ndarray, index: VectorIndex, k: int) -> NeighborTable:
+    """
+    Map the neighbour table saved in an index directory (see `index_dir`), otherwise
+    build it and save it there. Call with the build lock held, after `load_or_build_index`.
+    """
+    table = NeighborTable.load(directory, k)
+    if table is not None:
+        return table
+    table = build_neighbor_table(matrix, k, index)
+    table.save(directory)
+    logger.info("RAG: saved shared neighbour table {} (k={})", directory.name, table.k)
+    return NeighborTable.load(directory, k) or table
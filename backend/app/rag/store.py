@@ -0,0 +1,147 @@
+"""
+Binary on-disk embedding store, opened with memory mapping.
+
+File layout (little-endian):
+  [0:8]    magic b"CHEFEMB1"
+  [8:12]   uint32 — length of the JSON header in bytes
+  [12:..]  JSON header: {count, dim, dtype, model, content_hash, data_offset, hashes_offset}
+  padding  up to a 64-byte boundary
+  [data_offset:]    raw (count, dim) matrix of float32 or float16
+  [hashes_offset:]  count × 16-byte row keys (hash of each row's source text)
+
+Row keys let the index builder reuse vectors whose source text did not change;
+content_hash is derived from the model name + all row keys in order.
+
+Because the matrix is a raw array at a fixed offset, opening the store is an
+mmap + a tiny header parse — constant time regardless of corpus size — and every
+process that maps the same file shares the same page-cache pages.
+"""
+import hashlib
+import json
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+_MAGIC = b"CHEFEMB1"
+_ALIGN = 64
+ROW_KEY_SIZE = 16
+MISSING_ROW_KEY = b"\0" * ROW_KEY_SIZE  # marks a row that must be re-embedded next build
+_DTYPES = {"float32": np.float32, "float16": np.float16}
+
+
+@dataclass(frozen=True)
+class StoreHeader:
+    count: int
+    dim: int
+    dtype: str
+    model: str
+    content_hash: str
+    data_offset: int
+    hashes_offset: int
+
+
+def row_key(text: str) -> bytes:
+    """16-byte key identifying the source text of one embedding row."""
+    return hashlib.sha256(text.encode("utf-8")).digest()[:ROW_KEY_SIZE]
+
+
+def content_hash(model: str, row_keys: list[bytes]) -> str:
+    """Hash of the model name + every row key in order — identifies a store's corpus."""
+    h = hashlib.sha256(model.encode("utf-8"))
+    for key in row_keys:
+        h.update(key)
+    return h.hexdigest()
+
+
+def write_store(
+    path: Path,
+    matrix: np.ndarray,
+    row_keys: list[bytes],
+    *,
+    model: str,
+    dtype: str = "float32",
+) -> StoreHeader:
+    """
+    Write `matrix` (N, dim) and its N row keys to `path`.
+    The file is written to a temp name and renamed into place, so processes that
+    already mapped the previous version keep reading a consistent snapshot.
+    """
+    if dtype not in _DTYPES:
+        raise ValueError(f"Unsupported embedding dtype '{dtype}' — use one of {list(_DTYPES)}")
+    data = np.ascontiguousarray(matrix, dtype=np.dtype(_DTYPES[dtype]).newbyteorder("<"))
+    count, dim = data.shape
+    if len(row_keys) != count:
+        raise ValueError(f"Got {len(row_keys)} row keys for {count} rows")
+
+    meta = {
+        "count": count,
+        "dim": dim,
+        "dtype": dtype,
+        "model": model,
+        "content_hash": content_hash(model, row_keys),
+        "data_offset": 0,
+        "hashes_offset": 0,
+    }
+    # The offsets depend on the header length, which depends on the offsets' digits —
+    # reserve spare bytes so one pass is enough.
+    header_len = len(json.dumps(meta).encode()) + 32
+    data_offset = -(-(len(_MAGIC) + 4 + header_len) // _ALIGN) * _ALIGN
+    meta["data_offset"] = data_offset
+    meta["hashes_offset"] = data_offset + data.nbytes
+    header_bytes = json.dumps(meta).encode().ljust(header_len)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + f".tmp{os.getpid()}")
+    with open(tmp_path, "wb") as f:
+        f.write(_MAGIC)
+        f.write(struct.pack("<I", header_len))
+        f.write(header_bytes)
+        f.write(b"\0" * (data_offset - f.tell()))
+        f.write(data.tobytes())
+        f.write(b"".join(row_keys))
+    os.replace(tmp_path, path)
+    return StoreHeader(**meta)
+
+
+def read_header(path: Path) -> Optional[StoreHeader]:
+    """Parse only the header of a store file. Returns None if missing or malformed."""
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                return None
+            (header_len,) = struct.unpack("<I", f.read(4))
+            meta = json.loads(f.read(header_len).decode())
+        return StoreHeader(**meta)
+    except (OSError, ValueError, TypeError, struct.error):
+        return None
+
+
+def open_store(path: Path) -> Optional[tuple[StoreHeader, np.ndarray, list[bytes]]]:
+    """
+    Memory-map the embedding matrix read-only and read its row keys.
+    float32 stores are returned as a zero-copy np.memmap; float16 stores are
+    upcast to a private float32 array (half the disk, same RAM as float32).
+    """
+    header = read_header(path)
+    if header is None or header.dtype not in _DTYPES:
+        return None
+    dtype = np.dtype(_DTYPES[header.dtype]).newbyteorder("<")
+    expected = header.hashes_offset + header.count * ROW_KEY_SIZE
+    if path.stat().st_size < expected:
+        logger.warning("Embedding store {} is truncated ({} < {} bytes)", path.name, path.stat().st_size, expected)
+        return None
+    if header.count == 0:
+        return header, np.zeros((0, header.dim), dtype=np.float32), []
+    with open(path, "rb") as f:
+        f.seek(header.hashes_offset)
+        raw_keys = f.read(header.count * ROW_KEY_SIZE)
+    row_keys = [raw_keys[i : i + ROW_KEY_SIZE] for i in range(0, len(raw_keys), ROW_KEY_SIZE)]
+    matrix = np.memmap(path, dtype=dtype, mode="r", offset=header.data_offset, shape=(header.count, header.dim))
+    if header.dtype != "float32":
+        matrix = np.asarray(matrix, dtype=np.float32)
+    return header, matrix, row_keys
@@ -0,0 +1,351 @@
+"""
+Pluggable in-memory vector indexes over unit-normalized embeddings.
+
+  - ExactIndex: brute-force dot product over every row (default; exact top-k)
+  - IVFIndex:   inverted-file index — spherical k-means centroids partition the
+                rows into `nlist` lists; a query scans only the `nprobe` lists whose
+                centroids are closest. Recall/latency trade-off is tuned with nprobe.
+
+Either index can keep a quantized copy of the rows (QuantizedMatrix — per-row
+scaled int8) for the first-pass scan, then re-rank the best k × rerank_factor
+candidates against the full-precision rows. This is a memory option, not a speed
+one: numpy has no int8 dot kernel, so codes are widened to float32 in cache-sized
+blocks and the scan costs about the same as the float32 BLAS scan. The float32
+matrix is the read-only memmap from app/rag/store.py, so only the candidate rows
+are paged in and the resident per-worker copy is the 1 byte/dim codes. (float16
+codes are not offered: numpy decodes float16 without SIMD, which made the scan
+~5× slower than float32.)
+
+Built indexes can be saved as plain .npy arrays and re-opened with mmap
+(`VectorIndex.save` / `load_vector_index`), so several worker processes share one
+copy of the codes and IVF lists instead of each building its own.
+
+All indexes return (row ids, cosine scores), best first. A search may be
+restricted by a bool row mask (app/rag/facet_index.py); masked-out rows are
+dropped before top-k selection rather than filtered out of the top-k afterwards.
+"""
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+_ASSIGN_BLOCK = 8192  # rows per block when assigning to centroids (bounds temp memory)
+_SCAN_BLOCK = 256  # rows per block when scoring codes — the widened block stays in L2 cache
+QUANTIZATION_MODES = ("none", "int8")
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, sorted descending.
+    argpartition selects the top-k in O(N); only those k are then sorted.
+    """
+    n = scores.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(scores, n - k)[n - k:]
+    else:
+        candidates = np.arange(n)
+    return candidates[np.argsort(scores[candidates])[::-1]]
+
+
+class QuantizedMatrix:
+    """
+    Compact copy of a unit-vector matrix for approximate first-pass scoring:
+    codes = round(row / scale × 127), one float32 scale per row (4× smaller).
+    Codes are widened to float32 one small block at a time, so scoring never
+    materializes a full-precision copy of the matrix.
+    """
+
+    def __init__(self, matrix: np.ndarray, mode: str = "int8") -> None:
+        if mode != "int8":
+            raise ValueError(f"Unsupported quantization '{mode}' — use 'int8'")
+        self.mode = mode
+        n = matrix.shape[0]
+        self._codes = np.empty(matrix.shape, dtype=np.int8)
+        self._scales = np.ones(n, dtype=np.float32)
+        for start in range(0, n, _ASSIGN_BLOCK):
+            block = np.asarray(matrix[start : start + _ASSIGN_BLOCK], dtype=np.float32)
+            end = start + len(block)
+            scale = np.abs(block).max(axis=1) / 127.0
+            scale[scale == 0] = 1.0
+            self._codes[start:end] = np.round(block / scale[:, None]).astype(np.int8)
+            self._scales[start:end] = scale
+
+    @classmethod
+    def from_arrays(cls, mode: str, codes: np.ndarray, scales: np.ndarray) -> "QuantizedMatrix":
+        """Wrap previously computed codes (e.g. memory-mapped from `VectorIndex.save`)."""
+        quantized = cls.__new__(cls)
+        quantized.mode = mode
+        quantized._codes = codes
+        quantized._scales = scales
+        return quantized
+
+    @property
+    def nbytes(self) -> int:
+        return self._codes.nbytes + self._scales.nbytes
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {"codes": self._codes, "scales": self._scales}
+
+    def scores(self, query: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """Approximate dot products of `query` with all rows (or the given row ids)."""
+        codes = self._codes if rows is None else self._codes[rows]
+        scales = self._scales if rows is None else self._scales[rows]
+        out = np.empty(codes.shape[0], dtype=np.float32)
+        for start in range(0, codes.shape[0], _SCAN_BLOCK):
+            block = codes[start : start + _SCAN_BLOCK]
+            out[start : start + len(block)] = block.astype(np.float32) @ query
+        out *= scales
+        return out
+
+
+class VectorIndex(ABC):
+    """Top-k cosine search over a fixed (N, dim) matrix of unit vectors."""
+
+    kind: str = ""
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        quantization: str = "none",
+        rerank_factor: int = 4,
+        quantized: Optional[QuantizedMatrix] = None,
+    ) -> None:
+        self._matrix = matrix
+        if quantized is None and quantization != "none":
+            quantized = QuantizedMatrix(matrix, quantization)
+        self._quantized = quantized
+        self._rerank_factor = max(1, rerank_factor)
+
+    @property
+    def size(self) -> int:
+        return self._matrix.shape[0]
+
+    @abstractmethod
+    def search(
+        self, query: np.ndarray, k: int, mask: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return (row ids, scores) of the k best rows for a unit-normalized query,
+        considering only rows where `mask` is True (all rows if None).
+        """
+        ...
+
+    def save(self, directory: Path) -> None:
+        """Write the index's derived arrays as .npy files plus an index.json manifest."""
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = self._arrays()
+        for name, array in arrays.items():
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(array))
+        manifest = {
+            "kind": self.kind,
+            "quantization": self._quantized.mode if self._quantized is not None else "none",
+            "arrays": sorted(arrays),
+        }
+        (directory / "index.json").write_text(json.dumps(manifest))
+
+    def _arrays(self) -> dict[str, np.ndarray]:
+        return self._quantized.arrays() if self._quantized is not None else {}
+
+    def stats(self) -> dict:
+        stats = {"kind": self.kind, "size": self.size}
+        if self._quantized is not None:
+            stats["quantization"] = self._quantized.mode
+            stats["quantized_mb"] = round(self._quantized.nbytes / 2**20, 2)
+            stats["rerank_factor"] = self._rerank_factor
+        return stats
+
+    def _score_candidates(
+        self, query: np.ndarray, k: int, candidates: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k among `candidates` (all rows if None). With quantization, the codes
+        shortlist k × rerank_factor rows which are then re-scored at full precision.
+        """
+        if self._quantized is not None:
+            approx = self._quantized.scores(query, candidates)
+            shortlist = top_k(approx, k * self._rerank_factor)
+            candidates = shortlist if candidates is None else candidates[shortlist]
+        if candidates is None:
+            scores = self._matrix @ query
+            rows = top_k(scores, k)
+            return rows, scores[rows]
+        scores = self._matrix[candidates] @ query
+        best = top_k(scores, k)
+        return candidates[best], scores[best]
+
+
+class ExactIndex(VectorIndex):
+    """Brute-force scan: one matrix-vector product + argpartition."""
+
+    kind = "exact"
+
+    def search(
+        self, query: np.ndarray, k: int, mask: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if mask is None:
+            return self._score_candidates(query, k)
+        return self._score_candidates(query, k, np.flatnonzero(mask))
+
+
+class IVFIndex(VectorIndex):
+    """Inverted-file ANN index with spherical k-means coarse quantizer."""
+
+    kind = "ivf"
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        nlist: int = 0,
+        nprobe: int = 8,
+        train_iters: int = 15,
+        seed: int = 0,
+        quantization: str = "none",
+        rerank_factor: int = 4,
+        quantized: Optional[QuantizedMatrix] = None,
+        lists: Optional[tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    ) -> None:
+        """`lists` = (centroids, order, offsets) from a saved index skips training."""
+        super().__init__(
+            matrix, quantization=quantization, rerank_factor=rerank_factor, quantized=quantized
+        )
+        self.nprobe = nprobe
+        if lists is not None:
+            self._centroids, self._order, self._offsets = lists
+            self._nlist = self._centroids.shape[0]
+            return
+
+        n = matrix.shape[0]
+        self._nlist = max(1, min(nlist or int(np.sqrt(n)), n))
+        self._centroids = self._train(matrix, self._nlist, train_iters, seed)
+
+        assign = self._assign(matrix, self._centroids)
+        # Rows grouped by list: list c owns self._order[self._offsets[c]:self._offsets[c + 1]]
+        self._order = np.argsort(assign, kind="stable")
+        self._offsets = np.concatenate(([0], np.cumsum(np.bincount(assign, minlength=self._nlist))))
+
+    def search(
+        self, query: np.ndarray, k: int, mask: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        nprobe = min(self.nprobe, self._nlist)
+        lists = top_k(self._centroids @ query, nprobe)
+        candidates = np.concatenate(
+            [self._order[self._offsets[c] : self._offsets[c + 1]] for c in lists]
+        )
+        if mask is not None:
+            allowed = np.flatnonzero(mask)
+            # A selective filter leaves fewer rows than the probed lists hold: scanning
+            # them all is cheaper and exact, and cannot come back short of k.
+            candidates = allowed if allowed.size <= candidates.size else candidates[mask[candidates]]
+        if not candidates.size:
+            return candidates, np.empty(0, dtype=np.float32)
+        return self._score_candidates(query, k, candidates)
+
+    def _arrays(self) -> dict[str, np.ndarray]:
+        return {
+            **super()._arrays(),
+            "centroids": self._centroids,
+            "order": self._order,
+            "offsets": self._offsets,
+        }
+
+    def stats(self) -> dict:
+        sizes = np.diff(self._offsets)
+        return {
+            **super().stats(),
+            "nlist": self._nlist,
+            "nprobe": self.nprobe,
+            "max_list_size": int(sizes.max()) if sizes.size else 0,
+        }
+
+    @staticmethod
+    def _train(matrix: np.ndarray, nlist: int, iters: int, seed: int) -> np.ndarray:
+        """Spherical k-means on a sample of at most 256 × nlist rows."""
+        rng = np.random.default_rng(seed)
+        n = matrix.shape[0]
+        sample_size = min(n, 256 * nlist)
+        sample = np.asarray(matrix[np.sort(rng.choice(n, sample_size, replace=False))], dtype=np.float32)
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(iters):
+            assign = IVFIndex._assign(sample, centroids)
+            counts = np.bincount(assign, minlength=nlist)
+            nonempty = counts > 0
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[nonempty]
+            sums = np.zeros_like(centroids)
+            sums[nonempty] = np.add.reduceat(sample[np.argsort(assign, kind="stable")], starts, axis=0)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            # Re-seed empty clusters with random sample rows
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            norms[empty] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+        return centroids
+
+    @staticmethod
+    def _assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        assign = np.empty(matrix.shape[0], dtype=np.int64)
+        for start in range(0, matrix.shape[0], _ASSIGN_BLOCK):
+            block = matrix[start : start + _ASSIGN_BLOCK]
+            assign[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return assign
+
+
+def build_vector_index(
+    matrix: np.ndarray,
+    kind: str = "exact",
+    nlist: int = 0,
+    nprobe: int = 8,
+    quantization: str = "none",
+    rerank_factor: int = 4,
+) -> VectorIndex:
+    """Build the configured index kind ("exact" | "ivf") over `matrix`."""
+    if quantization not in QUANTIZATION_MODES:
+        logger.warning("RAG: unsupported quantization '{}', scanning float32", quantization)
+        quantization = "none"
+    if kind == "ivf" and matrix.shape[0] > 0:
+        return IVFIndex(
+            matrix, nlist=nlist, nprobe=nprobe,
+            quantization=quantization, rerank_factor=rerank_factor,
+        )
+    if kind not in ("exact", "ivf"):
+        logger.warning("RAG: unknown vector index '{}', using exact scan", kind)
+    return ExactIndex(matrix, quantization=quantization, rerank_factor=rerank_factor)
+
+
+def load_vector_index(
+    directory: Path,
+    matrix: np.ndarray,
+    nprobe: int = 8,
+    rerank_factor: int = 4,
+) -> Optional[VectorIndex]:
+    """
+    Re-open an index written by `VectorIndex.save` over the same `matrix`, with every
+    array memory-mapped read-only. Returns None if the directory is missing or incomplete.
+    """
+    try:
+        manifest = json.loads((directory / "index.json").read_text())
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in manifest["arrays"]
+        }
+    except (OSError, ValueError, KeyError) as e:
+        logger.debug("No usable saved index in {}: {}", directory, e)
+        return None
+
+    if manifest["quantization"] not in QUANTIZATION_MODES:
+        logger.debug("Saved index in {} uses retired quantization {}", directory, manifest["quantization"])
+        return None
+    quantized = None
+    if manifest["quantization"] != "none":
+        quantized = QuantizedMatrix.from_arrays(manifest["quantization"], arrays["codes"], arrays["scales"])
+    if manifest["kind"] == "ivf":
+        return IVFIndex(
+            matrix, nprobe=nprobe, rerank_factor=rerank_factor, quantized=quantized,
+            lists=(arrays["centroids"], arrays["order"], arrays["offsets"]),
+        )
+    return ExactIndex(matrix, rerank_factor=rerank_factor, quantized=quantized)
@@ -0,0 +1,383 @@
+"""
+Vector search over the SQL `recipes` table (user-saved and seeded recipes).
+
+Recipe embeddings are written by RecipeIndexer into `Recipe.embedding` (float32
+blob) and loaded here into the same in-memory machinery the community corpus
+uses (app/services/rag.py):
+  - a VectorIndex (exact / IVF, optional quantization) over the stored vectors
+  - a KeywordIndex for BM25 and a FacetIndex for pre-filter masks
+  - a precomputed nearest-neighbour table for find_similar_recipes
+  - an ingredient inverted index for pantry-coverage search
+
+The loaded snapshot is immutable and swapped atomically. Only the first search
+waits for a load; afterwards refreshes run in a background task (own DB session)
+while searches keep using the current snapshot:
+  - after `invalidate()` (called by the indexer after it commits new embeddings)
+    the table is reloaded and the indexes rebuilt
+  - every `vectorstore_refresh_seconds` a cheap fingerprint query (row count, max
+    id, latest created/updated time of the embedded rows) runs first, and the
+    rebuild — including the O(N²) exact neighbour table — happens only if it
+    changed, so writes in other workers become searchable without a restart
+Searches return (Recipe, score) tuples; the Recipe rows are fetched by id in the
+caller's session.
+"""
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.recipe import Ingredient, Recipe, RecipeIngredient, RecipeNutrition
+from app.rag.embeddings import embedding_service
+from app.rag.facet_index import FacetIndex
+from app.rag.ingredient_index import IngredientIndex
+from app.rag.keyword_index import KeywordIndex
+from app.rag.neighbors import NeighborTable, build_neighbor_table
+from app.rag.query_cache import query_embedding_cache
+from app.rag.vector_index import VectorIndex, build_vector_index
+
+_RRF_K = 60  # reciprocal-rank fusion damping constant
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """Everything one search needs, built together from one read of the table."""
+
+    ids: list[int] = field(default_factory=list)
+    recipes: list[dict] = field(default_factory=list)
+    keyword_index: KeywordIndex = field(default_factory=lambda: KeywordIndex([]))
+    facets: FacetIndex = field(default_factory=lambda: FacetIndex([]))
+    ingredients: IngredientIndex = field(default_factory=lambda: IngredientIndex([]))
+    id_to_row: dict[int, int] = field(default_factory=dict)
+    vector_index: Optional[VectorIndex] = None
+    neighbors: Optional[NeighborTable] = None
+    fingerprint: tuple = ()
+    loaded_at: float = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.vector_index is not None
+
+
+class RecipeVectorStore:
+    """Semantic, BM25 and hybrid search over embedded public recipes in the database."""
+
+    def __init__(self, refresh_seconds: float = 300) -> None:
+        self._refresh_seconds = refresh_seconds
+        self._snapshot = _Snapshot()
+        self._dirty = True
+        self._checked_at = 0.0  # monotonic time of the last load or unchanged fingerprint
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def invalidate(self) -> None:
+        """Mark the snapshot stale; the next search starts a background reload."""
+        self._dirty = True
+
+    async def search_by_text(
+        self,
+        query_text: str,
+        session: AsyncSession,
+        limit: int = 10,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> list[tuple[Recipe, float]]:
+        """Top `limit` recipes by cosine similarity to the query embedding."""
+        snap = await self._current()
+        mask = snap.facets.mask(**(filters or {}))
+        ranked = await self._vector_search(snap, query_text, limit, mask)
+        return await self._fetch(session, snap, ranked)
+
+    async def hybrid_search(
+        self,
+        query_text: str,
+        session: AsyncSession,
+        limit: int = 10,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> list[tuple[Recipe, float]]:
+        """
+        Reciprocal-rank fusion of the vector and BM25 rankings (same scoring as the
+        community search). Degrades to BM25 order if query embedding fails.
+        """
+        snap = await self._current()
+        mask = snap.facets.mask(**(filters or {}))
+        depth = max(limit * 4, 20)
+        fused: dict[int, float] = {}
+        for rank, (row, _) in enumerate(snap.keyword_index.bm25(query_text, depth, mask), start=1):
+            fused[row] = 1.0 / (_RRF_K + rank)
+        for rank, (row, _) in enumerate(await self._vector_search(snap, query_text, depth, mask), start=1):
+            fused[row] = fused.get(row, 0.0) + 1.0 / (_RRF_K + rank)
+
+        ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return await self._fetch(session, snap, ranked)
+
+    async def search_by_ingredients(
+        self,
+        ingredients: list[str],
+        session: AsyncSession,
+        limit: int = 10,
+    ) -> list[tuple[Recipe, float]]:
+        """
+        Recipes ranked by pantry coverage from the ingredient index (synonym- and
+        diacritic-folded); the score is the covered share of required ingredients.
+        """
+        snap = await self._current()
+        ranked = [(m.row, m.coverage) for m in snap.ingredients.rank(ingredients, limit)]
+        return await self._fetch(session, snap, ranked)
+
+    async def known_tags(self, tags: list[str]) -> list[str]:
+        """The given tags that are indexed recipe tags (an unknown tag filters out every row)."""
+        snap = await self._current()
+        return [tag for tag in tags if snap.facets.has("tag", tag)]
+
+    def recipe_ingredients(self, recipe_id: int) -> list[str]:
+        """Ingredient names of a loaded recipe ([] if it is not in the snapshot)."""
+        snap = self._snapshot
+        row = snap.id_to_row.get(recipe_id)
+        return list(snap.recipes[row]["ingredients"]) if row is not None else []
+
+    async def find_similar_recipes(
+        self,
+        recipe_id: int,
+        session: AsyncSession,
+        limit: int = 5,
+    ) -> list[tuple[Recipe, float]]:
+        """
+        Nearest neighbours of a recipe's stored embedding, excluding itself — a lookup
+        in the neighbour table built with the snapshot (at most rag_similar_k).
+        """
+        snap = await self._current()
+        row = snap.id_to_row.get(recipe_id)
+        if row is None or snap.neighbors is None:
+            return []
+        return await self._fetch(session, snap, snap.neighbors.get(row, limit))
+
+    def stats(self) -> dict:
+        snap = self._snapshot
+        return {
+            "recipes": len(snap.ids),
+            "semantic_ready": snap.ready,
+            "embed_model": embedding_service.model,
+            "age_seconds": round(time.monotonic() - snap.loaded_at, 1) if snap.loaded_at else None,
+            "index": snap.vector_index.stats() if snap.ready else None,
+        }
+
+    # ── Loading ───────────────────────────────────────────────────────────────
+
+    async def _current(self) -> _Snapshot:
+        """
+        The live snapshot. The first call waits for the initial load; later calls
+        only start a background refresh when the snapshot may be stale.
+        """
+        if not self._snapshot.loaded_at:
+            await asyncio.shield(self._start_refresh())
+        elif self._stale():
+            self._start_refresh()
+        return self._snapshot
+
+    def _stale(self) -> bool:
+        return self._dirty or time.monotonic() - self._checked_at > self._refresh_seconds
+
+    def _start_refresh(self) -> asyncio.Task:
+        """The running refresh task, or a new one."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+        return self._refresh_task
+
+    async def _refresh(self) -> None:
+        """Reload if invalidated or the table's fingerprint changed; never raises."""
+        # Cleared before reading: an invalidate() during the load marks it dirty again
+        dirty, self._dirty = self._dirty, False
+        try:
+            async with async_session_maker() as session:
+                if not dirty and self._snapshot.loaded_at:
+                    if await self._fingerprint(session) == self._snapshot.fingerprint:
+                        self._checked_at = time.monotonic()
+                        return
+                self._snapshot = await self._load(session)
+                self._checked_at = time.monotonic()
+        except Exception as e:
+            self._dirty = True
+            logger.error("Vector store: reload failed, serving previous snapshot: {}", e)
+
+    @staticmethod
+    def _embedded_filter() -> tuple:
+        """Rows the store serves: public recipes embedded with the current model."""
+        return (
+            Recipe.is_public == True,  # noqa: E712
+            Recipe.embedding.is_not(None),
+            Recipe.embedding_model == embedding_service.model,
+        )
+
+    async def _fingerprint(self, session: AsyncSession) -> tuple:
+        """Cheap change check: (count, max id, latest created_at, latest updated_at) of served rows."""
+        row = (await session.execute(
+            select(
+                func.count(Recipe.id),
+                func.max(Recipe.id),
+                func.max(Recipe.created_at),
+                func.max(Recipe.updated_at),
+            ).where(*self._embedded_filter())
+        )).one()
+        return tuple(row)
+
+    async def _load(self, session: AsyncSession) -> _Snapshot:
+        """Read embedded public recipes (current embedding model only) and build the indexes."""
+        started = time.perf_counter()
+        fingerprint = await self._fingerprint(session)
+        embedded = self._embedded_filter()
+        statement = (
+            select(Recipe, RecipeNutrition)
+            .outerjoin(RecipeNutrition, RecipeNutrition.recipe_id == Recipe.id)
+            .where(*embedded)
+            .order_by(Recipe.id)
+        )
+        rows = (await session.execute(statement)).all()
+
+        ingredient_names: dict[int, list[str]] = {}
+        if rows:
+            ing_rows = await session.execute(
+                select(RecipeIngredient.recipe_id, Ingredient.name, Ingredient.name_vi)
+                .join(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+                .join(Recipe, Recipe.id == RecipeIngredient.recipe_id)
+                .where(*embedded)
+            )
+            for recipe_id, name, name_vi in ing_rows.all():
+                ingredient_names.setdefault(recipe_id, []).append(name_vi or name)
+
+        ids: list[int] = []
+        recipes: list[dict] = []
+        vectors: list[np.ndarray] = []
+        for recipe, nutrition in rows:
+            vector = recipe.embedding
+            if vector is None or len(vector) != embedding_service.dim:
+                continue
+            ids.append(recipe.id)
+            recipes.append(self._recipe_to_dict(recipe, nutrition, ingredient_names.get(recipe.id, [])))
+            vectors.append(vector)
+
+        matrix = vector_index = neighbors = None
+        if vectors:
+            matrix = self._normalize(np.vstack(vectors))
+            vector_index, neighbors = await asyncio.to_thread(self._build_indexes, matrix)
+
+        snapshot = _Snapshot(
+            ids=ids,
+            recipes=recipes,
+            keyword_index=KeywordIndex(recipes),
+            facets=FacetIndex(recipes),
+            ingredients=IngredientIndex(recipes),
+            id_to_row={recipe_id: row for row, recipe_id in enumerate(ids)},
+            vector_index=vector_index,
+            neighbors=neighbors,
+            fingerprint=fingerprint,
+            loaded_at=time.monotonic(),
+        )
+        logger.info(
+            "Vector store: loaded {} embedded recipes in {:.0f} ms",
+            len(ids), (time.perf_counter() - started) * 1000,
+        )
+        return snapshot
+
+    @staticmethod
+    def _build_indexes(matrix: np.ndarray) -> tuple[VectorIndex, NeighborTable]:
+        """Configured vector index plus the similar-recipes table (CPU-bound; run in a thread)."""
+        vector_index = build_vector_index(
+            matrix,
+            kind=settings.rag_vector_index,
+            nlist=settings.rag_ivf_nlist,
+            nprobe=settings.rag_ivf_nprobe,
+            # Rows come from the database, not a mapped file: codes would sit beside the
+            # float32 matrix instead of replacing it, so the quantized scan is not used here
+            quantization="none",
+            rerank_factor=settings.rag_rerank_factor,
+        )
+        return vector_index, build_neighbor_table(matrix, settings.rag_similar_k, vector_index)
+
+    @staticmethod
+    def _recipe_to_dict(
+        recipe: Recipe, nutrition: Optional[RecipeNutrition], ingredients: list[str]
+    ) -> dict:
+        """Recipe row → the dict shape KeywordIndex / FacetIndex expect."""
+        return {
+            "id": recipe.id,
+            "title": recipe.title,
+            "description": recipe.description or "",
+            "cuisine": recipe.cuisine or "",
+            "difficulty": recipe.difficulty or "",
+            "category": recipe.category or "",
+            "prep_time": recipe.prep_time,
+            "cook_time": recipe.cook_time,
+            "tags": parse_tags(recipe.tags),
+            "ingredients": ingredients,
+            "nutrition": {
+                "calories": nutrition.calories,
+                "protein": nutrition.protein,
+                "carbs": nutrition.carbs,
+                "fat": nutrition.fat,
+            } if nutrition else {},
+        }
+
+    # ── Search helpers ────────────────────────────────────────────────────────
+
+    async def _vector_search(
+        self, snap: _Snapshot, query: str, k: int, mask: Optional[np.ndarray]
+    ) -> list[tuple[int, float]]:
+        """Top-k (row, cosine score) among rows allowed by `mask`; [] if unavailable."""
+        if not snap.ready or not query.strip():
+            return []
+        if mask is not None and not mask.any():
+            return []
+        try:
+            query_emb = self._normalize(await query_embedding_cache.get(query))
+        except Exception as e:
+            logger.warning("Vector store: query embedding failed: {}", e)
+            return []
+        rows, scores = snap.vector_index.search(query_emb, k, mask)
+        return [(int(row), float(score)) for row, score in zip(rows, scores)]
+
+    @staticmethod
+    async def _fetch(
+        session: AsyncSession, snap: _Snapshot, ranked: list[tuple[int, float]]
+    ) -> list[tuple[Recipe, float]]:
+        """Load the ranked rows as Recipe objects, in ranking order (rows deleted since the load are dropped)."""
+        if not ranked:
+            return []
+        ids = [snap.ids[row] for row, _ in ranked]
+        result = await session.execute(select(Recipe).where(Recipe.id.in_(ids)))
+        by_id = {recipe.id: recipe for recipe in result.scalars().all()}
+        return [
+            (by_id[snap.ids[row]], round(score, 4))
+            for row, score in ranked
+            if snap.ids[row] in by_id
+        ]
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize a vector or each row of a matrix. Zero rows stay zero."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32, copy=False)
+
+
+def parse_tags(tags: Optional[str]) -> list[str]:
+    """`Recipe.tags` is stored as a JSON list or a comma-separated string."""
+    if not tags:
+        return []
+    try:
+        parsed = json.loads(tags)
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, list):
+        return [str(t).strip() for t in parsed if str(t).strip()]
+    return [t.strip() for t in tags.split(",") if t.strip()]
+
+
+vector_search = RecipeVectorStore(refresh_seconds=settings.vectorstore_refresh_seconds)
@@ -1,15 +1,18 @@
 """Chat router — cooking & nutrition assistant powered by Gemini."""
+import asyncio
+import json
 import time
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from app.core.database import get_session
+from app.core.database import async_session_maker, get_session
 from app.core.security import get_current_user_id
 from app.models.chat import ChatMessage, ChatSession
 from app.services.llm import llm_provider
@@ -35,19 +38,10 @@ class ChatHistoryResponse(BaseModel):
     created_at: datetime
 
 
-@router.post("/query", response_model=ChatMessageResponse)
-async def send_message(
-    request: ChatQueryRequest,
-    user_id: str = Depends(get_current_user_id),
-    session: AsyncSession = Depends(get_session),
-) -> ChatMessageResponse:
-    """Send a message to ChefGPT AI assistant."""
-    t0 = time.perf_counter()
-    logger.info(
-        "router:chat | session_id={} message_len={}",
-        request.session_id, len(request.message),
-    )
-
+async def _prepare_chat(
+    request: ChatQueryRequest, user_id: str, session: AsyncSession
+) -> tuple[ChatSession, list[dict]]:
+    """Get or create the chat session, load recent history and save the user message."""
     # Get or create chat session
     if request.session_id:
         result = await session.execute(
@@ -81,6 +75,37 @@ async def send_message(
     user_msg = ChatMessage(session_id=chat_session.id, role="user", content=request.message)
     session.add(user_msg)
     await session.commit()
+    return chat_session, history
+
+
+async def _save_reply(chat_session_id: int, content: str) -> ChatMessage:
+    """Save an assistant reply with its own session — a stream outlives the request's session."""
+    async with async_session_maker() as save_session:
+        assistant_msg = ChatMessage(session_id=chat_session_id, role="model", content=content)
+        save_session.add(assistant_msg)
+        await save_session.commit()
+        await save_session.refresh(assistant_msg)
+    return assistant_msg
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/query", response_model=ChatMessageResponse)
+async def send_message(
+    request: ChatQueryRequest,
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_session),
+) -> ChatMessageResponse:
+    """Send a message to ChefGPT AI assistant."""
+    t0 = time.perf_counter()
+    logger.info(
+        "router:chat | session_id={} message_len={}",
+        request.session_id, len(request.message),
+    )
+
+    chat_session, history = await _prepare_chat(request, user_id, session)
 
     # Call LLM
     t_llm = time.perf_counter()
@@ -105,7 +130,7 @@ async def send_message(
     total_ms = round((time.perf_counter() - t0) * 1000, 1)
     logger.info(
         "router:chat | ok session_id={} reply_len={} history_turns={} total_latency={}ms",
-        chat_session.id, len(reply), len(recent), total_ms,
+        chat_session.id, len(reply), len(history), total_ms,
     )
 
     return ChatMessageResponse(
@@ -116,6 +141,77 @@ async def send_message(
     )
 
 
+@router.post("/query/stream")
+async def send_message_stream(
+    request: ChatQueryRequest,
+    user_id: str = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_session),
+) -> StreamingResponse:
+    """
+    Send a message to ChefGPT and stream the reply as server-sent events:
+    `start` {session_id}, then `token` {text} per chunk as the model generates it,
+    then `done` with the saved message (same shape as /chat/query) or `error` {detail}.
+    """
+    t0 = time.perf_counter()
+    logger.info(
+        "router:chat_stream | session_id={} message_len={}",
+        request.session_id, len(request.message),
+    )
+    chat_session, history = await _prepare_chat(request, user_id, session)
+    chat_session_id = chat_session.id
+
+    async def events() -> AsyncIterator[str]:
+        yield _sse("start", {"session_id": chat_session_id})
+        parts: list[str] = []
+        ttft_ms = None
+        assistant_msg: Optional[ChatMessage] = None
+        try:
+            try:
+                async for text in llm_provider.chat_stream(request.message, history):
+                    if ttft_ms is None:
+                        ttft_ms = round((time.perf_counter() - t0) * 1000, 1)
+                    parts.append(text)
+                    yield _sse("token", {"text": text})
+            except Exception as e:
+                logger.error(
+                    "router:chat_stream | llm_error={} chunks={} latency={}ms",
+                    str(e)[:200], len(parts), round((time.perf_counter() - t0) * 1000, 1),
+                )
+                yield _sse("error", {"detail": f"AI service error: {str(e)}"})
+                return
+
+            reply = "".join(parts)
+            assistant_msg = await _save_reply(chat_session_id, reply)
+            logger.info(
+                "router:chat_stream | ok session_id={} reply_len={} chunks={} history_turns={} ttft={}ms total_latency={}ms",
+                chat_session_id, len(reply), len(parts), len(history), ttft_ms,
+                round((time.perf_counter() - t0) * 1000, 1),
+            )
+            yield _sse("done", ChatMessageResponse(
+                id=str(assistant_msg.id),
+                message=assistant_msg.content,
+                role="assistant",
+                timestamp=assistant_msg.created_at,
+            ).model_dump(mode="json"))
+        finally:
+            if assistant_msg is None and parts:
+                # Client disconnected (or the provider failed) mid-stream: keep what was
+                # generated so the history never has a user turn without a reply.
+                # Shielded — the disconnect cancels this generator's task.
+                await asyncio.shield(asyncio.ensure_future(_save_reply(chat_session_id, "".join(parts))))
+                logger.info(
+                    "router:chat_stream | partial reply saved session_id={} chunks={} latency={}ms",
+                    chat_session_id, len(parts), round((time.perf_counter() - t0) * 1000, 1),
+                )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # no-transform / X-Accel-Buffering: keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/history", response_model=List[ChatHistoryResponse])
 async def get_chat_history(
     user_id: str = Depends(get_current_user_id),
@@ -2,20 +2,29 @@
 import time
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from loguru import logger
 from pydantic import BaseModel
+from sqlalchemy import and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.core.database import get_session
 from app.core.security import get_current_user_id
 from app.models.recipe import Recipe
+from app.rag.semantic_cache import semantic_cache
+from app.rag.vectorstore import vector_search
 from app.schemas.recipe import RecipeCreate, RecipeListResponse, RecipeResponse
 from app.services.llm import llm_provider
+from app.services.rag import rag_service
+from app.services.recipe import recipe_indexer
+from app.utils.text import query_terms
 
 router = APIRouter(prefix="/recipes", tags=["Recipes"])
 
+_COMMUNITY_MATCHES = 5  # community recipes returned alongside AI suggestions
+_COMMUNITY_MIN_COVERAGE = 0.5
+
 
 # ── AI: suggest from ingredients ─────────────────────────────────────────────
 
@@ -29,7 +38,11 @@ async def suggest_recipes(
     request: RecipeSuggestRequest,
     user_id: str = Depends(get_current_user_id),
 ):
-    """Suggest dishes from given ingredients using Gemini 2.5 Flash."""
+    """
+    Suggest dishes from given ingredients using Gemini 2.5 Flash.
+    `community_matches` lists community recipes the ingredients already cover
+    (ingredient index pre-pass — no LLM call), with what is still missing.
+    """
     if not request.ingredients:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -40,15 +53,27 @@ async def suggest_recipes(
         len(request.ingredients), len(request.filters or []),
     )
     t0 = time.perf_counter()
+    community_matches = [
+        {
+            "id": r["id"],
+            "title": r["title"],
+            "coverage": r["coverage"],
+            "missing_ingredients": r["missing_ingredients"],
+        }
+        for r in rag_service.search_by_ingredients(
+            request.ingredients, k=_COMMUNITY_MATCHES, min_coverage=_COMMUNITY_MIN_COVERAGE
+        )
+    ]
     try:
         result = await llm_provider.suggest_recipes(
             request.ingredients, request.filters or []
         )
         logger.info(
-            "router:suggest_recipes | ok dishes_count={} latency={}ms",
-            len(result.get("dishes", [])), round((time.perf_counter() - t0) * 1000, 1),
+            "router:suggest_recipes | ok dishes_count={} community_matches={} latency={}ms",
+            len(result.get("dishes", [])), len(community_matches),
+            round((time.perf_counter() - t0) * 1000, 1),
         )
-        return result
+        return {**result, "community_matches": community_matches}
     except Exception as e:
         logger.error(
             "router:suggest_recipes | error={} latency={}ms",
@@ -60,6 +85,15 @@ async def suggest_recipes(
         )
 
 
+@router.get("/suggest/cache-stats")
+async def suggest_cache_stats(_user_id: str = Depends(get_current_user_id)):
+    """
+    Semantic cache tier of /suggest (this worker): hit rate and the distribution of
+    best-match similarities, for tuning SEMANTIC_CACHE_THRESHOLD.
+    """
+    return semantic_cache.stats()
+
+
 # ── CRUD: saved recipes ───────────────────────────────────────────────────────
 
 @router.get("", response_model=List[RecipeListResponse])
@@ -77,8 +111,18 @@ async def list_recipes(
     )
     t0 = time.perf_counter()
     statement = select(Recipe).where(Recipe.is_public == True)
-    if search:
-        statement = statement.where(Recipe.title.ilike(f"%{search}%"))
+    if search and search.strip():
+        # Every folded query word must start a word of the title/tags ("pho bo" → "Phở Bò");
+        # rows written before search_text existed fall back to a title substring match
+        tokens = query_terms(search)[0]
+        if not tokens:
+            # Punctuation-only search ("!!!") matches nothing, not the whole catalogue
+            logger.info("db:list_recipes | rows_returned=0 reason=no_search_terms")
+            return []
+        statement = statement.where(or_(
+            and_(*(Recipe.search_text.like(f"% {token}%") for token in tokens)),
+            and_(Recipe.search_text.is_(None), Recipe.title.ilike(f"%{search}%")),
+        ))
     if cuisine:
         statement = statement.where(Recipe.cuisine == cuisine)
     statement = statement.offset(skip).limit(limit)
@@ -117,6 +161,7 @@ async def get_recipe(
 @router.post("", response_model=RecipeResponse, status_code=status.HTTP_201_CREATED)
 async def create_recipe(
     recipe_data: RecipeCreate,
+    background_tasks: BackgroundTasks,
     user_id: str = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
 ) -> RecipeResponse:
@@ -144,6 +189,8 @@ async def create_recipe(
         "db:create_recipe | ok recipe_id={} latency={}ms",
         recipe.id, round((time.perf_counter() - t0) * 1000, 1),
     )
+    # Embed after the response is sent; the vector store picks it up on its next search
+    background_tasks.add_task(recipe_indexer.index_recipes_background, [recipe.id])
     return recipe
 
 
@@ -165,6 +212,7 @@ async def delete_recipe(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
     await session.delete(recipe)
     await session.commit()
+    vector_search.invalidate()
     logger.info(
         "db:delete_recipe | ok recipe_id={} latency={}ms",
         recipe_id, round((time.perf_counter() - t0) * 1000, 1),
@@ -4,11 +4,15 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 
-from app.core.security import get_current_user_id
+from app.core.security import get_current_superuser_id, get_current_user_id
+from app.rag.embeddings import embedding_service
+from app.rag.query_cache import query_embedding_cache
 from app.services.rag import rag_service
 
 router = APIRouter(prefix="/community-recipes", tags=["Community Recipes"])
 
+_MAX_BATCH_IDS = 50
+
 
 # ── Response schemas ──────────────────────────────────────────────────────────
 
@@ -43,7 +47,25 @@ class CommunityRecipeOut(CommunityRecipeCard):
 class SearchResult(BaseModel):
     recipe: CommunityRecipeCard
     score: float
-    match_type: str  # "semantic" | "keyword"
+    match_type: str  # "semantic" | "keyword" | "hybrid"
+
+
+class SimilarRecipe(BaseModel):
+    recipe: CommunityRecipeCard
+    score: float  # cosine similarity to the source recipe
+
+
+class PantryMatch(BaseModel):
+    recipe: CommunityRecipeCard
+    coverage: float  # share of the recipe's ingredients (staples excluded) in the pantry
+    matched_ingredients: list[str]
+    missing_ingredients: list[str]
+
+
+class AutocompleteSuggestion(BaseModel):
+    text: str
+    kind: str  # "recipe" | "tag" | "ingredient"
+    recipe_id: Optional[int] = None  # set for kind == "recipe"
 
 
 class SearchResponse(BaseModel):
@@ -52,6 +74,25 @@ class SearchResponse(BaseModel):
     results: list[SearchResult]
 
 
+# ── Dependencies ──────────────────────────────────────────────────────────────
+
+def _facet_filters(
+    tag: Optional[str] = Query(None, description="Recipe tag, e.g. chay"),
+    max_prep_time: Optional[int] = Query(None, ge=0, description="Max prep time (minutes)"),
+    max_total_time: Optional[int] = Query(None, ge=0, description="Max prep + cook time (minutes)"),
+    max_calories: Optional[int] = Query(None, ge=0),
+    min_protein: Optional[int] = Query(None, ge=0),
+) -> dict:
+    """Facet-index filters shared by browse and search (applied before ranking)."""
+    return {
+        "tag": tag,
+        "max_prep_time": max_prep_time,
+        "max_total_time": max_total_time,
+        "max_calories": max_calories,
+        "min_protein": min_protein,
+    }
+
+
 # ── Endpoints ─────────────────────────────────────────────────────────────────
 
 @router.get("", response_model=list[CommunityRecipeCard])
@@ -62,6 +103,7 @@ async def list_community_recipes(
     category: Optional[str] = Query(None),
     limit: int = Query(20, ge=1, le=50),
     offset: int = Query(0, ge=0),
+    filters: dict = Depends(_facet_filters),
     _user_id: str = Depends(get_current_user_id),
 ):
     """Browse community recipes with keyword search and filters (no embedding)."""
@@ -72,6 +114,7 @@ async def list_community_recipes(
         category=category,
         limit=limit,
         offset=offset,
+        **filters,
     )
     return [_to_card(r) for r in results]
 
@@ -80,24 +123,39 @@ async def list_community_recipes(
 async def semantic_search(
     q: str = Query(..., min_length=2, description="Natural language query"),
     k: int = Query(8, ge=1, le=20),
+    mode: str = Query("semantic", enum=["semantic", "keyword", "hybrid"]),
+    cuisine: Optional[str] = Query(None),
+    difficulty: Optional[str] = Query(None, enum=["easy", "medium", "hard"]),
+    category: Optional[str] = Query(None),
+    filters: dict = Depends(_facet_filters),
     _user_id: str = Depends(get_current_user_id),
 ):
     """
-    RAG semantic search using Gemini text-embedding-004 + cosine similarity.
-    Falls back to keyword search if RAG index is not ready.
+    Community recipe search.
+      - semantic: Gemini text-embedding-004 + cosine similarity
+      - keyword:  BM25 over the precomputed term index (no embedding call)
+      - hybrid:   reciprocal-rank fusion of the semantic and BM25 rankings
+    Semantic falls back to keyword search if the RAG index is not ready.
+    Filters are applied before top-k selection, so k matching recipes are returned
+    whenever that many exist.
     """
-    if rag_service.ready:
-        raw = await rag_service.search(q, k=k)
+    filters = {**filters, "cuisine": cuisine, "difficulty": difficulty, "category": category}
+    if mode == "hybrid":
+        # "keyword" per result when the vector index could not take part
+        raw = await rag_service.hybrid_search(q, k=k, **filters)
+        match_type = "hybrid"
+    elif mode == "semantic" and rag_service.ready:
+        raw = await rag_service.search(q, k=k, **filters)
         match_type = "semantic"
     else:
-        raw = rag_service.keyword_search(query=q, limit=k)
+        raw = rag_service.bm25_search(q, k=k, **filters)
         match_type = "keyword"
 
     results = [
         SearchResult(
             recipe=_to_card(r),
             score=r.get("score", 1.0),
-            match_type=match_type,
+            match_type=r.get("match_type", match_type),
         )
         for r in raw
     ]
@@ -110,20 +168,121 @@ async def rag_stats(_user_id: str = Depends(get_current_user_id)):
     return {
         "ready": rag_service.ready,
         "recipe_count": rag_service.recipe_count,
-        "embed_model": "text-embedding-004",
+        "build": rag_service.build_progress(),
+        "embed_model": embedding_service.model,
+        "vector_index": rag_service.vector_index_stats,
+        "query_embedding_cache": query_embedding_cache.stats(),
     }
 
 
+@router.post("/admin/reload")
+async def reload_community_recipes(_admin_id: str = Depends(get_current_superuser_id)):
+    """
+    Re-read recipes.json and atomically swap in a freshly built index snapshot.
+    Searches keep hitting the previous snapshot until the new one is complete.
+    """
+    try:
+        return await rag_service.reload()
+    except (OSError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not load recipes.json: {e}",
+        )
+
+
+@router.get("/autocomplete", response_model=list[AutocompleteSuggestion])
+async def autocomplete_community_recipes(
+    prefix: str = Query(..., min_length=1, max_length=100, description="What the user has typed so far"),
+    limit: int = Query(8, ge=1, le=50),
+    _user_id: str = Depends(get_current_user_id),
+):
+    """
+    Search-as-you-type: recipe titles, tags and ingredient names whose words start
+    with `prefix` (diacritic-insensitive), most popular first. Served from a prefix
+    index built with the corpus — no embedding call, no scan.
+    """
+    return rag_service.autocomplete(prefix, limit)
+
+
+@router.get("/by-ingredients", response_model=list[PantryMatch])
+async def community_recipes_by_ingredients(
+    ingredients: str = Query(..., min_length=1, description="Comma-separated pantry, e.g. cà chua,trứng"),
+    limit: int = Query(10, ge=1, le=50),
+    min_coverage: float = Query(0.0, ge=0.0, le=1.0),
+    cuisine: Optional[str] = Query(None),
+    difficulty: Optional[str] = Query(None, enum=["easy", "medium", "hard"]),
+    category: Optional[str] = Query(None),
+    filters: dict = Depends(_facet_filters),
+    _user_id: str = Depends(get_current_user_id),
+):
+    """
+    "What can I cook?" — recipes ranked by how much of their ingredient list the
+    pantry covers, with the missing ingredients. Diacritic-insensitive, folds
+    common synonyms and English names ("ca chua", "tomato" → cà chua); no LLM call.
+    """
+    pantry = [part.strip() for part in ingredients.split(",") if part.strip()]
+    matches = rag_service.search_by_ingredients(
+        pantry, k=limit, min_coverage=min_coverage,
+        cuisine=cuisine, difficulty=difficulty, category=category, **filters,
+    )
+    return [
+        PantryMatch(
+            recipe=_to_card(r),
+            coverage=r["coverage"],
+            matched_ingredients=r["matched_ingredients"],
+            missing_ingredients=r["missing_ingredients"],
+        )
+        for r in matches
+    ]
+
+
+@router.get("/batch", response_model=list[CommunityRecipeCard])
+async def get_community_recipes_batch(
+    ids: str = Query(..., description="Comma-separated recipe ids, e.g. 1,5,12"),
+    _user_id: str = Depends(get_current_user_id),
+):
+    """Hydrate several recipe cards in one request. Order follows `ids`; unknown ids are skipped."""
+    try:
+        recipe_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers",
+        )
+    if len(recipe_ids) > _MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {_MAX_BATCH_IDS} ids per request",
+        )
+    return [_to_card(r) for r in rag_service.get_recipes(recipe_ids)]
+
+
+@router.get("/{recipe_id}/similar", response_model=list[SimilarRecipe])
+async def get_similar_community_recipes(
+    recipe_id: int,
+    limit: int = Query(5, ge=1, le=50),
+    _user_id: str = Depends(get_current_user_id),
+):
+    """
+    "More like this": nearest recipes by embedding, precomputed when the index is
+    built (at most RAG_SIMILAR_K). Empty until semantic search is ready.
+    """
+    similar = rag_service.similar_recipes(recipe_id, k=limit)
+    if similar is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found")
+    return [SimilarRecipe(recipe=_to_card(r), score=r["score"]) for r in similar]
+
+
 @router.get("/{recipe_id}", response_model=CommunityRecipeOut)
 async def get_community_recipe(
     recipe_id: int,
     _user_id: str = Depends(get_current_user_id),
 ):
     """Full detail of a single community recipe."""
-    for r in rag_service._recipes:
-        if r["id"] == recipe_id:
-            return CommunityRecipeOut(**r)
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found")
+    recipe = rag_service.get_recipe(recipe_id)
+    if recipe is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found")
+    return CommunityRecipeOut(**recipe)
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
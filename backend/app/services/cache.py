@@ -55,6 +55,25 @@ class CacheService:
         except Exception as e:
             logger.warning("Cache set_ex failed key={}: {}", key, e)
 
+    async def set_nx(self, key: str, value: str, ttl: int) -> Optional[bool]:
+        """
+        Set a string value with expiry only if `key` does not exist (used for locks).
+        True if set, False if the key was already held, None if Redis is unavailable.
+        """
+        try:
+            r = await self._client()
+            return bool(await r.set(key, value, ex=ttl, nx=True))
+        except Exception as e:
+            logger.warning("Cache set_nx failed key={}: {}", key, e)
+            return None
+
+    async def delete(self, key: str) -> None:
+        try:
+            r = await self._client()
+            await r.delete(key)
+        except Exception as e:
+            logger.warning("Cache delete failed key={}: {}", key, e)
+
     async def exists(self, key: str) -> bool:
         try:
             r = await self._client()
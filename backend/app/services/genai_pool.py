@@ -0,0 +1,104 @@
+"""
+Long-lived Gemini clients, one per API key, shared by every Gemini call site.
+
+Each `genai.Client` owns an httpx connection pool. Building one per call (the old
+GeminiLLM._get_client) paid client construction plus a fresh TCP + TLS handshake on
+every request — worst right after a key rotation. The pool keeps one client per key
+for the life of the process, with keep-alive connections held open for
+`gemini_keepalive_seconds` (httpx's default is 5 s) and HTTP/2 when the optional `h2`
+package is installed, so consecutive calls reuse a warm connection.
+
+Users: GeminiLLM (generate_content), GeminiEmbeddingBackend (embed_content, and
+therefore RAG query embeddings). Closed in the app lifespan shutdown via `aclose()`.
+"""
+import asyncio
+import importlib.util
+from typing import Optional
+
+import httpx
+from google import genai
+from google.genai import types
+from loguru import logger
+
+from app.core.config import settings
+
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+class GenaiClientPool:
+    """API key → warm genai.Client. Clients are rebuilt if used from a different event loop."""
+
+    def __init__(self, keepalive_seconds: float = 60, max_connections: int = 20) -> None:
+        self._keepalive = keepalive_seconds
+        self._max_connections = max_connections
+        self._clients: dict[str, tuple[genai.Client, Optional[asyncio.AbstractEventLoop]]] = {}
+        self._created = 0
+
+    def get(self, api_key: str) -> genai.Client:
+        """The pooled client for `api_key`, created on first use."""
+        loop = self._running_loop()
+        entry = self._clients.get(api_key)
+        if entry is not None and (entry[1] is None or entry[1] is loop or loop is None):
+            return entry[0]
+        # First use, or the async connection pool belongs to a loop that is gone
+        # (scripts / tests calling asyncio.run more than once)
+        if entry is not None:
+            self._retire(*entry)
+        client = genai.Client(api_key=api_key, http_options=self._http_options())
+        self._clients[api_key] = (client, loop)
+        self._created += 1
+        logger.debug("genai pool: client for key ...{} (http2={})", api_key[-6:], _HTTP2)
+        return client
+
+    async def aclose(self) -> None:
+        """Close every pooled client's connections. Safe to call more than once."""
+        clients, self._clients = self._clients, {}
+        for client, _ in clients.values():
+            try:
+                await client.aio.aclose()
+                client.close()
+            except Exception as e:
+                logger.warning("genai pool: error closing client: {}", e)
+        if clients:
+            logger.info("genai pool: closed {} client(s)", len(clients))
+
+    @staticmethod
+    def _retire(client: genai.Client, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """
+        Close a replaced client: its sync connections now, its async ones on the loop
+        that owns them if that loop still runs (a closed loop's sockets are already gone).
+        """
+        try:
+            client.close()
+            if loop is not None and loop.is_running() and not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(client.aio.aclose(), loop)
+        except Exception as e:
+            logger.warning("genai pool: error closing replaced client: {}", e)
+
+    def stats(self) -> dict:
+        return {"clients": len(self._clients), "created": self._created, "http2": _HTTP2}
+
+    def _http_options(self) -> types.HttpOptions:
+        limits = httpx.Limits(
+            max_connections=self._max_connections,
+            max_keepalive_connections=self._max_connections,
+            keepalive_expiry=self._keepalive,
+        )
+        async_args: dict = {"limits": limits}
+        if _HTTP2:
+            async_args["http2"] = True
+        return types.HttpOptions(client_args={"limits": limits}, async_client_args=async_args)
+
+    @staticmethod
+    def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+
+# Singleton — shared by the LLM provider and the embedding backend
+genai_pool = GenaiClientPool(
+    keepalive_seconds=settings.gemini_keepalive_seconds,
+    max_connections=settings.gemini_max_connections,
+)
@@ -2,11 +2,17 @@
 from loguru import logger
 
 from app.core.config import settings
+from app.services.cache import cache_service
 from app.services.llm.base_llm import BaseLLM
+from app.services.llm.cached_llm import CachedLLM
 
 
 def get_llm_provider() -> BaseLLM:
-    """Return the configured LLM provider singleton."""
+    """Return the configured LLM provider, wrapped in the shared caching layer."""
+    return CachedLLM(_build_provider(), cache_service)
+
+
+def _build_provider() -> BaseLLM:
     provider = settings.llm_provider.lower()
 
     if provider == "openai":
@@ -24,7 +30,6 @@ def get_llm_provider() -> BaseLLM:
         return AnthropicLLM(api_key=settings.anthropic_api_key, model=settings.anthropic_model)
 
     # Default: Gemini
-    from app.services.cache import cache_service
     from app.services.key_manager import GeminiKeyManager
     from app.services.llm.gemini_llm import GeminiLLM
 
@@ -35,7 +40,7 @@ def get_llm_provider() -> BaseLLM:
         )
     key_manager = GeminiKeyManager(api_keys=keys, cache=cache_service)
     logger.info("LLM provider: Gemini ({}, {} key(s))", settings.gemini_model, len(keys))
-    return GeminiLLM(key_manager=key_manager, cache=cache_service)
+    return GeminiLLM(key_manager=key_manager)
 
 
 # Singleton — imported by routers
@@ -1,11 +1,17 @@
 """Anthropic Claude provider (optional — set LLM_PROVIDER=anthropic)."""
 import json
 import re
+from typing import AsyncIterator
 
 from loguru import logger
 
 from app.services.llm.base_llm import BaseLLM
 
+_CHAT_SYSTEM = (
+    "Bạn là ChefGPT — trợ lý nấu ăn và dinh dưỡng AI người Việt. "
+    "Trả lời ngắn gọn, thực tế, bằng tiếng Việt."
+)
+
 
 class AnthropicLLM(BaseLLM):
     """Claude provider. Requires `anthropic` package and ANTHROPIC_API_KEY."""
@@ -86,11 +92,8 @@ JSON: {{"plan": [{{"day": 1, "meals": {{"breakfast": "...", "lunch": "...", "din
         logger.debug("anthropic generate_meal_plan done model={}", self._model)
         return self._parse_json(text)
 
-    async def chat(self, message: str, history: list[dict] | None = None) -> str:
-        system = (
-            "Bạn là ChefGPT — trợ lý nấu ăn và dinh dưỡng AI người Việt. "
-            "Trả lời ngắn gọn, thực tế, bằng tiếng Việt."
-        )
+    @staticmethod
+    def _chat_messages(message: str, history: list[dict] | None) -> list[dict]:
         messages = []
         if history:
             for msg in history:
@@ -98,11 +101,25 @@ JSON: {{"plan": [{{"day": 1, "meals": {{"breakfast": "...", "lunch": "...", "din
                 parts = msg.get("parts", [])
                 messages.append({"role": role, "content": " ".join(parts)})
         messages.append({"role": "user", "content": message})
+        return messages
 
+    async def chat(self, message: str, history: list[dict] | None = None) -> str:
         response = await self._client.messages.create(
             model=self._model,
             max_tokens=1024,
-            system=system,
-            messages=messages,
+            system=_CHAT_SYSTEM,
+            messages=self._chat_messages(message, history),
         )
         return response.content[0].text
+
+    async def chat_stream(
+        self, message: str, history: list[dict] | None = None
+    ) -> AsyncIterator[str]:
+        async with self._client.messages.stream(
+            model=self._model,
+            max_tokens=1024,
+            system=_CHAT_SYSTEM,
+            messages=self._chat_messages(message, history),
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
@@ -1,5 +1,6 @@
 """Abstract LLM interface — all providers must implement these 4 methods."""
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 
 class BaseLLM(ABC):
@@ -28,3 +29,13 @@ class BaseLLM(ABC):
     async def chat(self, message: str, history: list[dict] | None = None) -> str:
         """Respond to a cooking/nutrition query. Returns plain text."""
         ...
+
+    async def chat_stream(
+        self, message: str, history: list[dict] | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Respond like `chat`, yielding text chunks as the provider generates them.
+        Default: one chunk holding the full `chat` reply — providers with a
+        streaming API override this to forward tokens as they arrive.
+        """
+        yield await self.chat(message, history)
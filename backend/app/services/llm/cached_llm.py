@@ -0,0 +1,111 @@
+"""
+Provider-agnostic caching around any BaseLLM — built in get_llm_provider.
+
+suggest_recipes and generate_meal_plan are answered in this order, whichever
+LLM_PROVIDER is configured:
+  1. exact Redis key (CacheService.make_key — unchanged, so entries written before a
+     provider switch still hit), TTL cache_ttl_recipes / cache_ttl_meal_plans
+  2. suggest_recipes only: the semantic cache tier (app/rag/semantic_cache.py), when
+     enabled and the embedding backend is configured; new answers are added to it
+     by a background task, off the response path
+  3. the wrapped provider, through single-flight (app/services/single_flight.py) so
+     concurrent identical misses share one call
+
+recognize_ingredients, chat and chat_stream are passed straight through.
+"""
+import asyncio
+import time
+from typing import AsyncIterator
+
+from loguru import logger
+
+from app.core.config import settings
+from app.services.cache import CacheService
+from app.services.llm.base_llm import BaseLLM
+from app.services.single_flight import build_single_flight
+
+
+class CachedLLM(BaseLLM):
+    """Redis + semantic caching and single-flight coalescing in front of a provider."""
+
+    def __init__(self, llm: BaseLLM, cache: CacheService) -> None:
+        self._llm = llm
+        self._cache = cache
+        self._single_flight = build_single_flight(cache)
+        self._background: set[asyncio.Task] = set()  # strong refs until semantic stores finish
+
+    async def suggest_recipes(
+        self, ingredients: list[str], filters: list[str] | None = None
+    ) -> dict:
+        from app.rag.semantic_cache import semantic_cache
+
+        _filters = filters or []
+        cache_key = CacheService.make_key(
+            "recipes", ingredients=sorted(ingredients), filters=sorted(_filters)
+        )
+        cached = await self._cache.get(cache_key)
+        if cached:
+            logger.info(
+                "suggest_recipes | cache=HIT key_suffix={} dishes_count={}",
+                cache_key[-12:], len(cached.get("dishes", [])),
+            )
+            return cached
+        use_semantic = settings.semantic_cache_enabled and semantic_cache.available
+        if use_semantic:
+            similar = await semantic_cache.lookup(ingredients, _filters)
+            if similar is not None:
+                return similar
+
+        async def _miss() -> dict:
+            t0 = time.perf_counter()
+            result = await self._llm.suggest_recipes(ingredients, _filters)
+            await self._cache.set(cache_key, result, settings.cache_ttl_recipes)
+            if use_semantic:
+                task = asyncio.ensure_future(semantic_cache.store(ingredients, _filters, result))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            logger.info(
+                "suggest_recipes | cache=MISS key_suffix={} latency={}ms ttl={}s",
+                cache_key[-12:], round((time.perf_counter() - t0) * 1000, 1),
+                settings.cache_ttl_recipes,
+            )
+            return result
+
+        return await self._single_flight.do(cache_key, _miss)
+
+    async def recognize_ingredients(self, image_bytes: bytes) -> dict:
+        return await self._llm.recognize_ingredients(image_bytes)
+
+    async def generate_meal_plan(self, goal: str, days: int, calories_target: int) -> dict:
+        cache_key = CacheService.make_key(
+            "mealplan", goal=goal, days=days, calories_target=calories_target
+        )
+        cached = await self._cache.get(cache_key)
+        if cached:
+            logger.info(
+                "generate_meal_plan | cache=HIT key_suffix={} plan_days={}",
+                cache_key[-12:], len(cached.get("plan", [])),
+            )
+            return cached
+
+        async def _miss() -> dict:
+            t0 = time.perf_counter()
+            result = await self._llm.generate_meal_plan(goal, days, calories_target)
+            await self._cache.set(cache_key, result, settings.cache_ttl_meal_plans)
+            logger.info(
+                "generate_meal_plan | cache=MISS key_suffix={} latency={}ms ttl={}s",
+                cache_key[-12:], round((time.perf_counter() - t0) * 1000, 1),
+                settings.cache_ttl_meal_plans,
+            )
+            return result
+
+        return await self._single_flight.do(cache_key, _miss)
+
+    async def chat(self, message: str, history: list[dict] | None = None) -> str:
+        return await self._llm.chat(message, history)
+
+    async def chat_stream(
+        self, message: str, history: list[dict] | None = None
+    ) -> AsyncIterator[str]:
+        async for text in self._llm.chat_stream(message, history):
+            yield text
@@ -1,13 +1,13 @@
-"""Gemini 2.5 Flash LLM provider with key rotation and Redis caching."""
+"""Gemini 2.5 Flash LLM provider with key rotation (caching: app/services/llm/cached_llm.py)."""
 import json
 import re
 import time
+from typing import AsyncIterator
 
-from google import genai
 from google.genai import types
 from loguru import logger
 
-from app.services.cache import CacheService
+from app.services.genai_pool import genai_pool
 from app.services.key_manager import GeminiKeyManager
 from app.services.llm.base_llm import BaseLLM
 
@@ -19,20 +19,24 @@ _NO_THINK = types.GenerateContentConfig(
 _FAST_THINK = types.GenerateContentConfig(
     thinking_config=types.ThinkingConfig(thinking_budget=512)
 )
+_CHAT_SYSTEM_PROMPT = (
+    "Bạn là ChefGPT — trợ lý nấu ăn và dinh dưỡng AI người Việt. "
+    "Trả lời ngắn gọn, thực tế, bằng tiếng Việt. "
+    "Chỉ trả lời các câu hỏi liên quan đến nấu ăn, công thức, dinh dưỡng và ẩm thực."
+)
 
 
 class GeminiLLM(BaseLLM):
-    """Gemini 2.5 Flash provider with round-robin key rotation and Redis caching."""
+    """Gemini 2.5 Flash provider with round-robin key rotation."""
 
-    def __init__(self, key_manager: GeminiKeyManager, cache: CacheService) -> None:
+    def __init__(self, key_manager: GeminiKeyManager) -> None:
         self._key_manager = key_manager
-        self._cache = cache
 
     # ── Internal helpers ───────────────────────────────────────────────────────
 
     async def _get_client(self):
         key = await self._key_manager.get_key()
-        return genai.Client(api_key=key), key
+        return genai_pool.get(key), key
 
     async def _call(self, fn, *args, retry: bool = True, operation: str = "unknown"):
         """Call fn(client, *args), handle 429 with key rotation + 1 retry."""
@@ -75,35 +79,23 @@ class GeminiLLM(BaseLLM):
     async def suggest_recipes(
         self, ingredients: list[str], filters: list[str] | None = None
     ) -> dict:
-        from app.core.config import settings
         from app.services.rag import rag_service
 
         t_total = time.perf_counter()
-        _filters = filters or []
+        filters = filters or []
         logger.info(
             "suggest_recipes | ingredients_count={} ingredients={} filters={}",
-            len(ingredients), ingredients, _filters,
-        )
-
-        cache_key = CacheService.make_key(
-            "recipes", ingredients=sorted(ingredients), filters=sorted(_filters)
+            len(ingredients), ingredients, filters,
         )
-        cached = await self._cache.get(cache_key)
-        if cached:
-            logger.info(
-                "suggest_recipes | cache=HIT key_suffix={} dishes_count={}",
-                cache_key[-12:], len(cached.get("dishes", [])),
-            )
-            return cached
 
         t_rag = time.perf_counter()
-        rag_context = await rag_service.get_context(ingredients, _filters)
+        rag_context = await rag_service.get_context(ingredients, filters)
         logger.debug(
             "suggest_recipes | rag_search latency={}ms has_context={} context_len={}",
             round((time.perf_counter() - t_rag) * 1000, 1), bool(rag_context), len(rag_context),
         )
 
-        filters_str = ", ".join(_filters) if _filters else "không có"
+        filters_str = ", ".join(filters) if filters else "không có"
         rag_block = f"\n{rag_context}\n" if rag_context else ""
         prompt = f"""Bạn là đầu bếp chuyên nghiệp người Việt.
 {rag_block}
@@ -135,12 +127,11 @@ Trả về JSON với cấu trúc sau (không có text ngoài JSON):
         result = self._parse_json(response.text)
         dishes = result.get("dishes", [])
         dish_names = [d.get("name", "?") for d in dishes]
-        await self._cache.set(cache_key, result, settings.cache_ttl_recipes)
 
         total_ms = round((time.perf_counter() - t_total) * 1000, 1)
         logger.info(
-            "suggest_recipes | cache=MISS dishes_count={} dishes={} rag_used={} total_latency={}ms ttl={}s",
-            len(dishes), dish_names, bool(rag_context), total_ms, settings.cache_ttl_recipes,
+            "suggest_recipes | dishes_count={} dishes={} rag_used={} total_latency={}ms",
+            len(dishes), dish_names, bool(rag_context), total_ms,
         )
         return result
 
@@ -170,26 +161,12 @@ Trả về JSON với cấu trúc sau (không có text ngoài JSON):
         return result
 
     async def generate_meal_plan(self, goal: str, days: int, calories_target: int) -> dict:
-        from app.core.config import settings
-
         t_total = time.perf_counter()
         logger.info(
             "generate_meal_plan | goal={} days={} calories_target={}",
             goal, days, calories_target,
         )
 
-        cache_key = CacheService.make_key(
-            "mealplan", goal=goal, days=days, calories_target=calories_target
-        )
-        cached = await self._cache.get(cache_key)
-        if cached:
-            plan_days = len(cached.get("plan", []))
-            logger.info(
-                "generate_meal_plan | cache=HIT key_suffix={} plan_days={}",
-                cache_key[-12:], plan_days,
-            )
-            return cached
-
         goal_map = {
             "eat_clean": "ăn sạch, lành mạnh",
             "weight_loss": "giảm cân",
@@ -235,11 +212,10 @@ Trả về JSON (không có text ngoài JSON):
 
         plan_days = len(result.get("plan", []))
         nutrition = result.get("nutrition_summary", {})
-        await self._cache.set(cache_key, result, settings.cache_ttl_meal_plans)
 
         total_ms = round((time.perf_counter() - t_total) * 1000, 1)
         logger.info(
-            "generate_meal_plan | cache=MISS plan_days={} avg_calories={} avg_protein={}g avg_carbs={}g avg_fat={}g total_latency={}ms",
+            "generate_meal_plan | plan_days={} avg_calories={} avg_protein={}g avg_carbs={}g avg_fat={}g total_latency={}ms",
             plan_days,
             nutrition.get("avg_calories", "?"),
             nutrition.get("avg_protein", "?"),
@@ -249,15 +225,8 @@ Trả về JSON (không có text ngoài JSON):
         )
         return result
 
-    async def chat(self, message: str, history: list[dict] | None = None) -> str:
-        history_turns = len(history) if history else 0
-        logger.info("chat | message_len={} history_turns={}", len(message), history_turns)
-
-        system_prompt = (
-            "Bạn là ChefGPT — trợ lý nấu ăn và dinh dưỡng AI người Việt. "
-            "Trả lời ngắn gọn, thực tế, bằng tiếng Việt. "
-            "Chỉ trả lời các câu hỏi liên quan đến nấu ăn, công thức, dinh dưỡng và ẩm thực."
-        )
+    @staticmethod
+    def _chat_history(history: list[dict] | None) -> list[types.Content]:
         genai_history = []
         if history:
             for msg in history:
@@ -266,6 +235,11 @@ Trả về JSON (không có text ngoài JSON):
                 genai_history.append(
                     types.Content(role=role, parts=[types.Part(text=p) for p in parts])
                 )
+        return genai_history
+
+    async def chat(self, message: str, history: list[dict] | None = None) -> str:
+        history_turns = len(history) if history else 0
+        logger.info("chat | message_len={} history_turns={}", len(message), history_turns)
 
         async def _fn(client, msg, hist, sys_p):
             chat_session = client.aio.chats.create(
@@ -276,7 +250,9 @@ Trả về JSON (không có text ngoài JSON):
             return await chat_session.send_message(msg)
 
         t0 = time.perf_counter()
-        response = await self._call(_fn, message, genai_history, system_prompt, operation="chat")
+        response = await self._call(
+            _fn, message, self._chat_history(history), _CHAT_SYSTEM_PROMPT, operation="chat"
+        )
         reply_text = response.text
 
         logger.info(
@@ -284,3 +260,39 @@ Trả về JSON (không có text ngoài JSON):
             len(reply_text), round((time.perf_counter() - t0) * 1000, 1),
         )
         return reply_text
+
+    async def chat_stream(
+        self, message: str, history: list[dict] | None = None
+    ) -> AsyncIterator[str]:
+        history_turns = len(history) if history else 0
+        logger.info("chat_stream | message_len={} history_turns={}", len(message), history_turns)
+
+        async def _fn(client, msg, hist, sys_p):
+            chat_session = client.aio.chats.create(
+                model=_MODEL,
+                config=types.GenerateContentConfig(system_instruction=sys_p),
+                history=hist,
+            )
+            stream = await chat_session.send_message_stream(msg)
+            # The request is only sent on the first read — pull it inside _call so a
+            # 429 still rotates keys (impossible once chunks have reached the client)
+            return await anext(stream, None), stream
+
+        t0 = time.perf_counter()
+        first, stream = await self._call(
+            _fn, message, self._chat_history(history), _CHAT_SYSTEM_PROMPT, operation="chat_stream"
+        )
+        ttft_ms = round((time.perf_counter() - t0) * 1000, 1)
+        reply_len = 0
+        if first is not None and first.text:
+            reply_len += len(first.text)
+            yield first.text
+        async for chunk in stream:
+            if chunk.text:
+                reply_len += len(chunk.text)
+                yield chunk.text
+
+        logger.info(
+            "chat_stream | response_len={} ttft={}ms latency={}ms",
+            reply_len, ttft_ms, round((time.perf_counter() - t0) * 1000, 1),
+        )
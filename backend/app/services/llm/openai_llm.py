@@ -1,5 +1,6 @@
 """OpenAI GPT provider (optional — set LLM_PROVIDER=openai)."""
 import json
+from typing import AsyncIterator
 
 from loguru import logger
 
@@ -80,7 +81,8 @@ JSON: {{"plan": [{{"day": 1, "meals": {{"breakfast": "...", "lunch": "...", "din
         logger.debug("openai generate_meal_plan done model={}", self._model)
         return self._parse_json(text)
 
-    async def chat(self, message: str, history: list[dict] | None = None) -> str:
+    @staticmethod
+    def _chat_messages(message: str, history: list[dict] | None) -> list[dict]:
         messages = [{
             "role": "system",
             "content": (
@@ -94,8 +96,23 @@ JSON: {{"plan": [{{"day": 1, "meals": {{"breakfast": "...", "lunch": "...", "din
                 parts = msg.get("parts", [])
                 messages.append({"role": role, "content": " ".join(parts)})
         messages.append({"role": "user", "content": message})
+        return messages
 
+    async def chat(self, message: str, history: list[dict] | None = None) -> str:
         response = await self._client.chat.completions.create(
-            model=self._model, messages=messages, temperature=0.7
+            model=self._model, messages=self._chat_messages(message, history), temperature=0.7
         )
         return response.choices[0].message.content
+
+    async def chat_stream(
+        self, message: str, history: list[dict] | None = None
+    ) -> AsyncIterator[str]:
+        stream = await self._client.chat.completions.create(
+            model=self._model,
+            messages=self._chat_messages(message, history),
+            temperature=0.7,
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
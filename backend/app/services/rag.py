@@ -3,31 +3,96 @@ RAG (Retrieval-Augmented Generation) service for ChefGPT.
 
 Architecture:
   - Community recipe corpus: mocks/recipes.json (30 Vietnamese recipes)
-  - Embeddings: Gemini text-embedding-004 (768-dim)
-  - Vector store: in-memory numpy array (cosine similarity)
-  - Cache: mocks/recipe_embeddings.json (avoids re-generating on every restart)
+  - Embeddings: Gemini text-embedding-004 (768-dim), batched + concurrent
+    via app/rag/embeddings.py; EMBEDDING_BACKEND=local swaps in a deterministic
+    offline backend with the same index, store and search paths
+  - Vector store: in-memory numpy array, rows L2-normalized at load time,
+    searched through a pluggable index (app/rag/vector_index.py): exact scan
+    by default, IVF approximate search for large corpora
+  - Similar recipes: k-nearest-neighbour table (app/rag/neighbors.py) built
+    with every vector index, so "more like this" is an O(1) lookup
+  - Pantry search: ingredient → recipe inverted index with Vietnamese/English
+    synonym folding (app/rag/ingredient_index.py), ranked by coverage
+  - Autocomplete: prefix index over titles, tags and ingredient names with
+    usage-count-weighted top-n (app/rag/autocomplete.py)
+  - Filters: precomputed facet masks (app/rag/facet_index.py) applied before
+    top-k selection in vector, BM25, hybrid and keyword search
+  - Cache: mocks/recipe_embeddings.bin — binary store opened with mmap, written
+    by the first build (see app/rag/store.py; avoids re-generating on every
+    restart and lets uvicorn workers share the same pages)
+  - Shared mode (rag_shared_index): one worker builds under a file lock, every
+    worker maps the store and the saved vector-index arrays (app/rag/shared.py)
+  - Snapshots: the corpus and every index built over it form one immutable
+    _Snapshot. Queries read the current snapshot once; a reload builds a new
+    one off the request path and swaps the reference, so the old snapshot
+    serves until the swap.
 
 Usage:
-  await rag_service.initialize()          # once in lifespan
+  rag_service.start_background_init()     # once in lifespan; keyword search works
+                                          # immediately, semantic once `ready`
+  await rag_service.initialize()          # blocking variant (scripts)
+  await rag_service.reload()              # pick up an edited recipes.json
   recipes = await rag_service.search("canh chua cá", k=5)
   context = await rag_service.get_context(["cà chua", "trứng"], ["chay"])
 """
+import asyncio
+import contextlib
 import json
-import os
 import time
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
-from google import genai
 from loguru import logger
 
 from app.core.config import settings
+from app.rag import shared, store
+from app.rag.autocomplete import AutocompleteIndex
+from app.rag.embeddings import embedding_service
+from app.rag.facet_index import FacetIndex
+from app.rag.ingredient_index import IngredientIndex
+from app.rag.keyword_index import KeywordIndex
+from app.rag.neighbors import NeighborTable, build_neighbor_table
+from app.rag.query_cache import query_embedding_cache
+from app.rag.vector_index import ExactIndex, VectorIndex, build_vector_index
 
-_EMBED_MODEL = "text-embedding-004"
 _MOCK_DIR = Path(__file__).parent.parent / "mocks"
 _RECIPES_PATH = _MOCK_DIR / "recipes.json"
-_EMBED_CACHE_PATH = _MOCK_DIR / "recipe_embeddings.json"
+# Non-default embedding backends keep their own store next to the shipped Gemini one
+_EMBED_CACHE_PATH = _MOCK_DIR / (
+    "recipe_embeddings.bin"
+    if settings.embedding_backend == "gemini"
+    else f"recipe_embeddings.{settings.embedding_backend}.bin"
+)
+_INDEX_DIR = _MOCK_DIR / "recipe_embeddings.idx"  # shared mode: saved vector-index arrays
+_BUILD_LOCK_PATH = _MOCK_DIR / "recipe_embeddings.lock"
+_RRF_K = 60  # reciprocal-rank fusion damping constant
+_CONTEXT_MIN_COVERAGE = 0.3  # pantry coverage for a recipe to lead the LLM context
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """One corpus version and every index over it. Never mutated after publication."""
+
+    recipes: list[dict]
+    keyword_index: KeywordIndex
+    facets: FacetIndex
+    ingredients: IngredientIndex
+    autocomplete: AutocompleteIndex
+    id_to_row: dict[int, int]
+    vector_index: VectorIndex
+    embeddings: Optional[np.ndarray] = None  # shape (N, 768), unit-normalized rows
+    neighbors: Optional[NeighborTable] = None  # top rag_similar_k similar rows per row
+    version: int = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.embeddings is not None
+
+
+def _empty_vector_index() -> VectorIndex:
+    return ExactIndex(np.zeros((0, embedding_service.dim), dtype=np.float32))
 
 
 class RecipeRAGService:
@@ -37,130 +102,361 @@ class RecipeRAGService:
     """
 
     def __init__(self) -> None:
-        self._recipes: list[dict] = []
-        self._embeddings: Optional[np.ndarray] = None  # shape (N, 768)
-        self._ready = False
+        self._snapshot = _Snapshot(
+            recipes=[],
+            keyword_index=KeywordIndex([]),
+            facets=FacetIndex([]),
+            ingredients=IngredientIndex([]),
+            autocomplete=AutocompleteIndex([]),
+            id_to_row={},
+            vector_index=_empty_vector_index(),
+        )
+        self._reload_lock = asyncio.Lock()
+        self._corpus_mtime: Optional[int] = None
+        self._last_reload: Optional[dict] = None
+        # Index build progress, reported by build_progress()
+        self._status = "pending"  # pending | embedding | ready | degraded | keyword_only | failed
+        self._status_detail = ""
+        self._embed_total = 0
+        self._embed_done = 0
+        self._missing_rows = 0  # zero rows in the live index (not embedded yet)
+        self._build_started: Optional[float] = None
+        self._build_seconds: Optional[float] = None
+        self._init_task: Optional[asyncio.Task] = None
+        self._watch_task: Optional[asyncio.Task] = None
 
     # ── Initialization ─────────────────────────────────────────────────────────
 
     async def initialize(self) -> None:
-        """Load recipes + build embedding index. Call once in app lifespan."""
+        """Load recipes + build embedding index, waiting for the build to finish."""
+        if self.load_corpus():
+            await self._build_embeddings()
+
+    def start_background_init(self) -> None:
+        """
+        Load the corpus now (fast; keyword search is served from here on) and build the
+        embedding index in a background task. Semantic search switches on when `ready`.
+        Also starts the recipes.json watcher if `rag_corpus_watch_interval` > 0.
+        Call once in app lifespan; pair with `shutdown()`.
+        """
+        if self.load_corpus():
+            self._init_task = asyncio.create_task(self._build_embeddings(), name="rag-index-build")
+        if settings.rag_corpus_watch_interval > 0:
+            self._watch_task = asyncio.create_task(
+                self._watch_corpus(settings.rag_corpus_watch_interval), name="rag-corpus-watch"
+            )
+
+    async def shutdown(self) -> None:
+        """Cancel an unfinished background index build and the corpus watcher."""
+        for task in (self._init_task, self._watch_task):
+            if task is None or task.done():
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            logger.info("RAG: {} cancelled", task.get_name())
+
+    def load_corpus(self) -> bool:
+        """
+        Read recipes.json and publish a keyword-only snapshot (startup only —
+        replaces whatever is serving). Returns False if the file is missing.
+        """
         if not _RECIPES_PATH.exists():
             logger.warning("RAG: recipes.json not found at {}", _RECIPES_PATH)
-            return
+            self._set_status("failed", "recipes.json not found")
+            return False
 
-        with open(_RECIPES_PATH, encoding="utf-8") as f:
-            self._recipes = json.load(f)
+        self._corpus_mtime = _RECIPES_PATH.stat().st_mtime_ns
+        self._snapshot = self._corpus_snapshot(self._read_corpus(), self._snapshot.version + 1)
+        logger.info("RAG: loaded {} community recipes", len(self._snapshot.recipes))
+        return True
 
-        logger.info("RAG: loaded {} community recipes", len(self._recipes))
+    async def reload(self) -> dict:
+        """
+        Re-read recipes.json and swap in a fully built snapshot (keyword, facet and
+        vector indexes). Unchanged recipes reuse their cached embeddings; only new or
+        edited ones are embedded. Queries keep using the previous snapshot until the
+        swap. Raises OSError / ValueError if the file cannot be read or parsed.
+        """
+        async with self._reload_lock:
+            t0 = time.perf_counter()
+            old = self._snapshot
+            self._corpus_mtime = _RECIPES_PATH.stat().st_mtime_ns
+            recipes = await asyncio.to_thread(self._read_corpus)
+            snapshot = await asyncio.to_thread(self._corpus_snapshot, recipes, old.version + 1)
+            snapshot = await self._embed_snapshot(snapshot)
+
+            self._snapshot = snapshot  # atomic swap — in-flight queries finish on `old`
+            old_ids, new_ids = set(old.id_to_row), set(snapshot.id_to_row)
+            self._last_reload = {
+                "version": snapshot.version,
+                "recipe_count": len(snapshot.recipes),
+                "added": len(new_ids - old_ids),
+                "removed": len(old_ids - new_ids),
+                "embedded": self._embed_total,
+                "semantic_ready": snapshot.ready,
+                "elapsed_ms": round((time.perf_counter() - t0) * 1000),
+            }
+            logger.info("RAG: corpus reloaded | {}", self._last_reload)
+            return self._last_reload
+
+    async def _watch_corpus(self, interval: float) -> None:
+        """Poll recipes.json and reload when its mtime changes."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                mtime = _RECIPES_PATH.stat().st_mtime_ns
+            except OSError:
+                continue
+            if mtime == self._corpus_mtime or self._reload_lock.locked():
+                continue
+            logger.info("RAG: recipes.json changed, reloading")
+            try:
+                await self.reload()
+            except (OSError, ValueError) as e:
+                # Half-written file: keep serving the old snapshot, retry on the next change
+                logger.warning(
+                    "RAG: corpus reload failed, keeping version {}: {}", self._snapshot.version, e
+                )
+            except Exception:
+                # Anything else must not end the watcher — log it and keep polling
+                logger.exception(
+                    "RAG: corpus reload crashed, keeping version {}", self._snapshot.version
+                )
 
-        # Try disk cache first
-        if await self._load_cache():
-            return
+    async def _build_embeddings(self) -> None:
+        """Embed the current snapshot and publish it; never raises (status records failures)."""
+        async with self._reload_lock:
+            base = self._snapshot
+            snapshot = await self._embed_snapshot(base)
+            if self._snapshot is base:
+                self._snapshot = snapshot
 
-        # Cache miss → generate via Gemini API
-        if not settings.gemini_api_key and not settings.gemini_api_keys:
-            logger.warning("RAG: no Gemini API key — skipping embedding generation")
-            return
+    async def _embed_snapshot(self, snapshot: _Snapshot) -> _Snapshot:
+        """
+        Return `snapshot` with embeddings and a vector index, or `snapshot` unchanged
+        if none are available (no API key, every row failed, build error).
+        """
+        self._build_started = time.perf_counter()
+        self._build_seconds = None
+        self._embed_total = self._embed_done = self._missing_rows = 0
+        self._set_status("embedding")
+        result = snapshot
+        try:
+            # Shared mode: the first worker builds, the rest wait and then map its output
+            async with self._build_lock():
+                built = await self._load_or_build_embeddings(snapshot.recipes)
+                if built is not None:
+                    result = await asyncio.to_thread(self._with_embeddings, snapshot, *built)
+        except asyncio.CancelledError:
+            self._set_status("failed", "cancelled")
+            raise
+        except Exception as e:
+            logger.exception("RAG: index build failed")
+            self._set_status("failed", str(e))
+        else:
+            if result.ready and self._missing_rows:
+                reason = "no Gemini API key" if not embedding_service.available else "embedding failed"
+                self._set_status(
+                    "degraded", f"{self._missing_rows} recipes not embedded ({reason})"
+                )
+            elif result.ready:
+                self._set_status("ready")
+            elif self._status == "embedding":
+                self._set_status("keyword_only", "no embeddings available")
+        self._build_seconds = round(time.perf_counter() - self._build_started, 3)
+        return result
+
+    async def _load_or_build_embeddings(
+        self, recipes: list[dict]
+    ) -> Optional[tuple[np.ndarray, Optional[str]]]:
+        """
+        (unit-normalized embedding matrix, store content hash) for `recipes`, or None if
+        unavailable. The hash is set when the matrix is the mapped on-disk store.
+        """
+        row_keys = [store.row_key(self._recipe_to_text(r)) for r in recipes]
+
+        # Try disk cache first — exact hit maps the file as-is
+        cached = self._load_cache()
+        if cached is not None and cached[0].content_hash == store.content_hash(
+            embedding_service.model, row_keys
+        ):
+            header, matrix, _ = cached
+            logger.info(
+                "RAG: mapped embeddings from cache ({}, {}x{} {})",
+                _EMBED_CACHE_PATH.name, header.count, header.dim, header.dtype,
+            )
+            return matrix, header.content_hash  # rows are stored unit-normalized
 
-        await self._build_index()
+        # Cache miss or partial hit → embed only the rows whose text changed
+        return await self._build_index(recipes, row_keys, cached)
 
-    async def _load_cache(self) -> bool:
-        """Load cached embeddings from disk. Returns True if valid cache found."""
+    def _load_cache(self) -> Optional[tuple[store.StoreHeader, np.ndarray, list[bytes]]]:
+        """Open the on-disk embedding store. Returns None if missing, unreadable or for another model."""
         if not _EMBED_CACHE_PATH.exists():
-            return False
+            return None
         try:
-            with open(_EMBED_CACHE_PATH, encoding="utf-8") as f:
-                data = json.load(f)
-            if data.get("count") != len(self._recipes):
-                logger.info("RAG: cache stale (recipe count mismatch), rebuilding")
-                return False
-            self._embeddings = np.array(data["embeddings"], dtype=np.float32)
-            self._ready = True
-            logger.info("RAG: loaded embeddings from cache ({})", _EMBED_CACHE_PATH.name)
-            return True
+            opened = store.open_store(_EMBED_CACHE_PATH)
         except Exception as e:
             logger.warning("RAG: failed to load embedding cache: {}", e)
-            return False
-
-    async def _build_index(self) -> None:
-        """Generate embeddings for all community recipes and cache to disk."""
-        logger.info("RAG: generating embeddings for {} recipes via Gemini...", len(self._recipes))
+            return None
+        if opened is None:
+            logger.warning("RAG: embedding cache is unreadable, rebuilding")
+            return None
+        if opened[0].model != embedding_service.model:
+            logger.info("RAG: cache built with model {}, rebuilding", opened[0].model)
+            return None
+        return opened
+
+    async def _build_index(
+        self,
+        recipes: list[dict],
+        row_keys: list[bytes],
+        cached: Optional[tuple[store.StoreHeader, np.ndarray, list[bytes]]] = None,
+    ) -> Optional[tuple[np.ndarray, Optional[str]]]:
+        """
+        Build the embedding matrix for `recipes` and cache it to disk.
+        Rows whose text hash is already in `cached` are copied over; only new or
+        edited recipes are sent to the embedding API.
+        In shared mode the written store is re-opened so the matrix is the mapped file.
+        """
         t0 = time.perf_counter()
-
-        key = settings.gemini_keys_list[0] if settings.gemini_keys_list else settings.gemini_api_key
-        client = genai.Client(api_key=key)
-
-        embeddings: list[list[float]] = []
-        for recipe in self._recipes:
-            text = self._recipe_to_text(recipe)
-            try:
-                result = await client.aio.models.embed_content(
-                    model=_EMBED_MODEL, contents=text
-                )
-                embeddings.append(result.embeddings[0].values)
-            except Exception as e:
-                logger.error("RAG: embedding failed for recipe '{}': {}", recipe.get("title"), e)
-                # Use zero vector as fallback so index stays aligned
-                embeddings.append([0.0] * 768)
-
-        self._embeddings = np.array(embeddings, dtype=np.float32)
+        cached_rows: dict[bytes, int] = {}
+        if cached is not None:
+            cached_rows = {
+                key: i for i, key in enumerate(cached[2]) if key != store.MISSING_ROW_KEY
+            }
+        dim = cached[1].shape[1] if cached is not None else embedding_service.dim
+
+        reuse_dst = [i for i, key in enumerate(row_keys) if key in cached_rows]
+        todo = [i for i, key in enumerate(row_keys) if key not in cached_rows]
+        logger.info(
+            "RAG: index update — reused={} to_embed={} dropped={}",
+            len(reuse_dst), len(todo), len(cached_rows) - len({row_keys[i] for i in reuse_dst}),
+        )
+        matrix = np.zeros((len(recipes), dim), dtype=np.float32)
+        if reuse_dst:
+            reuse_src = [cached_rows[row_keys[i]] for i in reuse_dst]
+            matrix[reuse_dst] = cached[1][reuse_src]
+
+        stored_keys = list(row_keys)
+        if todo and not embedding_service.available:
+            # Serve the reused rows; the rest stay zero and are embedded once a key is set
+            logger.warning(
+                "RAG: no Gemini API key — {} recipes left unembedded, reusing {}",
+                len(todo), len(reuse_dst),
+            )
+            for i in todo:
+                stored_keys[i] = store.MISSING_ROW_KEY
+        elif todo:
+            self._embed_total, self._embed_done = len(todo), 0
+            vectors = await embedding_service.generate_embeddings_batch(
+                [self._recipe_to_text(recipes[i]) for i in todo],
+                allow_partial=True,
+                on_progress=self._on_embed_progress,
+            )
+            failed = []
+            for i, vector in zip(todo, vectors):
+                if vector is None:
+                    # Zero row keeps the index aligned; not cached so the next build retries it
+                    stored_keys[i] = store.MISSING_ROW_KEY
+                    failed.append(recipes[i].get("title"))
+                    continue
+                matrix[i] = self._normalize(np.array(vector, dtype=np.float32))
+            if failed:
+                logger.error("RAG: embedding failed for {} recipes: {}", len(failed), failed[:5])
+
+        self._missing_rows = sum(key == store.MISSING_ROW_KEY for key in stored_keys)
+        if self._missing_rows == len(stored_keys):
+            if not embedding_service.available:
+                self._set_status("keyword_only", "no Gemini API key")
+                return None
+            logger.error("RAG: no recipe could be embedded — semantic search disabled")
+            self._set_status("keyword_only", "embedding failed for every recipe")
+            return None
 
         # Save cache
+        result: tuple[np.ndarray, Optional[str]] = (matrix, None)
         try:
-            _MOCK_DIR.mkdir(parents=True, exist_ok=True)
-            with open(_EMBED_CACHE_PATH, "w", encoding="utf-8") as f:
-                json.dump(
-                    {"count": len(self._recipes), "embeddings": self._embeddings.tolist()},
-                    f,
-                )
+            header = await asyncio.to_thread(
+                store.write_store,
+                _EMBED_CACHE_PATH,
+                matrix,
+                stored_keys,
+                model=embedding_service.model,
+                dtype=settings.rag_embedding_dtype,
+            )
             logger.info("RAG: embeddings cached to {}", _EMBED_CACHE_PATH.name)
+            # Serve from the mapped store rather than the private matrix when workers share
+            # it, or when a quantized scan keeps only codes resident and re-ranks from disk
+            if settings.rag_shared_index or settings.rag_quantization != "none":
+                opened = self._load_cache()
+                if opened is not None and opened[0].content_hash == header.content_hash:
+                    result = (opened[1], header.content_hash)
         except Exception as e:
             logger.warning("RAG: could not write embedding cache: {}", e)
 
         elapsed = round((time.perf_counter() - t0) * 1000)
         logger.info("RAG: index built in {}ms", elapsed)
-        self._ready = True
+        return result
 
     # ── Public API ─────────────────────────────────────────────────────────────
 
-    async def search(self, query: str, k: int = 5) -> list[dict]:
+    async def search(self, query: str, k: int = 5, **filters) -> list[dict]:
         """
         Semantic search over community recipes.
         Returns up to k recipes sorted by cosine similarity descending.
+        `filters` (cuisine, difficulty, category, tag, max_prep_time, max_calories, ...;
+        see app/rag/facet_index.py) restrict the candidates before top-k selection.
         """
-        if not self._ready or self._embeddings is None:
-            logger.debug("RAG: not ready, skipping search")
-            return []
-        if not query.strip():
-            return []
-
-        try:
-            key = settings.gemini_keys_list[0] if settings.gemini_keys_list else settings.gemini_api_key
-            client = genai.Client(api_key=key)
-            result = await client.aio.models.embed_content(
-                model=_EMBED_MODEL, contents=query
-            )
-            query_emb = np.array(result.embeddings[0].values, dtype=np.float32)
-        except Exception as e:
-            logger.warning("RAG: query embedding failed: {}", e)
-            return []
-
-        # Cosine similarity: (N,768) @ (768,) / (norm_N * norm_query)
-        norms = np.linalg.norm(self._embeddings, axis=1) * np.linalg.norm(query_emb)
-        norms = np.where(norms == 0, 1e-9, norms)  # avoid division by zero
-        scores = (self._embeddings @ query_emb) / norms
-
-        top_k_idx = int(min(k, len(self._recipes)))
-        indices = np.argsort(scores)[::-1][:top_k_idx]
+        snap = self._snapshot
+        mask = snap.facets.mask(**filters)
+        return [
+            self._with_score(snap, row, score)
+            for row, score in await self._vector_search(snap, query, k, mask)
+        ]
 
-        results = []
-        for idx in indices:
-            recipe = dict(self._recipes[int(idx)])
-            recipe["score"] = round(float(scores[idx]), 4)
-            results.append(recipe)
+    def bm25_search(self, query: str, k: int = 5, **filters) -> list[dict]:
+        """Keyword search ranked by BM25 over the precomputed term statistics (no embeddings)."""
+        snap = self._snapshot
+        mask = snap.facets.mask(**filters)
+        return [
+            self._with_score(snap, row, score)
+            for row, score in snap.keyword_index.bm25(query, k, mask)
+        ]
 
-        return results
+    async def hybrid_search(self, query: str, k: int = 5, **filters) -> list[dict]:
+        """
+        Fuse vector and BM25 rankings with reciprocal-rank fusion:
+        score(d) = Σ 1 / (60 + rank_i(d)) over both rankings.
+        Each ranking contributes its top `k × 4` candidates. Results carry
+        `match_type` "hybrid"; if the vector index is unavailable (not built, query
+        embedding failed) they are the plain BM25 ranking with BM25 scores and
+        `match_type` "keyword".
+        """
+        snap = self._snapshot
+        depth = max(k * 4, 20)
+        mask = snap.facets.mask(**filters)
+        keyword = snap.keyword_index.bm25(query, depth, mask)
+        vector = await self._vector_search(snap, query, depth, mask)
+        if not vector:
+            return [
+                {**self._with_score(snap, row, score), "match_type": "keyword"}
+                for row, score in keyword[:k]
+            ]
+
+        fused: dict[int, float] = {}
+        for rank, (row, _) in enumerate(keyword, start=1):
+            fused[row] = 1.0 / (_RRF_K + rank)
+        for rank, (row, _) in enumerate(vector, start=1):
+            fused[row] = fused.get(row, 0.0) + 1.0 / (_RRF_K + rank)
+
+        ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [
+            {**self._with_score(snap, row, score), "match_type": "hybrid"} for row, score in ranked
+        ]
 
     def keyword_search(
         self,
@@ -170,34 +466,67 @@ class RecipeRAGService:
         category: Optional[str] = None,
         limit: int = 20,
         offset: int = 0,
+        **filters,
     ) -> list[dict]:
         """
         Keyword + filter search over community recipes (no embeddings needed).
-        Matches query against title, description, tags, and ingredients.
+        Matches query tokens against title, description, tags, and ingredients via the
+        inverted index — diacritic-insensitive, each token prefix-matches ("pho bo" → "Phở Bò").
+        Extra `filters` (tag, max_prep_time, max_calories, ...) are facet-index filters.
+        """
+        snap = self._snapshot
+        mask = snap.facets.mask(cuisine=cuisine, difficulty=difficulty, category=category, **filters)
+        rows = snap.keyword_index.search(query, mask)
+        return [snap.recipes[i] for i in rows[offset : offset + limit]]
+
+    def autocomplete(self, prefix: str, limit: int = 8) -> list[dict]:
+        """Search-box suggestions (recipe titles, tags, ingredients) for a typed prefix."""
+        return self._snapshot.autocomplete.complete(prefix, limit)
+
+    def get_recipe(self, recipe_id: int) -> Optional[dict]:
+        """O(1) lookup of a community recipe by id."""
+        snap = self._snapshot
+        row = snap.id_to_row.get(recipe_id)
+        return snap.recipes[row] if row is not None else None
+
+    def get_recipes(self, recipe_ids: list[int]) -> list[dict]:
+        """Recipes for `recipe_ids` in the given order; unknown ids are skipped."""
+        snap = self._snapshot
+        rows = (snap.id_to_row.get(rid) for rid in recipe_ids)
+        return [snap.recipes[row] for row in rows if row is not None]
+
+    def search_by_ingredients(
+        self, pantry: list[str], k: int = 10, min_coverage: float = 0.0, **filters
+    ) -> list[dict]:
         """
-        q = query.lower().strip()
+        Recipes ranked by how much of their ingredient list `pantry` covers (staples
+        such as salt or fish sauce excluded), each with "coverage",
+        "matched_ingredients" and "missing_ingredients". No embeddings needed.
+        """
+        snap = self._snapshot
+        mask = snap.facets.mask(**filters)
         results = []
-        for r in self._recipes:
-            # Apply hard filters first
-            if cuisine and r.get("cuisine", "").lower() != cuisine.lower():
-                continue
-            if difficulty and r.get("difficulty", "").lower() != difficulty.lower():
-                continue
-            if category and r.get("category", "").lower() != category.lower():
-                continue
-            # Keyword match
-            if q:
-                haystack = " ".join([
-                    r.get("title", ""),
-                    r.get("description", ""),
-                    " ".join(r.get("tags", [])),
-                    " ".join(r.get("ingredients", [])),
-                ]).lower()
-                if q not in haystack:
-                    continue
-            results.append(r)
+        for match in snap.ingredients.rank(pantry, k, min_coverage, mask):
+            recipe = dict(snap.recipes[match.row])
+            recipe["coverage"] = match.coverage
+            recipe["matched_ingredients"] = match.matched
+            recipe["missing_ingredients"] = match.missing
+            results.append(recipe)
+        return results
 
-        return results[offset : offset + limit]
+    def similar_recipes(self, recipe_id: int, k: int = 5) -> Optional[list[dict]]:
+        """
+        Up to `k` (≤ rag_similar_k) recipes most similar to `recipe_id`, each with a
+        "score", from the precomputed neighbour table. None if the id is unknown;
+        [] until embeddings are ready.
+        """
+        snap = self._snapshot
+        row = snap.id_to_row.get(recipe_id)
+        if row is None:
+            return None
+        if snap.neighbors is None:
+            return []
+        return [self._with_score(snap, other, score) for other, score in snap.neighbors.get(row, k)]
 
     async def get_context(
         self,
@@ -206,25 +535,185 @@ class RecipeRAGService:
         k: int = 3,
     ) -> str:
         """
-        Retrieve top-k similar community recipes and format them as LLM context.
+        Retrieve top-k community recipes and format them as LLM context.
         Used to ground Gemini's recipe suggestions with real examples.
+        Pre-pass: recipes the ingredients cover best (ingredient index, no embedding
+        call); remaining slots are filled by semantic (or BM25) search.
+        Filters that are known recipe tags ("chay", "ít calo") also pre-filter the candidates.
         """
         query = f"{', '.join(ingredients)} {' '.join(filters)}".strip()
-        recipes = await self.search(query, k=k)
+        tags = [f for f in filters if self._snapshot.facets.has("tag", f)]
+        recipes = self.search_by_ingredients(
+            ingredients, k=k, min_coverage=_CONTEXT_MIN_COVERAGE, tag=tags
+        )
+        if len(recipes) < k:
+            seen = {r["id"] for r in recipes}
+            if self.ready:
+                more = await self.search(query, k=k, tag=tags)
+            else:
+                more = self.bm25_search(query, k=k, tag=tags)
+            recipes += [r for r in more if r["id"] not in seen][: k - len(recipes)]
         if not recipes:
             return ""
 
         lines = ["**Tham khảo công thức cộng đồng (dùng để cải thiện gợi ý):**"]
         for r in recipes:
             ing_preview = ", ".join(r.get("ingredients", [])[:6])
-            lines.append(
+            line = (
                 f"- **{r['title']}**: {r['description']} "
                 f"(nguyên liệu chính: {ing_preview})"
             )
+            if r.get("missing_ingredients"):
+                line += f" — còn thiếu: {', '.join(r['missing_ingredients'])}"
+            lines.append(line)
         return "\n".join(lines)
 
+    def build_progress(self) -> dict:
+        """Index build status for the readiness endpoint."""
+        snap = self._snapshot
+        elapsed = self._build_seconds
+        if elapsed is None and self._build_started is not None:
+            elapsed = round(time.perf_counter() - self._build_started, 3)
+        return {
+            "status": self._status,
+            "detail": self._status_detail,
+            "corpus_loaded": bool(snap.recipes),
+            "semantic_ready": snap.ready,
+            "recipe_count": len(snap.recipes),
+            "snapshot_version": snap.version,
+            "embedded": self._embed_done,
+            "to_embed": self._embed_total,
+            "elapsed_seconds": elapsed,
+            "last_reload": self._last_reload,
+        }
+
     # ── Helpers ────────────────────────────────────────────────────────────────
 
+    def _set_status(self, status: str, detail: str = "") -> None:
+        self._status = status
+        self._status_detail = detail
+
+    def _on_embed_progress(self, count: int) -> None:
+        self._embed_done += count
+
+    @staticmethod
+    def _read_corpus() -> list[dict]:
+        """Parsed recipes.json. Raises ValueError if it is not a list of recipes with unique ids."""
+        with open(_RECIPES_PATH, encoding="utf-8") as f:
+            recipes = json.load(f)
+        if not isinstance(recipes, list):
+            raise ValueError(f"expected a list of recipes, got {type(recipes).__name__}")
+        seen: set = set()
+        for pos, recipe in enumerate(recipes):
+            if not isinstance(recipe, dict) or "id" not in recipe:
+                raise ValueError(f"recipe #{pos} is not an object with an \"id\"")
+            if recipe["id"] in seen:
+                raise ValueError(f"duplicate recipe id {recipe['id']!r}")
+            seen.add(recipe["id"])
+        return recipes
+
+    @staticmethod
+    def _corpus_snapshot(recipes: list[dict], version: int) -> _Snapshot:
+        """Keyword-only snapshot: corpus + keyword/facet indexes, no embeddings yet."""
+        return _Snapshot(
+            recipes=recipes,
+            keyword_index=KeywordIndex(recipes),
+            facets=FacetIndex(recipes),
+            ingredients=IngredientIndex(recipes),
+            autocomplete=AutocompleteIndex(recipes),
+            id_to_row={r["id"]: row for row, r in enumerate(recipes)},
+            vector_index=_empty_vector_index(),
+            version=version,
+        )
+
+    @staticmethod
+    def _build_lock() -> contextlib.AbstractAsyncContextManager:
+        """Cross-worker build lock in shared mode, otherwise a no-op."""
+        if settings.rag_shared_index:
+            return shared.file_lock(_BUILD_LOCK_PATH)
+        return contextlib.nullcontext()
+
+    @staticmethod
+    def _with_embeddings(
+        snapshot: _Snapshot, matrix: np.ndarray, store_hash: Optional[str] = None
+    ) -> _Snapshot:
+        """
+        Copy of `snapshot` with a unit-normalized embedding matrix and the configured
+        vector index — mapped from (or saved to) _INDEX_DIR in shared mode.
+        """
+        t0 = time.perf_counter()
+        params = dict(
+            kind=settings.rag_vector_index,
+            nlist=settings.rag_ivf_nlist,
+            nprobe=settings.rag_ivf_nprobe,
+            quantization=settings.rag_quantization,
+            rerank_factor=settings.rag_rerank_factor,
+        )
+        if settings.rag_shared_index and store_hash is not None:
+            vector_index = shared.load_or_build_index(_INDEX_DIR, store_hash, matrix, **params)
+            directory = shared.index_dir(
+                _INDEX_DIR, store_hash, params["kind"], params["nlist"], params["quantization"]
+            )
+            neighbors = shared.load_or_build_neighbors(
+                directory, matrix, vector_index, settings.rag_similar_k
+            )
+        else:
+            vector_index = build_vector_index(matrix, **params)
+            neighbors = build_neighbor_table(matrix, settings.rag_similar_k, vector_index)
+        logger.info(
+            "RAG: vector index ready | {} neighbours k={} build={}ms",
+            vector_index.stats(), neighbors.k, round((time.perf_counter() - t0) * 1000),
+        )
+        return _Snapshot(
+            recipes=snapshot.recipes,
+            keyword_index=snapshot.keyword_index,
+            facets=snapshot.facets,
+            ingredients=snapshot.ingredients,
+            autocomplete=snapshot.autocomplete,
+            id_to_row=snapshot.id_to_row,
+            vector_index=vector_index,
+            embeddings=matrix,
+            neighbors=neighbors,
+            version=snapshot.version,
+        )
+
+    async def _vector_search(
+        self, snap: _Snapshot, query: str, k: int, mask: Optional[np.ndarray] = None
+    ) -> list[tuple[int, float]]:
+        """
+        Top-k (row, cosine score) for `query` among rows allowed by `mask`, from the
+        snapshot's vector index; [] if unavailable.
+        """
+        if not snap.ready:
+            logger.debug("RAG: not ready, skipping search")
+            return []
+        if not query.strip():
+            return []
+
+        try:
+            query_emb = self._normalize(await query_embedding_cache.get(query))
+        except Exception as e:
+            logger.warning("RAG: query embedding failed: {}", e)
+            return []
+
+        if mask is not None and not mask.any():
+            return []
+        rows, scores = snap.vector_index.search(query_emb, k, mask)
+        return [(int(row), float(score)) for row, score in zip(rows, scores)]
+
+    @staticmethod
+    def _with_score(snap: _Snapshot, row: int, score: float) -> dict:
+        recipe = dict(snap.recipes[row])
+        recipe["score"] = round(score, 4)
+        return recipe
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize a vector or each row of a matrix. Zero rows stay zero."""
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32, copy=False)
+
     @staticmethod
     def _recipe_to_text(recipe: dict) -> str:
         """Convert recipe dict to a single searchable string for embedding."""
@@ -240,11 +729,15 @@ class RecipeRAGService:
 
     @property
     def ready(self) -> bool:
-        return self._ready
+        return self._snapshot.ready
 
     @property
     def recipe_count(self) -> int:
-        return len(self._recipes)
+        return len(self._snapshot.recipes)
+
+    @property
+    def vector_index_stats(self) -> dict:
+        return self._snapshot.vector_index.stats()
 
 
 # Singleton — initialized in app lifespan
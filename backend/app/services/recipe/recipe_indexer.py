@@ -1,9 +1,13 @@
 """Recipe indexing service for RAG pipeline."""
 from typing import List, Optional, Dict
 from sqlmodel import select
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.recipe import Recipe
+from sqlalchemy.orm import selectinload
+from app.core.database import async_session_maker
+from app.models.recipe import Recipe, RecipeIngredient
 from app.rag.embeddings import embedding_service
+from app.rag.vectorstore import vector_search
 from loguru import logger
 
 
@@ -34,9 +38,11 @@ class RecipeIndexer:
 
             # Update recipe with embedding
             recipe.embedding = embedding
+            recipe.embedding_model = self.embedding_service.model
 
             await session.commit()
             await session.refresh(recipe)
+            vector_search.invalidate()
 
             logger.info(f"Successfully indexed recipe {recipe.id}: {recipe.title}")
             return True
@@ -63,8 +69,14 @@ class RecipeIndexer:
         """
         results = {"success": 0, "failed": 0, "skipped": 0}
 
-        # Fetch recipes
-        statement = select(Recipe).where(Recipe.id.in_(recipe_ids))
+        # Fetch recipes (with ingredient names for the embedding text)
+        statement = (
+            select(Recipe)
+            .where(Recipe.id.in_(recipe_ids))
+            .options(
+                selectinload(Recipe.recipe_ingredients).selectinload(RecipeIngredient.ingredient)
+            )
+        )
         result = await session.execute(statement)
         recipes = result.scalars().all()
 
@@ -97,9 +109,11 @@ class RecipeIndexer:
             # Update recipes with embeddings
             for recipe, embedding in zip(valid_recipes, embeddings):
                 recipe.embedding = embedding
+                recipe.embedding_model = self.embedding_service.model
                 results["success"] += 1
 
             await session.commit()
+            vector_search.invalidate()
 
             logger.info(
                 f"Successfully indexed {results['success']} recipes in batch"
@@ -113,6 +127,18 @@ class RecipeIndexer:
 
         return results
 
+    async def index_recipes_background(self, recipe_ids: List[int]) -> None:
+        """
+        Index recipes in their own session — for FastAPI BackgroundTasks, which run
+        after the request session has been closed.
+
+        Args:
+            recipe_ids: List of recipe IDs to index
+        """
+        async with async_session_maker() as session:
+            results = await self.index_recipes_batch(recipe_ids, session)
+        logger.info(f"Background indexing of recipes {recipe_ids}: {results}")
+
     async def reindex_all_recipes(self, session: AsyncSession) -> Dict[str, int]:
         """
         Reindex all public recipes.
@@ -201,10 +227,15 @@ class RecipeIndexer:
         if recipe.tags:
             parts.append(f"Tags: {recipe.tags}")
 
-        # TODO: Add ingredients when loaded
-        # if recipe.recipe_ingredients:
-        #     ingredients = [ing.ingredient.name for ing in recipe.recipe_ingredients]
-        #     parts.append(f"Ingredients: {', '.join(ingredients)}")
+        # Ingredients, when loaded (never trigger a lazy load from async code)
+        if "recipe_ingredients" not in inspect(recipe).unloaded and recipe.recipe_ingredients:
+            ingredients = [
+                ing.ingredient.name_vi or ing.ingredient.name
+                for ing in recipe.recipe_ingredients
+                if ing.ingredient is not None
+            ]
+            if ingredients:
+                parts.append(f"Ingredients: {', '.join(ingredients)}")
 
         # TODO: Add steps summary when loaded
         # if recipe.steps:
@@ -231,7 +262,9 @@ class RecipeIndexer:
 
             if recipe:
                 recipe.embedding = None
+                recipe.embedding_model = None
                 await session.commit()
+                vector_search.invalidate()
                 logger.info(f"Removed embedding for recipe {recipe_id}")
                 return True
 
@@ -4,6 +4,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.recipe import Recipe
 from app.rag.vectorstore import vector_search
 from app.rag.embeddings import embedding_service
+from app.rag.ingredient_index import match_ingredients
+from app.utils.text import matches
 from loguru import logger
 
 
@@ -42,6 +44,7 @@ class RecipeRetriever:
                     query_text=query,
                     session=session,
                     limit=limit,
+                    filters=filters,
                 )
             else:
                 results = await self.vector_search.search_by_text(
@@ -51,14 +54,15 @@ class RecipeRetriever:
                     filters=filters,
                 )
 
-            # Format results
+            # Format results — hybrid scores are RRF sums, not cosine similarities
             recipes_with_meta = []
             for recipe, score in results:
+                similarity = None if use_hybrid else score
                 recipes_with_meta.append(
                     {
                         "recipe": recipe,
                         "score": score,
-                        "match_reason": self._explain_match(query, recipe, score),
+                        "match_reason": self._explain_match(query, recipe, similarity),
                     }
                 )
 
@@ -177,12 +181,15 @@ class RecipeRetriever:
 
         # Apply filters based on preferences
         filters = {}
-        if "dietary_preference" in user_preferences:
-            # Would need to filter based on dietary tags
-            pass
+        if user_preferences.get("dietary_preference"):
+            # Preferences that are recipe tags ("chay", "ăn kiêng") pre-filter; others
+            # ("vegetarian") would match no row, so they only steer the query text
+            filters["tag"] = await self.vector_search.known_tags(
+                [user_preferences["dietary_preference"]]
+            )
 
         if "max_cook_time" in user_preferences:
-            filters["max_prep_time"] = user_preferences["max_cook_time"]
+            filters["max_cook_time"] = user_preferences["max_cook_time"]
 
         return await self.find_recipes_by_query(
             query=enhanced_query,
@@ -191,41 +198,44 @@ class RecipeRetriever:
             filters=filters,
         )
 
-    def _explain_match(self, query: str, recipe: Recipe, score: float) -> str:
+    def _explain_match(self, query: str, recipe: Recipe, score: Optional[float]) -> str:
         """
         Generate explanation for why a recipe matched the query.
 
         Args:
             query: Original query
             recipe: Matched recipe
-            score: Match score
+            score: Cosine similarity, or None for rankings without one (hybrid RRF)
 
         Returns:
             Human-readable explanation
         """
         reasons = []
 
-        # Check for direct title match
-        if query.lower() in recipe.title.lower():
+        # Check for direct title match (diacritic-insensitive: "pho bo" ~ "Phở Bò")
+        if matches(query, recipe.title):
             reasons.append("matches recipe title")
 
         # Check for cuisine match
-        if recipe.cuisine and query.lower() in recipe.cuisine.lower():
+        if recipe.cuisine and matches(query, recipe.cuisine):
             reasons.append(f"is {recipe.cuisine} cuisine")
 
         # Check for category match
-        if recipe.category and query.lower() in recipe.category.lower():
+        if recipe.category and matches(query, recipe.category):
             reasons.append(f"is a {recipe.category} dish")
 
         # Add similarity score
-        if score > 0.9:
-            reasons.append("very high similarity")
-        elif score > 0.8:
-            reasons.append("high similarity")
-        elif score > 0.7:
-            reasons.append("good similarity")
-
-        return ", ".join(reasons) if reasons else "semantic similarity"
+        if score is not None:
+            if score > 0.9:
+                reasons.append("very high similarity")
+            elif score > 0.8:
+                reasons.append("high similarity")
+            elif score > 0.7:
+                reasons.append("good similarity")
+
+        if reasons:
+            return ", ".join(reasons)
+        return "semantic similarity" if score is not None else "keyword and semantic ranking"
 
     def _calculate_ingredient_match(
         self, user_ingredients: List[str], recipe: Recipe
@@ -240,9 +250,8 @@ class RecipeRetriever:
         Returns:
             Dictionary with match information
         """
-        # TODO: Load recipe ingredients from database
-        # For now, return placeholder
-        recipe_ingredients = []  # Would load from recipe.recipe_ingredients
+        # Ingredient names come from the vector store snapshot (no lazy load)
+        recipe_ingredients = self.vector_search.recipe_ingredients(recipe.id)
 
         if not recipe_ingredients:
             return {
@@ -251,26 +260,13 @@ class RecipeRetriever:
                 "match_percentage": 0.0,
             }
 
-        # Normalize ingredient names for matching
-        user_ing_lower = [ing.lower().strip() for ing in user_ingredients]
-        recipe_ing_lower = [ing.lower().strip() for ing in recipe_ingredients]
-
-        # Find matches
-        available = [
-            ing for ing in recipe_ingredients if ing.lower() in user_ing_lower
-        ]
-        missing = [
-            ing for ing in recipe_ingredients if ing.lower() not in user_ing_lower
-        ]
-
-        match_percentage = (
-            len(available) / len(recipe_ingredients) if recipe_ingredients else 0.0
-        )
+        # Diacritic-insensitive, synonym-folded matching; staples never count as missing
+        match = match_ingredients(user_ingredients, recipe_ingredients)
 
         return {
-            "available": available,
-            "missing": missing,
-            "match_percentage": match_percentage,
+            "available": match.matched,
+            "missing": match.missing,
+            "match_percentage": match.coverage,
         }
 
     def _enhance_query_with_context(
@@ -0,0 +1,111 @@
+"""
+Single-flight coalescing for expensive, cacheable calls (LLM suggestions, meal plans).
+
+On a cache miss every concurrent caller used to fire its own LLM request, so a
+trending ingredient combo turned into a stampede of identical Gemini calls (quota
+burn, 429s). `SingleFlight.do(key, fn)` runs `fn` once per key at a time:
+
+  - in-process: the first caller (leader) starts `fn` as a task; callers arriving
+    while it runs await the same task and share its result or exception
+  - across workers (optional, `single_flight_redis_lock`): the leader also takes a
+    Redis lock `<key>:lock` (SET NX EX). A worker that finds the lock held polls the
+    cache key for the leader's result instead of calling `fn`, and falls back to
+    calling it itself if the lock is released without a result or the wait times
+    out. If Redis is down the lock is skipped, never waited on.
+
+`fn` is expected to write its result to the cache under `key` before returning —
+that is how followers in other workers receive it.
+"""
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+from app.services.cache import CacheService
+
+_POLL_INTERVAL = 0.2  # seconds between cache polls while another worker holds the lock
+
+
+class SingleFlight:
+    """Per-key coalescing of concurrent calls, optionally extended across workers via Redis."""
+
+    def __init__(
+        self,
+        cache: CacheService,
+        redis_lock: bool = False,
+        lock_ttl: int = 120,
+        wait_seconds: float = 60,
+    ) -> None:
+        self._cache = cache
+        self._redis_lock = redis_lock
+        self._lock_ttl = lock_ttl
+        self._wait_seconds = wait_seconds
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[dict]]) -> dict:
+        """Result of `fn`, shared with every concurrent caller using the same `key`."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._lead(key, fn))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self._coalesced += 1
+            logger.info("single_flight | coalesced key_suffix={}", key[-12:])
+        # shield: a caller that disconnects must not cancel the call others are awaiting
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {"inflight": len(self._inflight), "coalesced": self._coalesced}
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved — callers already received it
+
+    async def _lead(self, key: str, fn: Callable[[], Awaitable[dict]]) -> dict:
+        if not self._redis_lock:
+            return await fn()
+
+        lock_key = f"{key}:lock"
+        acquired = await self._cache.set_nx(lock_key, "1", self._lock_ttl)
+        if acquired is False:
+            result = await self._wait_for(key, lock_key)
+            if result is not None:
+                return result
+            acquired = await self._cache.set_nx(lock_key, "1", self._lock_ttl)
+        try:
+            return await fn()
+        finally:
+            if acquired:
+                await self._cache.delete(lock_key)
+
+    async def _wait_for(self, key: str, lock_key: str) -> Optional[dict]:
+        """The result another worker writes under `key`, or None if it never arrives."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._wait_seconds
+        while loop.time() < deadline:
+            await asyncio.sleep(_POLL_INTERVAL)
+            result = await self._cache.get(key)
+            if result is not None:
+                self._coalesced += 1
+                logger.info("single_flight | coalesced across workers key_suffix={}", key[-12:])
+                return result
+            if not await self._cache.exists(lock_key):
+                # Lock released (or expired) without a result — the leader failed
+                return await self._cache.get(key)
+        logger.warning("single_flight | lock wait timed out key_suffix={}", key[-12:])
+        return None
+
+
+def build_single_flight(cache: CacheService) -> SingleFlight:
+    """A SingleFlight over `cache` configured from settings."""
+    return SingleFlight(
+        cache,
+        redis_lock=settings.single_flight_redis_lock,
+        lock_ttl=settings.single_flight_lock_ttl,
+        wait_seconds=settings.single_flight_wait_seconds,
+    )
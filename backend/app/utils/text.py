@@ -0,0 +1,101 @@
+"""
+Text analysis shared by every search path (Vietnamese diacritic-insensitive).
+
+One analyzer for the keyword/BM25 index, the ingredient index, facet values, the
+SQL recipe search column and the local embedding backend, so a query folds and
+tokenizes the same way everywhere:
+
+  fold("Phở Bò")           → "pho bo"          (case + diacritics, one str.translate)
+  tokenize("Phở Bò")       → ["pho", "bo"]     (syllables)
+  analyze("cà chua bi")    → ["ca", "chua", "bi", "cachua", "chuabi"]
+                                               (syllables + adjacent-syllable n-grams)
+  syllables("Cá Kho")      → ["cá", "kho"]     (lower-cased, diacritics kept — so a
+                                               query typed with tones can match as written)
+
+The folding table is built once at import from unicodedata, covering precomposed
+Latin letters (Vietnamese lives in Latin-1, Extended-A/B and Extended Additional)
+and stray combining marks from NFD input. Syllable n-grams are joined without a
+separator, so multi-syllable words match as a unit and "cachua" typed without a
+space still finds "cà chua".
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SYLLABLE_RE = re.compile(r"[^\W_]+")
+
+_LATIN_RANGES = ((0x00C0, 0x024F), (0x1E00, 0x1EFF))
+
+
+def _build_fold_table() -> dict[int, str | None]:
+    table: dict[int, str | None] = {cp: None for cp in range(0x0300, 0x0370)}  # combining marks
+    for start, end in _LATIN_RANGES:
+        for cp in range(start, end + 1):
+            ch = chr(cp)
+            base = "".join(c for c in unicodedata.normalize("NFD", ch) if not unicodedata.combining(c))
+            if base and base != ch:
+                table[cp] = base.lower()
+    # "đ"/"Đ" have no decomposition in Unicode
+    table[ord("đ")] = table[ord("Đ")] = "d"
+    return table
+
+
+_FOLD_TABLE = _build_fold_table()
+
+
+def fold(text: str) -> str:
+    """Lower-case and strip Vietnamese diacritics: "Phở Bò" → "pho bo"."""
+    return text.lower().translate(_FOLD_TABLE)
+
+
+def tokenize(text: str) -> list[str]:
+    """Folded alphanumeric tokens (Vietnamese syllables) of `text`."""
+    return _TOKEN_RE.findall(fold(text))
+
+
+def syllables(text: str) -> list[str]:
+    """Lower-cased NFC syllables of `text` with diacritics kept: "Cá Kho" → ["cá", "kho"]."""
+    return _SYLLABLE_RE.findall(unicodedata.normalize("NFC", text).lower())
+
+
+def has_diacritics(syllable: str) -> bool:
+    """Whether a lower-cased syllable carries Vietnamese diacritics ("cá" yes, "ca" no)."""
+    return syllable.translate(_FOLD_TABLE) != syllable
+
+
+def syllable_ngrams(tokens: list[str], max_n: int = 2) -> list[str]:
+    """Adjacent-syllable n-grams (2..max_n) joined without a separator: ["ca", "chua"] → ["cachua"]."""
+    grams: list[str] = []
+    for n in range(2, max_n + 1):
+        grams.extend("".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
+    return grams
+
+
+def analyze(text: str, max_n: int = 2) -> list[str]:
+    """Index terms of `text`: syllables followed by their syllable n-grams."""
+    tokens = tokenize(text)
+    return tokens + syllable_ngrams(tokens, max_n)
+
+
+@lru_cache(maxsize=4096)
+def query_terms(query: str, max_n: int = 2) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """(unique syllables, unique syllable n-grams) of a query — cached, queries repeat."""
+    tokens = tokenize(query)
+    return tuple(dict.fromkeys(tokens)), tuple(dict.fromkeys(syllable_ngrams(tokens, max_n)))
+
+
+def search_text(*fields: str | None) -> str:
+    """
+    Space-padded index terms of `fields` (" pho bo phobo "), for LIKE filters that
+    match word prefixes diacritic-insensitively: LIKE '% pho%', LIKE '% phobo%'.
+    """
+    tokens = [token for value in fields if value for token in analyze(value)]
+    return f" {' '.join(tokens)} " if tokens else ""
+
+
+def matches(query: str, text: str) -> bool:
+    """Whether `query` has syllables and each is a prefix of some syllable of `text`."""
+    tokens = query_terms(query)[0]
+    words = tokenize(text)
+    return bool(tokens) and all(any(word.startswith(token) for word in words) for token in tokens)
@@ -0,0 +1,80 @@
+"""Recall/latency benchmark: IVF and quantized indexes vs the exact scan.
+
+Usage:
+  python scripts/benchmark_vector_index.py --n 100000 --queries 200 --nprobe 4 8 16 32
+  python scripts/benchmark_vector_index.py --quantization int8 --rerank-factor 4
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.rag.vector_index import ExactIndex, IVFIndex
+
+
+def synthetic_corpus(n: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    """Clustered unit vectors — closer to real recipe embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    points = centers[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+
+def timed_search(index, queries: np.ndarray, k: int) -> tuple[list[np.ndarray], float]:
+    results = []
+    t0 = time.perf_counter()
+    for q in queries:
+        rows, _ = index.search(q, k)
+        results.append(rows)
+    return results, (time.perf_counter() - t0) * 1000 / len(queries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=0, help="0 = sqrt(N)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--quantization", nargs="*", default=[], choices=["int8"])
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"corpus: n={args.n} dim={args.dim} queries={args.queries} k={args.k}")
+    corpus = synthetic_corpus(args.n, args.dim, clusters=max(8, args.n // 500), seed=args.seed)
+    queries = synthetic_corpus(args.queries, args.dim, clusters=max(8, args.n // 500), seed=args.seed)
+
+    exact = ExactIndex(corpus)
+    truth, exact_ms = timed_search(exact, queries, args.k)
+    print(f"{'exact':>16}  recall@{args.k}=1.000  latency={exact_ms:.3f}ms/query")
+
+    def report(label: str, index) -> None:
+        found, ms = timed_search(index, queries, args.k)
+        recall = np.mean([len(np.intersect1d(f, t)) / len(t) for f, t in zip(found, truth)])
+        print(
+            f"{label:>16}  recall@{args.k}={recall:.3f}  "
+            f"latency={ms:.3f}ms/query  speedup={exact_ms / ms:.1f}x"
+        )
+
+    for mode in args.quantization:
+        quantized = ExactIndex(corpus, quantization=mode, rerank_factor=args.rerank_factor)
+        print(f"{mode}: {quantized.stats()}  float32={corpus.nbytes / 2**20:.1f}MB")
+        report(f"exact+{mode}", quantized)
+
+    t0 = time.perf_counter()
+    ivf = IVFIndex(corpus, nlist=args.nlist, seed=args.seed)
+    print(f"ivf build: {time.perf_counter() - t0:.2f}s  {ivf.stats()}")
+
+    for nprobe in args.nprobe:
+        ivf.nprobe = nprobe
+        report(f"ivf/{nprobe}", ivf)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
+from app.core.database import async_engine, async_session_maker
 from app.services.recipe import recipe_indexer
 from loguru import logger
 
@@ -16,18 +14,8 @@ async def reindex_all():
     """Reindex all recipes."""
     logger.info("Starting recipe reindexing...")
 
-    # Create async engine
-    async_database_url = settings.database_url.replace(
-        "postgresql://", "postgresql+asyncpg://"
-    )
-    engine = create_async_engine(async_database_url, echo=False)
-
-    # Create session
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-
-    async with async_session() as session:
+    # Same engine/URL handling as the app (SQLite or PostgreSQL)
+    async with async_session_maker() as session:
         try:
             results = await recipe_indexer.reindex_all_recipes(session)
 
@@ -40,7 +28,7 @@ async def reindex_all():
             logger.error(f"Error during reindexing: {e}")
             raise
         finally:
-            await engine.dispose()
+            await async_engine.dispose()
 
 
 if __name__ == "__main__":
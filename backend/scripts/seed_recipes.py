@@ -6,15 +6,16 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
-from app.models.recipe import Recipe, Ingredient
+from app.core.database import async_engine, async_session_maker, create_db_and_tables
+import app.models  # noqa: F401 — register every table before create_all
+from app.models.recipe import Recipe, Ingredient, RecipeIngredient
 from app.services.recipe import recipe_indexer
 from loguru import logger
+from sqlmodel import select
 
 
-# Sample Vietnamese recipes
+# Sample Vietnamese recipes; "ingredients" are (name, name_vi, quantity, unit) and
+# become Ingredient + RecipeIngredient rows, which ingredient search ranks on
 SAMPLE_RECIPES = [
     {
         "title": "Phở Bò (Vietnamese Beef Noodle Soup)",
@@ -27,6 +28,15 @@ SAMPLE_RECIPES = [
         "category": "lunch",
         "tags": "soup,beef,noodles,traditional",
         "is_public": True,
+        "ingredients": [
+            ("rice noodles", "bánh phở", 400, "g"),
+            ("beef", "thịt bò", 500, "g"),
+            ("beef bones", "xương bò", 1000, "g"),
+            ("onion", "hành tây", 1, "piece"),
+            ("ginger", "gừng", 50, "g"),
+            ("star anise", "hoa hồi", 3, "piece"),
+            ("fish sauce", "nước mắm", 3, "tbsp"),
+        ],
     },
     {
         "title": "Bánh Mì Thịt (Vietnamese Sandwich)",
@@ -39,6 +49,15 @@ SAMPLE_RECIPES = [
         "category": "breakfast",
         "tags": "sandwich,pork,quick,street-food",
         "is_public": True,
+        "ingredients": [
+            ("baguette", "bánh mì", 2, "piece"),
+            ("pork", "thịt heo", 200, "g"),
+            ("pate", "pate", 50, "g"),
+            ("carrot", "cà rốt", 1, "piece"),
+            ("daikon", "củ cải trắng", 100, "g"),
+            ("cilantro", "rau mùi", 1, "bunch"),
+            ("cucumber", "dưa leo", 1, "piece"),
+        ],
     },
     {
         "title": "Gỏi Cuốn (Fresh Spring Rolls)",
@@ -51,6 +70,14 @@ SAMPLE_RECIPES = [
         "category": "appetizer",
         "tags": "healthy,no-cook,vegetarian-option,fresh",
         "is_public": True,
+        "ingredients": [
+            ("rice paper", "bánh tráng", 12, "piece"),
+            ("shrimp", "tôm", 300, "g"),
+            ("rice vermicelli", "bún", 200, "g"),
+            ("lettuce", "xà lách", 1, "head"),
+            ("mint", "rau thơm", 1, "bunch"),
+            ("peanut", "đậu phộng", 50, "g"),
+        ],
     },
     {
         "title": "Bún Chả (Grilled Pork with Noodles)",
@@ -63,6 +90,15 @@ SAMPLE_RECIPES = [
         "category": "lunch",
         "tags": "pork,grilled,noodles,hanoi",
         "is_public": True,
+        "ingredients": [
+            ("pork", "thịt heo", 500, "g"),
+            ("rice vermicelli", "bún", 400, "g"),
+            ("fish sauce", "nước mắm", 4, "tbsp"),
+            ("garlic", "tỏi", 4, "clove"),
+            ("shallot", "hành tím", 3, "piece"),
+            ("sugar", "đường", 2, "tbsp"),
+            ("lettuce", "xà lách", 1, "head"),
+        ],
     },
     {
         "title": "Cơm Tấm (Broken Rice with Grilled Pork)",
@@ -75,6 +111,14 @@ SAMPLE_RECIPES = [
         "category": "dinner",
         "tags": "rice,pork,grilled,southern",
         "is_public": True,
+        "ingredients": [
+            ("broken rice", "gạo tấm", 300, "g"),
+            ("pork chop", "sườn heo", 2, "piece"),
+            ("fish sauce", "nước mắm", 3, "tbsp"),
+            ("garlic", "tỏi", 3, "clove"),
+            ("egg", "trứng gà", 2, "piece"),
+            ("cucumber", "dưa leo", 1, "piece"),
+        ],
     },
     {
         "title": "Canh Chua (Vietnamese Sour Soup)",
@@ -87,6 +131,14 @@ SAMPLE_RECIPES = [
         "category": "soup",
         "tags": "soup,fish,healthy,sour",
         "is_public": True,
+        "ingredients": [
+            ("fish", "cá", 500, "g"),
+            ("pineapple", "thơm", 200, "g"),
+            ("tomato", "cà chua", 2, "piece"),
+            ("bean sprouts", "giá đỗ", 100, "g"),
+            ("tamarind", "me", 30, "g"),
+            ("fish sauce", "nước mắm", 2, "tbsp"),
+        ],
     },
     {
         "title": "Chả Giò (Vietnamese Fried Spring Rolls)",
@@ -99,6 +151,14 @@ SAMPLE_RECIPES = [
         "category": "appetizer",
         "tags": "fried,pork,crispy,party-food",
         "is_public": True,
+        "ingredients": [
+            ("rice paper", "bánh tráng", 20, "piece"),
+            ("ground pork", "thịt heo xay", 400, "g"),
+            ("glass noodles", "miến", 50, "g"),
+            ("carrot", "cà rốt", 1, "piece"),
+            ("wood ear mushroom", "nấm mèo", 20, "g"),
+            ("egg", "trứng gà", 1, "piece"),
+        ],
     },
     {
         "title": "Cà Ri Gà (Vietnamese Chicken Curry)",
@@ -111,6 +171,14 @@ SAMPLE_RECIPES = [
         "category": "dinner",
         "tags": "curry,chicken,coconut,comfort-food",
         "is_public": True,
+        "ingredients": [
+            ("chicken", "thịt gà", 800, "g"),
+            ("potato", "khoai tây", 2, "piece"),
+            ("carrot", "cà rốt", 2, "piece"),
+            ("coconut milk", "nước cốt dừa", 400, "ml"),
+            ("curry powder", "bột cà ri", 2, "tbsp"),
+            ("lemongrass", "sả", 2, "stalk"),
+        ],
     },
     {
         "title": "Xôi Gà (Sticky Rice with Chicken)",
@@ -123,6 +191,13 @@ SAMPLE_RECIPES = [
         "category": "breakfast",
         "tags": "rice,chicken,sticky-rice,hearty",
         "is_public": True,
+        "ingredients": [
+            ("sticky rice", "gạo nếp", 500, "g"),
+            ("chicken", "thịt gà", 300, "g"),
+            ("shallot", "hành tím", 5, "piece"),
+            ("green onion", "hành lá", 1, "bunch"),
+            ("fish sauce", "nước mắm", 1, "tbsp"),
+        ],
     },
     {
         "title": "Mì Quảng (Quang Style Noodles)",
@@ -135,31 +210,47 @@ SAMPLE_RECIPES = [
         "category": "lunch",
         "tags": "noodles,shrimp,pork,central",
         "is_public": True,
+        "ingredients": [
+            ("turmeric noodles", "mì quảng", 400, "g"),
+            ("shrimp", "tôm", 200, "g"),
+            ("pork", "thịt heo", 200, "g"),
+            ("peanut", "đậu phộng", 50, "g"),
+            ("turmeric", "nghệ", 10, "g"),
+            ("rice crackers", "bánh tráng nướng", 2, "piece"),
+        ],
     },
 ]
 
 
+async def _get_or_create_ingredient(
+    session, cache: dict[str, Ingredient], name: str, name_vi: str
+) -> Ingredient:
+    """Ingredient named `name`, reusing rows from earlier runs (name is unique)."""
+    if name not in cache:
+        result = await session.execute(select(Ingredient).where(Ingredient.name == name))
+        ingredient = result.scalar_one_or_none()
+        if ingredient is None:
+            ingredient = Ingredient(name=name, name_vi=name_vi)
+            session.add(ingredient)
+        cache[name] = ingredient
+    return cache[name]
+
+
 async def seed_recipes():
     """Seed database with sample recipes."""
     logger.info("Starting recipe seeding...")
 
-    # Create async engine
-    async_database_url = settings.database_url.replace(
-        "postgresql://", "postgresql+asyncpg://"
-    )
-    engine = create_async_engine(async_database_url, echo=False)
+    # Same engine/URL handling as the app (SQLite or PostgreSQL); make sure tables exist
+    create_db_and_tables()
 
-    # Create session
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-
-    async with async_session() as session:
+    async with async_session_maker() as session:
         try:
             # Create recipes
             recipes_created = []
+            ingredients_by_name: dict[str, Ingredient] = {}
 
-            for recipe_data in SAMPLE_RECIPES:
+            for sample in SAMPLE_RECIPES:
+                recipe_data = {k: v for k, v in sample.items() if k != "ingredients"}
                 # Calculate total time
                 total_time = recipe_data["prep_time"] + recipe_data["cook_time"]
 
@@ -171,6 +262,16 @@ async def seed_recipes():
                 session.add(recipe)
                 recipes_created.append(recipe)
 
+                for name, name_vi, quantity, unit in sample["ingredients"]:
+                    ingredient = await _get_or_create_ingredient(
+                        session, ingredients_by_name, name, name_vi
+                    )
+                    session.add(
+                        RecipeIngredient(
+                            recipe=recipe, ingredient=ingredient, quantity=quantity, unit=unit
+                        )
+                    )
+
             await session.commit()
             logger.info(f"Created {len(recipes_created)} recipes")
 
@@ -192,7 +293,7 @@ async def seed_recipes():
             await session.rollback()
             raise
         finally:
-            await engine.dispose()
+            await async_engine.dispose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+"""
+Shared fixtures. The environment is pinned before `app` is imported so the suite runs
+offline: the deterministic local embedding backend, a placeholder Gemini key (app.services.llm
+builds its provider at import; nothing here calls it), a throwaway SQLite database and a
+Redis URL nothing listens on (CacheService degrades to misses).
+"""
+import hashlib
+import os
+import tempfile
+
+os.environ["EMBEDDING_BACKEND"] = "local"
+os.environ["GEMINI_API_KEY"] = "test-key"
+os.environ["GEMINI_API_KEYS"] = ""
+os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/chefgpt-test.db"
+os.environ["DEBUG"] = "false"
+
+import time  # noqa: E402
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+
+class FakeCache:
+    """In-memory stand-in for CacheService (same async surface, TTLs honoured)."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[object, float]] = {}
+
+    def _live(self, key: str):
+        entry = self.data.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            self.data.pop(key, None)
+            return None
+        return entry[0]
+
+    async def get(self, key: str):
+        return self._live(key)
+
+    async def set(self, key: str, value, ttl: int) -> None:
+        self.data[key] = (value, time.monotonic() + ttl)
+
+    async def set_nx(self, key: str, value: str, ttl: int) -> bool:
+        if self._live(key) is not None:
+            return False
+        self.data[key] = (value, time.monotonic() + ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    async def exists(self, key: str) -> bool:
+        return self._live(key) is not None
+
+
+class FakeEmbedder:
+    """EmbeddingService stand-in: a fixed unit vector per distinct text, calls counted."""
+
+    model = "fake-embed-8"
+    dim = 8
+
+    def __init__(self, available: bool = True) -> None:
+        self.available = available
+        self.calls: list[str] = []
+
+    async def generate_embedding(self, text: str) -> list[float]:
+        self.calls.append(text)
+        return vector_for(text).tolist()
+
+
+def vector_for(text: str, dim: int = 8) -> np.ndarray:
+    """Deterministic unit vector for `text` (distinct texts are far apart), stable across runs."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    rng = np.random.default_rng(seed)
+    vector = rng.standard_normal(dim).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.fixture
+def fake_cache() -> FakeCache:
+    return FakeCache()
+
+
+@pytest.fixture
+def fake_embedder() -> FakeEmbedder:
+    return FakeEmbedder()
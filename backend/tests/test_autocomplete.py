@@ -0,0 +1,45 @@
+"""AutocompleteIndex ranking: one usage-count scale across titles, tags and ingredients."""
+import pytest
+
+from app.rag.autocomplete import AutocompleteIndex
+
+_RECIPES = [
+    {"id": 1, "title": "Bò Lúc Lắc", "tags": ["bò"], "ingredients": ["thịt bò", "bơ"]},
+    {"id": 2, "title": "Phở Bò", "tags": ["bò", "phở"], "ingredients": ["thịt bò", "bánh phở"]},
+    {"id": 3, "title": "Bún Bò Huế", "tags": ["bò", "cay"], "ingredients": ["thịt bò bắp", "bột ớt"]},
+]
+
+
+@pytest.fixture
+def index() -> AutocompleteIndex:
+    return AutocompleteIndex(_RECIPES)
+
+
+def texts(index: AutocompleteIndex, prefix: str, limit: int = 8) -> list[str]:
+    return [s["text"] for s in index.complete(prefix, limit)]
+
+
+def test_widely_used_terms_outrank_single_titles(index):
+    results = texts(index, "bo")
+
+    assert results[0] == "bò"  # tag on 3 recipes
+    assert results.index("Bò Lúc Lắc") > results.index("bò")
+
+
+def test_titles_outrank_terms_used_once(index):
+    results = texts(index, "b")
+
+    assert results.index("Bún Bò Huế") < results.index("bánh phở")
+    assert results.index("Phở Bò") < results.index("bột ớt")
+
+
+def test_precomputed_prefix_matches_range_scan(index):
+    precomputed = texts(index, "bo", limit=20)
+    scanned = texts(index, "bo", limit=25)  # above the precomputed list length
+
+    assert scanned[: len(precomputed)] == precomputed
+
+
+def test_suggestion_shape(index):
+    assert index.complete("lac", 1) == [{"text": "Bò Lúc Lắc", "kind": "recipe", "recipe_id": 1}]
+    assert index.complete("!!!") == []
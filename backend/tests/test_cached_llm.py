@@ -0,0 +1,120 @@
+"""CachedLLM: exact Redis tier, semantic tier, single-flight in front of the provider."""
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.rag import semantic_cache as semantic_module
+from app.rag.query_cache import QueryEmbeddingCache
+from app.rag.semantic_cache import SemanticResponseCache
+from app.services.llm.base_llm import BaseLLM
+from app.services.llm.cached_llm import CachedLLM
+
+
+class CountingLLM(BaseLLM):
+    """Provider stub that counts suggest_recipes / generate_meal_plan calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def suggest_recipes(self, ingredients, filters=None) -> dict:
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        return {"dishes": [f"call {self.calls}"]}
+
+    async def recognize_ingredients(self, image_bytes: bytes) -> dict:
+        return {}
+
+    async def generate_meal_plan(self, goal: str, days: int, calories_target: int) -> dict:
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        return {"plan": [goal] * days}
+
+    async def chat(self, message: str, history=None) -> str:
+        return message
+
+
+@pytest.fixture
+def semantic(monkeypatch, fake_embedder, fake_cache) -> SemanticResponseCache:
+    cache = SemanticResponseCache(QueryEmbeddingCache(fake_embedder, fake_cache))
+    monkeypatch.setattr(semantic_module, "semantic_cache", cache)
+    monkeypatch.setattr(settings, "semantic_cache_enabled", True)
+    monkeypatch.setattr(settings, "single_flight_redis_lock", False)
+    return cache
+
+
+async def settle(llm: CachedLLM) -> None:
+    """Wait for background semantic-cache stores."""
+    if llm._background:
+        await asyncio.gather(*llm._background)
+
+
+async def test_exact_key_hit_skips_provider(semantic, fake_cache):
+    provider = CountingLLM()
+    llm = CachedLLM(provider, fake_cache)
+
+    first = await llm.suggest_recipes(["trứng", "cà chua"])
+    second = await llm.suggest_recipes(["cà chua", "trứng"])
+
+    assert first == second
+    assert provider.calls == 1
+
+
+async def test_semantic_tier_answers_equivalent_request(semantic, fake_cache):
+    provider = CountingLLM()
+    llm = CachedLLM(provider, fake_cache)
+
+    first = await llm.suggest_recipes(["trứng", "cà chua"], ["chay"])
+    await settle(llm)
+    second = await llm.suggest_recipes(["Trứng gà", "cà chua"], ["chay"])
+
+    assert second == first
+    assert provider.calls == 1
+    assert semantic.stats()["hits"] == 1
+
+
+async def test_semantic_tier_disabled_without_embeddings(semantic, fake_cache, fake_embedder):
+    fake_embedder.available = False
+    provider = CountingLLM()
+    llm = CachedLLM(provider, fake_cache)
+
+    await llm.suggest_recipes(["trứng", "cà chua"])
+    await settle(llm)
+    await llm.suggest_recipes(["Trứng gà", "cà chua"])
+
+    assert provider.calls == 2
+    assert fake_embedder.calls == []
+    assert semantic.stats()["hits"] + semantic.stats()["misses"] == 0
+
+
+async def test_concurrent_misses_share_one_provider_call(semantic, fake_cache):
+    provider = CountingLLM()
+    llm = CachedLLM(provider, fake_cache)
+
+    results = await asyncio.gather(
+        *(llm.generate_meal_plan("giảm cân", 3, 1800) for _ in range(4))
+    )
+
+    assert provider.calls == 1
+    assert all(r == results[0] for r in results)
+
+
+async def test_semantic_store_runs_off_the_response_path(semantic, fake_cache, monkeypatch):
+    stored = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_store(*args) -> None:
+        stored.set()
+        await release.wait()
+
+    monkeypatch.setattr(semantic, "store", slow_store)
+    llm = CachedLLM(CountingLLM(), fake_cache)
+
+    result = await asyncio.wait_for(llm.suggest_recipes(["trứng"]), timeout=1)
+    await stored.wait()
+
+    assert result == {"dishes": ["call 1"]}
+    assert len(llm._background) == 1
+    release.set()
+    await settle(llm)
+    assert not llm._background
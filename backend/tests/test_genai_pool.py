@@ -0,0 +1,82 @@
+"""GenaiClientPool: one client per key and event loop, replaced clients closed."""
+import asyncio
+import threading
+
+import pytest
+
+from app.services import genai_pool as pool_module
+from app.services.genai_pool import GenaiClientPool
+
+
+class FakeAio:
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class FakeClient:
+    def __init__(self, api_key: str, http_options=None) -> None:
+        self.api_key = api_key
+        self.aio = FakeAio()
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def pool(monkeypatch) -> GenaiClientPool:
+    monkeypatch.setattr(pool_module.genai, "Client", FakeClient)
+    return GenaiClientPool()
+
+
+def test_client_is_reused_outside_a_loop(pool):
+    assert pool.get("key-a") is pool.get("key-a")
+    assert pool.get("key-a") is not pool.get("key-b")
+    assert pool.stats()["created"] == 2
+
+
+def test_new_event_loop_replaces_and_closes_the_old_client(pool):
+    async def get():
+        return pool.get("key-a")
+
+    first = asyncio.run(get())
+    second = asyncio.run(get())
+
+    assert second is not first
+    assert first.closed  # sync side closed; its loop is gone, so are its async sockets
+    assert not second.closed
+    assert pool.stats() == {"clients": 1, "created": 2, "http2": pool_module._HTTP2}
+
+
+def test_replaced_client_on_a_live_loop_is_closed_there(pool):
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever)
+    thread.start()
+    try:
+        first = pool.get("key-a")
+        pool._clients["key-a"] = (first, other)  # as if created by a task on `other`
+
+        async def get():
+            return pool.get("key-a")
+
+        second = asyncio.run(get())
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), other).result()  # let aclose run
+
+        assert second is not first
+        assert first.closed and first.aio.closed
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join()
+        other.close()
+
+
+async def test_aclose_closes_every_client(pool):
+    a, b = pool.get("key-a"), pool.get("key-b")
+
+    await pool.aclose()
+
+    assert a.closed and a.aio.closed and b.closed and b.aio.closed
+    assert pool.stats()["clients"] == 0
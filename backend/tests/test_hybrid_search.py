@@ -0,0 +1,53 @@
+"""Hybrid (RRF) search reports what actually ranked the results."""
+import json
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.models.recipe import Recipe
+from app.services import rag
+from app.services.rag import RecipeRAGService
+from app.services.recipe.recipe_retriever import RecipeRetriever
+
+_SHIPPED = json.loads((Path(rag.__file__).parent.parent / "mocks" / "recipes.json").read_text("utf-8"))
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch) -> RecipeRAGService:
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(_SHIPPED, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(rag, "_RECIPES_PATH", path)
+    monkeypatch.setattr(rag, "_EMBED_CACHE_PATH", tmp_path / "recipe_embeddings.bin")
+    monkeypatch.setattr(settings, "rag_shared_index", False)
+    service = RecipeRAGService()
+    service.load_corpus()
+    return service
+
+
+async def test_without_vector_index_reports_keyword_with_bm25_scores(service):
+    results = await service.hybrid_search("canh chua", k=3)
+    bm25 = service.bm25_search("canh chua", k=3)
+
+    assert results
+    assert {r["match_type"] for r in results} == {"keyword"}
+    assert [(r["id"], r["score"]) for r in results] == [(r["id"], r["score"]) for r in bm25]
+
+
+async def test_with_vector_index_reports_hybrid(service):
+    await service.initialize()
+
+    results = await service.hybrid_search("canh chua", k=3)
+
+    assert service.ready
+    assert {r["match_type"] for r in results} == {"hybrid"}
+    assert all(r["score"] <= round(2 / (rag._RRF_K + 1), 4) for r in results)  # RRF, not cosine
+
+
+def test_explain_match_skips_similarity_wording_without_cosine():
+    recipe = Recipe(id=1, title="Canh Chua Cá", description="", cuisine="vietnamese")
+    retriever = RecipeRetriever()
+
+    assert retriever._explain_match("bún", recipe, None) == "keyword and semantic ranking"
+    assert retriever._explain_match("bún", recipe, 0.95) == "very high similarity"
+    assert retriever._explain_match("canh chua", recipe, None) == "matches recipe title"
@@ -0,0 +1,73 @@
+"""Pantry matching (app/rag/ingredient_index.py): protein head nouns, tones, synonyms."""
+import json
+from pathlib import Path
+
+import pytest
+
+from app.rag.ingredient_index import IngredientIndex, canonical_name, ingredient_keys, match_ingredients
+
+_RECIPES = json.loads(
+    (Path(__file__).parent.parent / "app" / "mocks" / "recipes.json").read_text("utf-8")
+)
+
+
+@pytest.fixture(scope="module")
+def index() -> IngredientIndex:
+    return IngredientIndex(_RECIPES)
+
+
+def pantry_titles(index: IngredientIndex, pantry: list[str]) -> list[str]:
+    return [_RECIPES[m.row]["title"] for m in index.rank(pantry, k=len(_RECIPES))]
+
+
+def test_fish_pantry_finds_fish_dishes(index):
+    titles = pantry_titles(index, ["cá"])
+
+    assert set(titles) == {"Cá Kho Tộ", "Canh Chua Cá"}
+
+
+def test_beef_pantry_finds_beef_not_butter(index):
+    beef = pantry_titles(index, ["bò"])
+    butter = pantry_titles(index, ["bơ"])
+
+    assert {"Phở Bò", "Bò Lúc Lắc", "Bún Bò Huế"} <= set(beef)
+    assert "Súp Bí Đỏ Kem" not in beef
+    assert "Súp Bí Đỏ Kem" in butter
+    assert pantry_titles(index, ["beef"]) == beef
+
+
+def test_chicken_pantry_ranks_chicken_dishes(index):
+    titles = pantry_titles(index, ["gà"])
+
+    assert "Trứng Chiên Cà Chua" not in titles  # "trứng gà" is egg
+    assert all("Gà" in title for title in titles)
+    assert pantry_titles(index, ["thịt gà"]) == titles
+
+
+@pytest.mark.parametrize(
+    ("name", "canonical"),
+    [("thịt gà", "ga"), ("thịt bò", "bo"), ("Thịt heo", "heo"), ("thịt lợn", "heo"),
+     ("trứng gà", "trung"), ("bơ", "bơ"), ("cà", "cà"), ("tomato", "ca chua")],
+)
+def test_canonical_name(name, canonical):
+    assert canonical_name(name) == canonical
+
+
+@pytest.mark.parametrize("name", ["trứng gà", "mì trứng", "bún bò Huế", "nước dùng gà", "xương bò"])
+def test_modifier_proteins_add_no_key(name):
+    assert not ingredient_keys(name) & {"ga", "bo"}
+
+
+def test_cut_and_head_add_protein_key():
+    assert "ga" in ingredient_keys("ức gà")
+    assert "bo" in ingredient_keys("thịt bò bắp")
+    assert "ca" in ingredient_keys("cá lóc")
+    assert "heo" in ingredient_keys("sườn heo")
+
+
+def test_staples_are_not_missing():
+    result = match_ingredients(["cá"], ["cá lóc", "nước mắm", "cà chua"])
+
+    assert result.matched == ["cá lóc"]
+    assert result.missing == ["cà chua"]
+    assert result.coverage == 0.5
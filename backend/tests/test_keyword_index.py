@@ -0,0 +1,85 @@
+"""KeywordIndex.search over the shipped corpus: diacritic precision, prefix, ranking."""
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.rag.keyword_index import KeywordIndex
+
+_RECIPES = json.loads(
+    (Path(__file__).parent.parent / "app" / "mocks" / "recipes.json").read_text("utf-8")
+)
+_DOCS = {r["title"]: KeywordIndex.document_text(r).lower() for r in _RECIPES}
+
+
+@pytest.fixture(scope="module")
+def index() -> KeywordIndex:
+    return KeywordIndex(_RECIPES)
+
+
+def titles(index: KeywordIndex, query: str, mask=None) -> list[str]:
+    return [_RECIPES[row]["title"] for row in index.search(query, mask)]
+
+
+def substring_hits(query: str) -> set[str]:
+    """Titles the original lower-case substring scan matched."""
+    return {title for title, doc in _DOCS.items() if query in doc}
+
+
+@pytest.mark.parametrize("query", ["cá", "bò", "mì", "gà", "trứng"])
+def test_accented_syllable_matches_as_written(index, query):
+    assert set(titles(index, query)) == substring_hits(query)
+
+
+def test_tone_distinguishes_ingredients(index):
+    fish = titles(index, "cá")
+    beef = titles(index, "bò")
+
+    assert "Cá Kho Tộ" in fish
+    assert not any("Cà Chua" in t for t in fish)
+    assert all("Bơ" not in t for t in beef)
+
+
+def test_unaccented_query_folds(index):
+    assert titles(index, "pho bo") == ["Phở Bò"]
+    assert "Bún Bò Huế" in titles(index, "bun bo")
+
+
+def test_only_last_syllable_is_prefix_expanded(index):
+    assert "Phở Bò" in titles(index, "ph")
+    assert titles(index, "ph bo") == []  # "ph" is not the syllable being typed
+
+
+def test_last_syllable_matches_ngrams(index):
+    assert "Trứng Chiên Cà Chua" in titles(index, "cachua")
+
+
+def test_exact_term_ranks_above_prefix(index):
+    results = titles(index, "pho")
+
+    assert results[0] == "Phở Bò"
+
+
+def test_phrase_ranks_above_scattered_syllables(index):
+    results = titles(index, "cà chua")
+    phrase = [t for t in results if "cà chua" in _DOCS[t]]
+
+    assert results[: len(phrase)] == phrase
+
+
+def test_mistyped_tone_falls_back_to_folded(index):
+    assert titles(index, "phỏ") == ["Phở Bò"]
+
+
+@pytest.mark.parametrize("query", ["!!!", "   ...", "—"])
+def test_query_without_terms_matches_nothing(index, query):
+    assert index.search(query) == []
+
+
+def test_empty_query_browses_mask(index):
+    mask = np.zeros(len(_RECIPES), dtype=bool)
+    mask[[1, 4]] = True
+
+    assert index.search("", mask) == [1, 4]
+    assert len(index.search("")) == len(_RECIPES)
@@ -0,0 +1,45 @@
+"""QueryEmbeddingCache: in-process LRU → Redis → embedding API."""
+import numpy as np
+
+from app.rag.query_cache import QueryEmbeddingCache
+
+
+async def test_repeat_query_is_served_from_memory(fake_embedder, fake_cache):
+    cache = QueryEmbeddingCache(fake_embedder, fake_cache)
+
+    first = await cache.get("canh chua cá")
+    second = await cache.get("  Canh   CHUA cá ")
+
+    assert np.array_equal(first, second)
+    assert fake_embedder.calls == ["canh chua cá"]
+    assert cache.stats()["hits_memory"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+async def test_redis_tier_is_shared_between_workers(fake_embedder, fake_cache):
+    await QueryEmbeddingCache(fake_embedder, fake_cache).get("phở bò")
+    other_worker = QueryEmbeddingCache(fake_embedder, fake_cache)
+
+    vector = await other_worker.get("phở bò")
+
+    assert vector.dtype == np.float32
+    assert len(fake_embedder.calls) == 1
+    assert other_worker.stats()["hits_redis"] == 1
+
+
+async def test_lru_evicts_least_recently_used(fake_embedder, fake_cache):
+    cache = QueryEmbeddingCache(fake_embedder, fake_cache, max_size=2)
+    for query in ("a", "b", "a", "c"):
+        await cache.get(query)
+    fake_cache.data.clear()  # force anything not in memory back to the API
+
+    await cache.get("a")
+    await cache.get("b")
+
+    assert fake_embedder.calls == ["a", "b", "c", "b"]
+
+
+async def test_cached_vectors_are_read_only(fake_embedder, fake_cache):
+    vector = await QueryEmbeddingCache(fake_embedder, fake_cache).get("xôi gà")
+
+    assert not vector.flags.writeable
@@ -0,0 +1,77 @@
+"""RecipeRAGService index build: per-row reuse from the store, degraded builds without a key."""
+import json
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.rag import store
+from app.services import rag
+from app.services.rag import RecipeRAGService
+
+_SHIPPED = json.loads((Path(rag.__file__).parent.parent / "mocks" / "recipes.json").read_text("utf-8"))
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch) -> Path:
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(_SHIPPED[:4], ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(rag, "_RECIPES_PATH", path)
+    monkeypatch.setattr(rag, "_EMBED_CACHE_PATH", tmp_path / "recipe_embeddings.bin")
+    monkeypatch.setattr(settings, "rag_shared_index", False)
+    return path
+
+
+def remove_api_key(monkeypatch) -> None:
+    backend = type(rag.embedding_service._backend)
+    monkeypatch.setattr(backend, "available", property(lambda self: False))
+
+
+async def build(corpus: Path, recipes: list[dict]) -> RecipeRAGService:
+    corpus.write_text(json.dumps(recipes, ensure_ascii=False), encoding="utf-8")
+    service = RecipeRAGService()
+    await service.initialize()
+    return service
+
+
+async def test_rebuild_embeds_only_edited_rows(corpus):
+    await build(corpus, _SHIPPED[:4])
+    edited = [dict(_SHIPPED[0], title="Phở Bò Tái Nạm")] + _SHIPPED[1:4]
+
+    service = await build(corpus, edited)
+
+    assert service.build_progress()["to_embed"] == 1
+    assert service.ready
+
+
+async def test_unchanged_corpus_maps_the_store(corpus):
+    await build(corpus, _SHIPPED[:4])
+
+    service = await build(corpus, _SHIPPED[:4])
+
+    assert service.build_progress()["to_embed"] == 0
+    assert service.build_progress()["status"] == "ready"
+
+
+async def test_missing_key_reuses_cached_rows(corpus, monkeypatch):
+    await build(corpus, _SHIPPED[:3])
+    remove_api_key(monkeypatch)
+
+    service = await build(corpus, _SHIPPED[:4])
+
+    progress = service.build_progress()
+    assert service.ready
+    assert progress["status"] == "degraded"
+    assert "1 recipes not embedded" in progress["detail"]
+    _, _, keys = store.open_store(rag._EMBED_CACHE_PATH)
+    assert keys[3] == store.MISSING_ROW_KEY
+    assert keys[:3] == [store.row_key(RecipeRAGService._recipe_to_text(r)) for r in _SHIPPED[:3]]
+
+
+async def test_missing_key_without_store_is_keyword_only(corpus, monkeypatch):
+    remove_api_key(monkeypatch)
+    service = await build(corpus, _SHIPPED[:4])
+
+    assert not service.ready
+    assert service.build_progress()["status"] == "keyword_only"
+    assert service.keyword_search(_SHIPPED[0]["title"])
@@ -0,0 +1,133 @@
+"""RecipeRAGService hot reload: corpus validation, incremental re-embedding, the watcher."""
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.services import rag
+from app.services.rag import RecipeRAGService
+
+_SHIPPED = json.loads((Path(rag.__file__).parent.parent / "mocks" / "recipes.json").read_text("utf-8"))
+
+
+def write_corpus(path: Path, content) -> None:
+    """Write recipes.json and bump its mtime so the watcher always sees a change."""
+    text = content if isinstance(content, str) else json.dumps(content, ensure_ascii=False)
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+async def wait_until(condition, timeout: float = 5) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch) -> Path:
+    path = tmp_path / "recipes.json"
+    write_corpus(path, _SHIPPED[:3])
+    monkeypatch.setattr(rag, "_RECIPES_PATH", path)
+    monkeypatch.setattr(rag, "_EMBED_CACHE_PATH", tmp_path / "recipe_embeddings.bin")
+    monkeypatch.setattr(settings, "rag_shared_index", False)
+    return path
+
+
+@pytest.fixture
+async def service(corpus) -> RecipeRAGService:
+    service = RecipeRAGService()
+    await service.initialize()
+    yield service
+    await service.shutdown()
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        ({"id": 1}, "expected a list"),
+        ([{"id": 1}, "x"], "recipe #1"),
+        ([{"title": "no id"}], "recipe #0"),
+        ([{"id": 1}, {"id": 1}], "duplicate recipe id"),
+    ],
+)
+def test_read_corpus_rejects_malformed_files(corpus, content, message):
+    write_corpus(corpus, content)
+
+    with pytest.raises(ValueError, match=message):
+        RecipeRAGService._read_corpus()
+
+
+async def test_initialize_builds_semantic_index(service):
+    assert service.ready
+    assert service.recipe_count == 3
+    assert service.build_progress()["status"] == "ready"
+
+
+async def test_reload_embeds_only_changed_recipes(service, corpus):
+    version = service._snapshot.version
+    write_corpus(corpus, _SHIPPED[:4])
+
+    report = await service.reload()
+
+    assert report["added"] == 1
+    assert report["removed"] == 0
+    assert report["embedded"] == 1
+    assert report["semantic_ready"]
+    assert service._snapshot.version == version + 1
+    assert service.get_recipe(_SHIPPED[3]["id"]) == _SHIPPED[3]
+
+
+async def test_failed_reload_keeps_serving_previous_snapshot(service, corpus):
+    before = service._snapshot
+    write_corpus(corpus, '[{"id": 1, "title": "half-writ')
+
+    with pytest.raises(ValueError):
+        await service.reload()
+
+    assert service._snapshot is before
+    assert service.keyword_search(_SHIPPED[0]["title"])
+
+
+async def test_watcher_survives_bad_files_and_picks_up_fixes(service, corpus):
+    version = service._snapshot.version
+    watcher = asyncio.ensure_future(service._watch_corpus(0.01))
+    try:
+        write_corpus(corpus, "{not json")
+        await asyncio.sleep(0.1)
+        assert not watcher.done()
+        assert service._snapshot.version == version
+
+        write_corpus(corpus, _SHIPPED[:5])
+        await wait_until(lambda: service.recipe_count == 5)
+        assert service._snapshot.version == version + 1
+    finally:
+        watcher.cancel()
+
+
+async def test_watcher_survives_unexpected_errors(service, corpus, monkeypatch):
+    real_reload = service.reload
+    attempts = []
+
+    async def flaky_reload() -> dict:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("unexpected")
+        return await real_reload()
+
+    monkeypatch.setattr(service, "reload", flaky_reload)
+    watcher = asyncio.ensure_future(service._watch_corpus(0.01))
+    try:
+        write_corpus(corpus, _SHIPPED[:4])
+        await wait_until(lambda: attempts)
+        assert not watcher.done()
+
+        write_corpus(corpus, _SHIPPED[:5])
+        await wait_until(lambda: service.recipe_count == 5)
+    finally:
+        watcher.cancel()
@@ -0,0 +1,57 @@
+"""list_recipes search: folded word-prefix match on recipes.search_text, punctuation-only queries."""
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlmodel import SQLModel
+
+from app.models.recipe import Recipe
+from app.routers.recipes import list_recipes
+from app.utils.text import matches, search_text
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add_all([
+            Recipe(title="Phở Bò", description="", tags='["súp", "bò"]'),
+            Recipe(title="Cà Chua Nhồi Thịt", description=""),
+            Recipe(title="Cá Kho Tộ", description="", is_public=False),
+        ])
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+async def titles(session: AsyncSession, search: str | None) -> list[str]:
+    rows = await list_recipes(search=search, cuisine=None, skip=0, limit=20, session=session)
+    return [row.title for row in rows]
+
+
+async def test_search_is_diacritic_insensitive_word_prefix(session):
+    assert await titles(session, "pho bo") == ["Phở Bò"]
+    assert await titles(session, "PHỞ") == ["Phở Bò"]
+    assert await titles(session, "cachua") == ["Cà Chua Nhồi Thịt"]
+    assert await titles(session, "súp") == ["Phở Bò"]  # tags are indexed too
+    assert await titles(session, "ho") == []  # prefix of a word, not a substring
+
+
+@pytest.mark.parametrize("search", ["!!!", "...", "—"])
+async def test_punctuation_only_search_returns_nothing(session, search):
+    assert await titles(session, search) == []
+
+
+@pytest.mark.parametrize("search", [None, "", "   "])
+async def test_blank_search_lists_public_recipes(session, search):
+    assert sorted(await titles(session, search)) == ["Cà Chua Nhồi Thịt", "Phở Bò"]
+
+
+def test_search_text_is_space_padded_terms():
+    assert search_text("Phở Bò", None) == " pho bo phobo "
+    assert search_text(None, "") == ""
+
+
+def test_matches_requires_terms():
+    assert matches("pho bo", "Phở Bò Tái")
+    assert not matches("!!!", "Phở Bò")
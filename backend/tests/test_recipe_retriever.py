@@ -0,0 +1,60 @@
+"""RecipeRetriever.search_with_context: user preferences become valid facet filters."""
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from app.rag.facet_index import FacetIndex
+from app.rag.vectorstore import RecipeVectorStore, _Snapshot
+from app.services.recipe.recipe_retriever import RecipeRetriever
+
+_RECIPES = json.loads(
+    (Path(__file__).parent.parent / "app" / "mocks" / "recipes.json").read_text("utf-8")
+)
+
+
+@pytest.fixture
+def retriever() -> RecipeRetriever:
+    store = RecipeVectorStore()
+    store._snapshot = _Snapshot(recipes=_RECIPES, facets=FacetIndex(_RECIPES), loaded_at=time.monotonic())
+    store._dirty = False
+    store._checked_at = time.monotonic()
+    retriever = RecipeRetriever()
+    retriever.vector_search = store
+    return retriever
+
+
+async def search_filters(retriever: RecipeRetriever, monkeypatch, preferences: dict) -> dict:
+    captured = {}
+
+    async def find_recipes_by_query(query, session, limit=10, filters=None, use_hybrid=True):
+        captured.update(filters)
+        return []
+
+    monkeypatch.setattr(retriever, "find_recipes_by_query", find_recipes_by_query)
+    await retriever.search_with_context("canh", preferences, session=None)
+    return captured
+
+
+async def test_max_cook_time_filters_cook_time(retriever, monkeypatch):
+    filters = await search_filters(retriever, monkeypatch, {"max_cook_time": 30})
+    mask = retriever.vector_search._snapshot.facets.mask(**filters)
+
+    assert filters == {"max_cook_time": 30}
+    assert mask.any()
+    assert all(_RECIPES[row]["cook_time"] <= 30 for row in mask.nonzero()[0])
+
+
+async def test_known_dietary_tag_prefilters(retriever, monkeypatch):
+    filters = await search_filters(retriever, monkeypatch, {"dietary_preference": "Bò"})
+
+    assert filters["tag"] == ["Bò"]
+
+
+async def test_unknown_dietary_tag_does_not_empty_results(retriever, monkeypatch):
+    filters = await search_filters(retriever, monkeypatch, {"dietary_preference": "vegetarian"})
+    mask = retriever.vector_search._snapshot.facets.mask(**filters)
+
+    assert filters["tag"] == []
+    assert mask is None
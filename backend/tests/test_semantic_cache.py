@@ -0,0 +1,105 @@
+"""SemanticResponseCache: normalization, exact filters, threshold, ring buffer, TTL."""
+import time
+
+import pytest
+
+from app.rag.query_cache import QueryEmbeddingCache
+from app.rag.semantic_cache import SemanticResponseCache
+
+
+@pytest.fixture
+def semantic(fake_embedder, fake_cache) -> SemanticResponseCache:
+    return SemanticResponseCache(QueryEmbeddingCache(fake_embedder, fake_cache), capacity=4)
+
+
+async def test_equivalent_request_hits(semantic):
+    await semantic.store(["trứng", "cà chua"], ["chay"], {"dishes": ["a"]})
+
+    hit = await semantic.lookup(["Cà chua", "trứng gà"], ["Chay "])
+
+    assert hit == {"dishes": ["a"]}
+    assert semantic.stats()["hits"] == 1
+
+
+async def test_filters_are_matched_exactly(semantic):
+    await semantic.store(["trứng", "cà chua"], [], {"dishes": ["a"]})
+
+    assert await semantic.lookup(["trứng", "cà chua"], ["chay"]) is None
+
+
+async def test_dissimilar_request_misses(semantic):
+    await semantic.store(["trứng", "cà chua"], [], {"dishes": ["a"]})
+
+    assert await semantic.lookup(["thịt bò", "bánh phở"], []) is None
+    assert semantic.stats()["best_similarity"]["count"] == 1
+
+
+async def test_ring_buffer_evicts_oldest(semantic):
+    for n in range(5):  # capacity 4
+        await semantic.store([f"nguyên liệu {n}"], [], {"n": n})
+
+    assert semantic.stats()["entries"] == 4
+    assert await semantic.lookup(["nguyên liệu 0"], []) is None
+    assert await semantic.lookup(["nguyên liệu 4"], []) == {"n": 4}
+
+
+async def test_storing_same_request_replaces_slot(semantic):
+    await semantic.store(["trứng"], [], {"v": 1})
+    await semantic.store(["trứng gà"], [], {"v": 2})
+
+    assert semantic.stats()["entries"] == 1
+    assert await semantic.lookup(["trứng"], []) == {"v": 2}
+
+
+async def test_expired_entries_miss(semantic, monkeypatch):
+    await semantic.store(["trứng"], [], {"v": 1})
+    later = time.time() + 7200
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    assert await semantic.lookup(["trứng"], []) is None
+
+
+async def test_unavailable_embedder_skips_embedding(fake_embedder, fake_cache):
+    fake_embedder.available = False
+    semantic = SemanticResponseCache(QueryEmbeddingCache(fake_embedder, fake_cache))
+
+    await semantic.store(["trứng"], [], {"v": 1})
+
+    assert not semantic.available
+    assert await semantic.lookup(["trứng"], []) is None
+    assert fake_embedder.calls == []
+
+
+@pytest.mark.parametrize(("stored", "asked"), [("cá", "cà"), ("bò", "bơ"), ("thịt bò", "thịt gà")])
+async def test_different_ingredients_that_fold_alike_miss(semantic, stored, asked):
+    await semantic.store([stored, "hành lá"], [], {"dishes": [stored]})
+
+    assert await semantic.lookup([asked, "hành lá"], []) is None
+    assert await semantic.lookup([stored, "hành lá"], []) == {"dishes": [stored]}
+
+
+def test_normalize_keeps_distinguishing_diacritics():
+    normalize = SemanticResponseCache._normalize
+
+    assert normalize(["Cá kho"], [])[0] == "cá kho"
+    assert normalize(["cá kho"], [])[0] != normalize(["cà kho"], [])[0]
+    assert normalize(["thịt bò", "tomato"], [])[0] == normalize(["beef", "cà chua"], [])[0]
+
+
+async def test_filter_keys_are_evicted_with_their_entries(semantic):
+    for n in range(6):  # capacity 4, a new filter per request
+        await semantic.store(["trứng"], [f"lọc {n}"], {"n": n})
+
+    assert semantic.stats()["filter_keys"] == 4
+    assert await semantic.lookup(["trứng"], ["lọc 0"]) is None
+    assert await semantic.lookup(["trứng"], ["lọc 5"]) == {"n": 5}
+
+
+async def test_filter_key_survives_while_an_entry_uses_it(semantic):
+    await semantic.store(["trứng"], ["chay"], {"v": 1})
+    for n in range(3):
+        await semantic.store([f"nguyên liệu {n}"], [], {"n": n})
+    await semantic.store(["đậu hũ"], [], {"v": 2})  # evicts the only "chay" entry
+
+    assert semantic.stats()["filter_keys"] == 1
+    assert await semantic.lookup(["trứng"], ["chay"]) is None
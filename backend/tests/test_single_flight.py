@@ -0,0 +1,143 @@
+"""SingleFlight: in-process coalescing and the cross-worker Redis lock."""
+import asyncio
+
+import pytest
+
+from app.services import single_flight
+from app.services.single_flight import SingleFlight
+
+
+@pytest.fixture(autouse=True)
+def fast_poll(monkeypatch):
+    monkeypatch.setattr(single_flight, "_POLL_INTERVAL", 0.01)
+
+
+async def test_concurrent_calls_share_one_execution(fake_cache):
+    flight = SingleFlight(fake_cache)
+    calls = []
+
+    async def fn() -> dict:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"n": len(calls)}
+
+    results = await asyncio.gather(*(flight.do("k", fn) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert results == [{"n": 1}] * 5
+    assert flight.stats() == {"inflight": 0, "coalesced": 4}
+
+
+async def test_distinct_keys_run_separately(fake_cache):
+    flight = SingleFlight(fake_cache)
+    calls = []
+
+    async def fn() -> dict:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {}
+
+    await asyncio.gather(flight.do("a", fn), flight.do("b", fn))
+
+    assert len(calls) == 2
+
+
+async def test_exception_reaches_every_caller_and_key_is_released(fake_cache):
+    flight = SingleFlight(fake_cache)
+
+    async def boom() -> dict:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    results = await asyncio.gather(flight.do("k", boom), flight.do("k", boom), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.stats()["inflight"] == 0
+
+    async def ok() -> dict:
+        return {"ok": True}
+
+    assert await flight.do("k", ok) == {"ok": True}
+
+
+async def test_cancelled_caller_does_not_cancel_shared_call(fake_cache):
+    flight = SingleFlight(fake_cache)
+
+    async def fn() -> dict:
+        await asyncio.sleep(0.05)
+        return {"done": True}
+
+    first = asyncio.ensure_future(flight.do("k", fn))
+    second = asyncio.ensure_future(flight.do("k", fn))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == {"done": True}
+
+
+async def test_redis_lock_follower_reads_leader_result(fake_cache):
+    flight = SingleFlight(fake_cache, redis_lock=True, wait_seconds=1)
+    await fake_cache.set_nx("k:lock", "1", 10)  # another worker is leading
+    calls = []
+
+    async def fn() -> dict:
+        calls.append(1)
+        return {"from": "self"}
+
+    async def other_worker_finishes() -> None:
+        await asyncio.sleep(0.05)
+        await fake_cache.set("k", {"from": "leader"}, 10)
+        await fake_cache.delete("k:lock")
+
+    finisher = asyncio.ensure_future(other_worker_finishes())
+    result = await flight.do("k", fn)
+    await finisher
+
+    assert result == {"from": "leader"}
+    assert calls == []
+    assert flight.stats()["coalesced"] == 1
+
+
+async def test_redis_lock_released_without_result_falls_back(fake_cache):
+    flight = SingleFlight(fake_cache, redis_lock=True, wait_seconds=1)
+    await fake_cache.set_nx("k:lock", "1", 10)
+
+    async def fn() -> dict:
+        return {"from": "self"}
+
+    async def other_worker_fails() -> None:
+        await asyncio.sleep(0.05)
+        await fake_cache.delete("k:lock")
+
+    failer = asyncio.ensure_future(other_worker_fails())
+    result = await flight.do("k", fn)
+    await failer
+
+    assert result == {"from": "self"}
+    assert not await fake_cache.exists("k:lock")
+
+
+async def test_redis_lock_is_released_after_leading(fake_cache):
+    flight = SingleFlight(fake_cache, redis_lock=True)
+
+    async def fn() -> dict:
+        assert await fake_cache.exists("k:lock")
+        return {}
+
+    await flight.do("k", fn)
+
+    assert not await fake_cache.exists("k:lock")
+
+
+async def test_redis_down_skips_lock(fake_cache, monkeypatch):
+    flight = SingleFlight(fake_cache, redis_lock=True)
+
+    async def unavailable(*args):
+        return None  # CacheService.set_nx when Redis is unreachable
+
+    monkeypatch.setattr(fake_cache, "set_nx", unavailable)
+
+    async def fn() -> dict:
+        return {"ok": True}
+
+    assert await flight.do("k", fn) == {"ok": True}
@@ -0,0 +1,107 @@
+"""Binary embedding store (app/rag/store.py): layout, round trip, corruption handling."""
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from app.rag import store
+
+
+@pytest.fixture
+def matrix() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((5, 12)).astype(np.float32)
+
+
+@pytest.fixture
+def keys() -> list[bytes]:
+    return [store.row_key(f"recipe {i}") for i in range(5)]
+
+
+def test_float32_round_trip_is_memory_mapped(tmp_path, matrix, keys):
+    path = tmp_path / "emb.bin"
+    written = store.write_store(path, matrix, keys, model="m")
+
+    header, loaded, loaded_keys = store.open_store(path)
+
+    assert header == written
+    assert (header.count, header.dim, header.dtype, header.model) == (5, 12, "float32", "m")
+    assert isinstance(loaded, np.memmap)
+    assert not loaded.flags.writeable
+    assert np.array_equal(loaded, matrix)
+    assert loaded_keys == keys
+    assert header.content_hash == store.content_hash("m", keys)
+
+
+def test_layout_matches_documented_format(tmp_path, matrix, keys):
+    path = tmp_path / "emb.bin"
+    header = store.write_store(path, matrix, keys, model="m")
+    raw = path.read_bytes()
+
+    assert raw[:8] == b"CHEFEMB1"
+    (header_len,) = struct.unpack("<I", raw[8:12])
+    assert json.loads(raw[12 : 12 + header_len])["data_offset"] == header.data_offset
+    assert header.data_offset % 64 == 0
+    data = raw[header.data_offset : header.hashes_offset]
+    assert np.array_equal(np.frombuffer(data, dtype="<f4").reshape(5, 12), matrix)
+    assert raw[header.hashes_offset :] == b"".join(keys)
+
+
+def test_float16_store_is_upcast(tmp_path, matrix, keys):
+    path = tmp_path / "emb.bin"
+    store.write_store(path, matrix, keys, model="m", dtype="float16")
+
+    header, loaded, _ = store.open_store(path)
+
+    assert header.dtype == "float16"
+    assert loaded.dtype == np.float32
+    assert np.allclose(loaded, matrix, atol=1e-2)
+
+
+def test_empty_store(tmp_path):
+    path = tmp_path / "emb.bin"
+    store.write_store(path, np.zeros((0, 4), dtype=np.float32), [], model="m")
+
+    header, loaded, loaded_keys = store.open_store(path)
+
+    assert header.count == 0
+    assert loaded.shape == (0, 4)
+    assert loaded_keys == []
+
+
+def test_content_hash_depends_on_model_and_row_order(keys):
+    assert store.content_hash("m", keys) != store.content_hash("other", keys)
+    assert store.content_hash("m", keys) != store.content_hash("m", keys[::-1])
+
+
+def test_rejects_bad_arguments(tmp_path, matrix, keys):
+    with pytest.raises(ValueError):
+        store.write_store(tmp_path / "a.bin", matrix, keys, model="m", dtype="int8")
+    with pytest.raises(ValueError):
+        store.write_store(tmp_path / "b.bin", matrix, keys[:-1], model="m")
+
+
+def test_unreadable_files_return_none(tmp_path, matrix, keys):
+    missing = tmp_path / "missing.bin"
+    wrong_magic = tmp_path / "magic.bin"
+    wrong_magic.write_bytes(b"NOTASTORE" + b"\0" * 64)
+    truncated = tmp_path / "truncated.bin"
+    store.write_store(truncated, matrix, keys, model="m")
+    truncated.write_bytes(truncated.read_bytes()[:-10])
+
+    assert store.read_header(missing) is None
+    assert store.open_store(wrong_magic) is None
+    assert store.open_store(truncated) is None
+
+
+def test_rewrite_leaves_existing_mapping_intact(tmp_path, matrix, keys):
+    path = tmp_path / "emb.bin"
+    store.write_store(path, matrix, keys, model="m")
+    _, mapped, _ = store.open_store(path)
+
+    store.write_store(path, matrix * 2, keys, model="m")
+
+    assert np.array_equal(mapped, matrix)
+    assert np.array_equal(store.open_store(path)[1], matrix * 2)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["emb.bin"]
@@ -0,0 +1,101 @@
+"""Vector indexes (app/rag/vector_index.py): int8 first pass re-ranked at full precision."""
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.rag import store
+from app.rag.vector_index import QuantizedMatrix, build_vector_index, load_vector_index
+from app.services import rag
+from app.services.rag import RecipeRAGService
+
+
+@pytest.fixture(scope="module")
+def matrix() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    rows = rng.standard_normal((2000, 32)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+@pytest.fixture(scope="module")
+def queries(matrix) -> np.ndarray:
+    rng = np.random.default_rng(1)
+    noisy = matrix[:20] + 0.05 * rng.standard_normal((20, matrix.shape[1])).astype(np.float32)
+    return noisy / np.linalg.norm(noisy, axis=1, keepdims=True)
+
+
+def test_int8_codes_are_quarter_size_and_close(matrix, queries):
+    quantized = QuantizedMatrix(matrix)
+
+    assert quantized.nbytes == matrix.size + 4 * matrix.shape[0]
+    assert np.allclose(quantized.scores(queries[0]), matrix @ queries[0], atol=0.02)
+
+
+def test_int8_rerank_matches_exact_scan(matrix, queries):
+    exact = build_vector_index(matrix)
+    quantized = build_vector_index(matrix, quantization="int8", rerank_factor=4)
+
+    for query in queries:
+        rows, scores = quantized.search(query, 10)
+        expected_rows, expected_scores = exact.search(query, 10)
+        assert set(rows) == set(expected_rows)
+        assert np.allclose(sorted(scores), sorted(expected_scores))  # full-precision scores
+
+
+def test_int8_respects_mask(matrix, queries):
+    mask = np.zeros(matrix.shape[0], dtype=bool)
+    mask[1::2] = True
+    index = build_vector_index(matrix, quantization="int8")
+
+    rows, _ = index.search(queries[0], 10, mask)
+
+    assert len(rows) == 10
+    assert mask[rows].all()
+
+
+def test_float16_is_not_a_scan_mode(matrix):
+    with pytest.raises(ValueError):
+        QuantizedMatrix(matrix, "float16")
+
+    index = build_vector_index(matrix, quantization="float16")
+
+    assert "quantization" not in index.stats()
+
+
+def test_saved_int8_index_reranks_from_mapped_store(tmp_path, matrix, queries):
+    keys = [store.row_key(str(i)) for i in range(len(matrix))]
+    header = store.write_store(tmp_path / "emb.bin", matrix, keys, model="m")
+    _, mapped, _ = store.open_store(tmp_path / "emb.bin")
+    build_vector_index(mapped, quantization="int8").save(tmp_path / "index")
+
+    loaded = load_vector_index(tmp_path / "index", mapped)
+
+    assert header.count == len(matrix)
+    assert isinstance(loaded._matrix, np.memmap)
+    assert loaded.stats()["quantization"] == "int8"
+    assert loaded.search(queries[0], 5)[0][0] == 0
+
+
+def test_retired_float16_manifest_is_rebuilt(tmp_path, matrix):
+    build_vector_index(matrix).save(tmp_path)
+    (tmp_path / "index.json").write_text('{"kind": "exact", "quantization": "float16", "arrays": []}')
+
+    assert load_vector_index(tmp_path, matrix) is None
+
+
+async def test_quantized_build_drops_the_private_matrix(tmp_path, monkeypatch):
+    recipes = json.loads((Path(rag.__file__).parent.parent / "mocks" / "recipes.json").read_text("utf-8"))
+    path = tmp_path / "recipes.json"
+    path.write_text(json.dumps(recipes[:4], ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(rag, "_RECIPES_PATH", path)
+    monkeypatch.setattr(rag, "_EMBED_CACHE_PATH", tmp_path / "recipe_embeddings.bin")
+    monkeypatch.setattr(settings, "rag_shared_index", False)
+    monkeypatch.setattr(settings, "rag_quantization", "int8")
+
+    service = RecipeRAGService()
+    await service.initialize()
+
+    assert service.build_progress()["to_embed"] == 4  # fresh build, not a cache hit
+    assert isinstance(service._snapshot.embeddings, np.memmap)